@@ -2,21 +2,52 @@
 # PARTIE 1 — IMPORTS & CONFIGURATION GÉNÉRALE
 # ============================================
 
+import time
+DEBUT_SCRIPT = time.perf_counter()
+
+import json
+import os
 import streamlit as st
 from datetime import date
 import locale
 import re
 import requests
-import xml.etree.ElementTree as ET
 from datetime import datetime
-import google.generativeai as genai
-import tarfile
 from io import BytesIO
-import pypdf
-import base64
-from reportlab.lib.pagesizes import A4        # <-- NEW
-from reportlab.pdfgen import canvas          # <-- NEW
-import anthropic
+from utils_chargement import differe, TEMPS_CHARGEMENT
+from utils_rejeu import activer_rejeu
+
+# Enregistrement / rejeu des appels externes si VEILLE_REJEU est défini (benchmarks hors ligne)
+activer_rejeu()
+
+# SDK et bibliothèques PDF chargés au premier usage (démarrage plus rapide)
+genai = differe("google.generativeai")
+pypdf = differe("pypdf")
+pagesizes = differe("reportlab.lib.pagesizes")
+canvas = differe("reportlab.pdfgen.canvas")
+anthropic = differe("anthropic")
+from utils_jats import recuperer_texte_jats
+from utils_pdf import extraire_pages_routees
+from utils_mise_en_page import mise_en_page_pour
+from utils_polices import police_unicode
+from utils_artefacts import publier_artefact, stocker_artefact, lire_artefact
+from utils_notebooklm import ExportNotebookLM
+from utils_enrichissement import enrichir_articles, traduire_lot_deepl, traduire_lot_gemini
+from utils_jobs import STATUTS_ACTIFS, soumettre, etat_job, job_par_cle, enregistrer_tache, reprendre_jobs, suivre_job
+from utils_pagination import navigation_pages, bornes_page
+from utils_cache import memoiser, cache_partage
+from utils_recherche import rechercher, charger_plus, reste_a_charger
+from utils_pubmed import (
+    nettoyer_titre, nettoyer_abstract, pubmed_fetch_metadata_and_abstracts, check_pdf_free_unpaywall,
+    fetch_pdf_from_unpaywall
+)
+from utils_index import indexer_articles, articles_indexes, rechercher_local, statistiques_index
+from utils_session import panneau_memoire_session
+from config_stockage import chemin_donnees
+from config_services import URL_DEEPL, options_gemini, options_claude
+from utils_text import (
+    SECTIONS_UTILES, LIBELLES_SECTIONS, filtrer_sections, retirer_entetes_pieds, cle_editeur
+)
 
 
 # Locale FR pour les dates
@@ -42,15 +73,24 @@ except Exception as e:
     st.error(f"⚠️ Clé GEMINI_KEY manquante dans st.secrets: {e}")
     st.stop()
 
-# Clé Claude (optionnelle)
-try:
-    CLAUDE_KEY = st.secrets["CLAUDE_KEY"]
-    client_claude = anthropic.Anthropic(api_key=CLAUDE_KEY)
+# Clé Claude (optionnelle) — le client est créé au premier appel
+CLAUDE_KEY = st.secrets.get("CLAUDE_KEY", None)
+if CLAUDE_KEY:
     st.sidebar.success("✅ Clé Claude chargée")
-except Exception:
-    client_claude = None
+else:
     st.sidebar.info("ℹ️ Claude non configuré")
 
+
+@st.cache_resource(show_spinner=False)
+def get_client_claude():
+    """Client Anthropic partagé, créé (et SDK importé) au premier usage."""
+    if not CLAUDE_KEY:
+        return None
+    try:
+        return anthropic.Anthropic(api_key=CLAUDE_KEY, **options_claude())
+    except Exception:
+        return None
+
 # Clé DeepL (optionnelle)
 DEEPL_KEY = st.secrets.get("DEEPL_KEY", None)
 if DEEPL_KEY:
@@ -64,6 +104,12 @@ UNPAYWALL_EMAIL = st.secrets.get("UNPAYWALL_EMAIL", "example@email.com")
 # Mode de traduction par défaut
 MODE_TRAD = "deepl" if DEEPL_KEY else "gemini"
 
+# Recherche instantanée dans les articles déjà récupérés (index local)
+MODE_CORPUS_LOCAL = "📚 Corpus local (instantané)"
+
+# Articles gardés en session (abstracts complets) : « Charger plus » s'arrête au-delà
+MAX_ARTICLES_SESSION = int(os.getenv("VEILLE_MAX_ARTICLES_SESSION", "600"))
+
 # Session state
 if "articles" not in st.session_state:
     st.session_state.articles = []
@@ -73,6 +119,18 @@ if "historique" not in st.session_state:
     st.session_state.historique = []
 if "debug" not in st.session_state:
     st.session_state.debug = True  # Activé par défaut pour debug
+if "articles_affiches" not in st.session_state:
+    st.session_state.articles_affiches = []  # résultats de la dernière recherche (Partie 8)
+if "actions_ia_demandees" not in st.session_state:
+    st.session_state.actions_ia_demandees = set()  # "pmid:action" demandés par l'utilisateur
+if "job_prechargement_ia" not in st.session_state:
+    st.session_state.job_prechargement_ia = None
+if "recherche_courante" not in st.session_state:
+    st.session_state.recherche_courante = None  # count, WebEnv et PMID chargés (« Charger plus »)
+if "fichiers_regeneres" not in st.session_state:
+    st.session_state.fichiers_regeneres = {}  # job -> ids d'artefacts régénérés après purge
+if "filtres_locaux" not in st.session_state:
+    st.session_state.filtres_locaux = None  # dernière recherche dans le corpus local
 
 
 # ============================================
@@ -261,41 +319,6 @@ SPECIALITES = {
 # PARTIE 2 — FONCTIONS UTILITAIRES TEXTE
 # ============================================
 
-def nettoyer_titre(titre: str) -> str:
-    """Nettoie le titre d'article : balises HTML, mentions 'see more', espaces."""
-    if not titre:
-        return "Titre non disponible"
-
-    titre = re.sub(r'<[^>]+>', '', titre)
-    patterns = [
-        r'\s*see\s+more\s*',
-        r'\[see\s+more\]',
-        r'\(see\s+more\)',
-        r'\(\s*see\s+more\s*\)',
-        r'\s*voir\s+plus\s*',
-        r'\[voir\s+plus\]',
-        r'\(voir\s+plus\)',
-    ]
-
-    for pat in patterns:
-        titre = re.sub(pat, '', titre, flags=re.IGNORECASE)
-
-    titre = re.sub(r'\s+', ' ', titre)
-    return titre.strip()
-
-
-def nettoyer_abstract(texte: str) -> str:
-    """Nettoie un abstract : supprime balises, espaces, artefacts."""
-    if not texte:
-        return ""
-
-    texte = re.sub(r'<[^>]+>', '', texte)
-    texte = re.sub(r'^[A-Z ]{3,20}:\s*', '', texte)
-    texte = re.sub(r'\s+', ' ', texte)
-
-    return texte.strip()
-
-
 def nettoyer_texte_pdf(texte: str) -> str:
     """Nettoyage avancé du texte extrait des PDF."""
     if not texte:
@@ -338,7 +361,7 @@ def maintenant_str() -> str:
 
 def traduire_deepl_chunk(texte: str, api_key: str) -> str:
     """Traduit un chunk de texte via DeepL."""
-    url = "https://api-free.deepl.com/v2/translate"
+    url = URL_DEEPL
     data = {
         "auth_key": api_key,
         "text": texte,
@@ -354,7 +377,7 @@ def traduire_deepl_chunk(texte: str, api_key: str) -> str:
 def traduire_gemini_chunk(texte: str, g_key: str) -> str:
     """Traduit un chunk de texte via Gemini."""
     try:
-        genai.configure(api_key=g_key)
+        genai.configure(api_key=g_key, **options_gemini())
         model = genai.GenerativeModel("gemini-2.0-flash-exp")
 
         prompt = f"""Tu es un traducteur médical professionnel. Traduis le texte anglais suivant en français médical professionnel.
@@ -387,6 +410,7 @@ TRADUCTION FRANÇAISE:"""
 
 def traduire_claude(texte: str) -> str:
     """Traduction FR via Claude (fallback)."""
+    client_claude = get_client_claude()
     if not client_claude:
         return texte
 
@@ -414,7 +438,7 @@ def traduire_avec_fallback(texte: str) -> str:
         return traduire_claude(texte)
 
 
-@st.cache_data(show_spinner=False)
+@memoiser("traduction")
 def traduire_long_texte_cache(
     texte: str,
     mode: str,
@@ -464,7 +488,7 @@ def traduire_texte_court_cache(
 def traduire_mots_cles_gemini(mots_cles_fr: str, g_key: str) -> str:
     """Traduit des mots-clés FR → EN optimisés pour PubMed (MeSH si possible)."""
     try:
-        genai.configure(api_key=g_key)
+        genai.configure(api_key=g_key, **options_gemini())
         model = genai.GenerativeModel("gemini-2.0-flash-exp")
 
         prompt = f"""Tu es un expert en terminologie médicale. Traduis ces mots-clés français en termes médicaux anglais optimisés pour PubMed.
@@ -488,6 +512,7 @@ TERMES ANGLAIS:"""
 
 def resumer_claude(texte: str, mode="court") -> str:
     """Résumé FR via Claude."""
+    client_claude = get_client_claude()
     if not client_claude:
         return texte
 
@@ -516,7 +541,7 @@ def resumer_claude(texte: str, mode="court") -> str:
 def resumer_avec_fallback(texte: str, mode="court") -> str:
     """Résumé via Gemini, fallback Claude."""
     try:
-        genai.configure(api_key=G_KEY)
+        genai.configure(api_key=G_KEY, **options_gemini())
         model = genai.GenerativeModel("gemini-2.0-flash-exp")
 
         prompt = f"""
@@ -538,14 +563,67 @@ def resumer_avec_fallback(texte: str, mode="court") -> str:
         return resumer_claude(texte, mode=mode)
 
 
+def fournisseurs_traduction_lots() -> list:
+    """[(fournisseur, traduire_lot)] par ordre de préférence (DeepL si configuré, puis Gemini)."""
+    fournisseurs = []
+    if MODE_TRAD == "deepl" and DEEPL_KEY:
+        fournisseurs.append(("deepl", lambda textes: traduire_lot_deepl(textes, DEEPL_KEY)))
+    fournisseurs.append(("gemini", lambda textes: traduire_lot_gemini(textes, G_KEY)))
+    return fournisseurs
+
+
+def enrichir_resultats(articles: list, progress_callback=None) -> dict:
+    """Étape d'enrichissement : title_fr / abstract_fr de tout le jeu de résultats, par lots."""
+    (fournisseur, traduire_lot), *replis = fournisseurs_traduction_lots()
+    return enrichir_articles(
+        articles,
+        traduire_lot,
+        fournisseur=fournisseur,
+        replis=replis,
+        traduire_un=traduire_avec_fallback,
+        post_traitement={"title_fr": nettoyer_titre, "abstract_fr": nettoyer_abstract},
+        progress_callback=progress_callback
+    )
+
+
+# Résumés de la liste de résultats, calculés à la demande
+# (titres et abstracts sont déjà traduits par l'étape d'enrichissement)
+ACTIONS_IA = {
+    "resume_court": "📝 Résumé court",
+    "resume_long": "📘 Résumé long",
+}
+
+
+@memoiser("resumes", cacher_si=bool)
+def calculer_action_ia(action: str, texte: str) -> str:
+    """Résumé d'un texte, calculé une seule fois (cache partagé entre sessions)."""
+    if not texte:
+        return ""
+    return resumer_avec_fallback(texte, mode="court" if action == "resume_court" else "long")
+
+
+def tache_prechargement_ia(parametres, ctx):
+    """Tâche de fond : pré-calcule les résumés des premiers résultats."""
+    articles = parametres["articles"]
+    total = len(articles) * len(ACTIONS_IA)
+    for i, meta in enumerate(articles):
+        for j, action in enumerate(ACTIONS_IA):
+            cle = f"{meta['pmid']}:{action}"
+            if ctx.annule:
+                return None
+            if cle in ctx.partiel:
+                continue
+            calculer_action_ia(action, meta.get("abstract_en"))
+            ctx.point_de_reprise(cle, True)
+            ctx.progres((i * len(ACTIONS_IA) + j + 1) / total)
+    return None
+
+
 
 # ============================================
 # PARTIE 4 — PUBMED : RECHERCHE & MÉTADONNÉES
 # ============================================
 
-BASE_EUTILS = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
-
-
 def construire_query_pubmed(
     base_query: str,
     date_debut,
@@ -571,90 +649,16 @@ def construire_query_pubmed(
     return query
 
 
-@st.cache_data(show_spinner=False)
 def pubmed_search_ids(query: str, max_results: int = 50):
-    """Recherche les PMIDs correspondant à une requête PubMed."""
-    try:
-        params = {
-            "db": "pubmed",
-            "term": query,
-            "retmax": max_results,
-            "retmode": "json"
-        }
-
-        r = requests.get(f"{BASE_EUTILS}/esearch.fcgi", params=params, timeout=20)
-        r.raise_for_status()
-        data = r.json()
-
-        return data.get("esearchresult", {}).get("idlist", [])
-    except Exception as e:
-        st.error(f"❌ Erreur recherche PubMed: {e}")
-        return []
-
-
-@st.cache_data(show_spinner=False)
-def pubmed_fetch_metadata_and_abstracts(pmids):
-    """Récupère les métadonnées et abstracts pour une liste de PMIDs."""
-    if not pmids:
-        return []
-
-    try:
-        params = {
-            "db": "pubmed",
-            "id": ",".join(pmids),
-            "retmode": "xml"
-        }
-
-        r = requests.get(f"{BASE_EUTILS}/efetch.fcgi", params=params, timeout=30)
-        r.raise_for_status()
-
-        root = ET.fromstring(r.content)
-        results = []
-
-        for article in root.findall('.//PubmedArticle'):
-            pmid_elem = article.find('.//PMID')
-            pmid = pmid_elem.text if pmid_elem is not None else None
-
-            title_elem = article.find('.//ArticleTitle')
-            title = ''.join(title_elem.itertext()) if title_elem is not None else "Titre non disponible"
-            title = nettoyer_titre(title)
-
-            journal_elem = article.find('.//Journal/Title')
-            journal = journal_elem.text if journal_elem is not None else "Journal non disponible"
-
-            year_elem = article.find('.//PubDate/Year')
-            year = year_elem.text if year_elem is not None else "N/A"
-
-            doi = None
-            pmcid = None
-            for aid in article.findall('.//ArticleId'):
-                if aid.get('IdType') == 'doi':
-                    doi = aid.text
-                if aid.get('IdType') == 'pmc':
-                    pmcid = aid.text
-
-            abstract_texts = []
-            for abst in article.findall('.//Abstract/AbstractText'):
-                part = ''.join(abst.itertext())
-                if part:
-                    abstract_texts.append(part.strip())
-
-            abstract = nettoyer_abstract("\n\n".join(abstract_texts))
-
-            results.append({
-                "pmid": pmid,
-                "title_en": title,
-                "journal": journal,
-                "year": year,
-                "doi": doi,
-                "pmcid": pmcid,
-                "abstract_en": abstract
-            })
-
-        return results
-    except Exception as e:
-        st.error(f"❌ Erreur récupération métadonnées: {e}")
-        return []
+    """
+    Recherche les PMIDs correspondant à une requête PubMed (cache sur la forme
+    canonique de la requête). Retourne le résultat de utils_recherche.rechercher
+    (ids, count, webenv...) ou None.
+    """
+    resultat, erreur = rechercher(query, max_results)
+    if erreur:
+        st.error(f"❌ {erreur}")
+    return resultat
 
 
 # ============================================
@@ -667,88 +671,6 @@ def _clean_pmcid(pmcid: str) -> str:
         return ""
     return pmcid.replace("PMC", "").strip()
 
-def check_pdf_free_unpaywall(doi, email):
-    """Vérifie via Unpaywall si un PDF OA est disponible, sans forcément le télécharger."""
-    if not doi:
-        return False, None, "Pas de DOI"
-
-    try:
-        url = f"https://api.unpaywall.org/v2/{doi}"
-        params = {"email": email}
-        r = requests.get(url, params=params, timeout=20)
-
-        if r.status_code == 404:
-            return False, None, "Unpaywall: DOI inconnu"
-        if r.status_code != 200:
-            return False, None, f"Unpaywall HTTP {r.status_code}"
-
-        data = r.json()
-
-        if not data.get("is_oa"):
-            return False, None, "Unpaywall: pas Open Access"
-
-        # On privilégie best_oa_location
-        best = data.get("best_oa_location")
-        if best and best.get("url_for_pdf"):
-            return True, best["url_for_pdf"], None
-
-        # Sinon on regarde dans oa_locations
-        for loc in data.get("oa_locations", []):
-            pdf_url = loc.get("url_for_pdf")
-            if pdf_url:
-                return True, pdf_url, None
-
-        return False, None, "Unpaywall: PDF OA non trouvé dans les locations"
-    except Exception as e:
-        return False, None, f"Unpaywall erreur: {e}"
-
-
-def fetch_pdf_from_unpaywall(doi, email):
-    """Tente de récupérer un PDF via Unpaywall."""
-    if not doi:
-        return None, "Pas de DOI"
-
-    try:
-        url = f"https://api.unpaywall.org/v2/{doi}"
-        params = {"email": email}
-        r = requests.get(url, params=params, timeout=20)
-
-        if r.status_code == 404:
-            return None, "Unpaywall: DOI inconnu"
-        if r.status_code != 200:
-            return None, f"Unpaywall HTTP {r.status_code}"
-
-        data = r.json()
-
-        if not data.get("is_oa"):
-            return None, "Unpaywall: pas Open Access"
-
-        headers = {"User-Agent": "Mozilla/5.0"}
-
-        best = data.get("best_oa_location")
-        if best and best.get("url_for_pdf"):
-            pdf_url = best["url_for_pdf"]
-            r2 = requests.get(pdf_url, headers=headers, timeout=30)
-            if r2.status_code == 200 and "application/pdf" in r2.headers.get("Content-Type", ""):
-                return r2.content, None
-
-        for loc in data.get("oa_locations", []):
-            pdf_url = loc.get("url_for_pdf")
-            if not pdf_url:
-                continue
-            try:
-                r3 = requests.get(pdf_url, headers=headers, timeout=30)
-                if r3.status_code == 200 and "application/pdf" in r3.headers.get("Content-Type", ""):
-                    return r3.content, None
-            except Exception:
-                continue
-
-        return None, "Unpaywall: PDF non trouvé"
-
-    except Exception as e:
-        return None, f"Unpaywall erreur: {e}"
-
-
 def fetch_pdf_cascade(pmid, doi, pmcid, unpaywall_email, utiliser_scihub=False):
     """Cascade optimisée de récupération PDF avec multiples sources."""
     reasons = {}
@@ -768,8 +690,42 @@ def fetch_pdf_cascade(pmid, doi, pmcid, unpaywall_email, utiliser_scihub=False):
     return None, msg.strip()
 
 
-def extract_with_pypdf(pdf_content: bytes) -> str:
-    """Extraction via pypdf."""
+@memoiser("pdf", cacher_si=lambda r: r[0] is not None)
+def fetch_texte_integral(pmid, doi, pmcid, unpaywall_email, utiliser_scihub=False,
+                         sections_gardees=SECTIONS_UTILES, journal=None):
+    """
+    Texte intégral anglais : XML JATS (PMC / Europe PMC) en priorité,
+    sinon cascade PDF + extraction. Retourne (texte, source, erreur).
+    Seules les sections de `sections_gardees` sont conservées.
+    """
+    erreur_jats = None
+    if pmcid:
+        texte, source, erreur_jats = recuperer_texte_jats(pmcid, sections_gardees=sections_gardees)
+        if texte:
+            return texte, source, None
+
+    pdf_content, source_msg = fetch_pdf_cascade(
+        pmid=pmid,
+        doi=doi,
+        pmcid=pmcid,
+        unpaywall_email=unpaywall_email,
+        utiliser_scihub=utiliser_scihub
+    )
+    if not pdf_content:
+        if erreur_jats:
+            source_msg += f"\n  • JATS: {erreur_jats}"
+        return None, None, source_msg
+
+    texte, methode = extract_text_from_pdf(
+        pdf_content,
+        sections_gardees=sections_gardees,
+        editeur=cle_editeur(doi, journal)
+    )
+    return texte, f"{source_msg} ({methode})", None
+
+
+def extract_pages_with_pypdf(pdf_content: bytes) -> list:
+    """Extraction via pypdf, page par page."""
     try:
         reader = pypdf.PdfReader(BytesIO(pdf_content))
         pages = min(len(reader.pages), 20)
@@ -781,20 +737,122 @@ def extract_with_pypdf(pdf_content: bytes) -> str:
                     out.append(txt)
             except Exception:
                 pass
-        return "\n\n".join(out)
+        return out
     except Exception:
-        return ""
+        return []
 
 
-def extract_text_from_pdf(pdf_content: bytes):
-    """Extraction de texte PDF."""
-    txt = extract_with_pypdf(pdf_content)
+def extract_with_pypdf(pdf_content: bytes) -> str:
+    """Extraction via pypdf."""
+    return "\n\n".join(extract_pages_with_pypdf(pdf_content))
+
+
+def extract_text_from_pdf(pdf_content: bytes, sections_gardees=SECTIONS_UTILES, editeur: str = ""):
+    """Extraction de texte PDF, limitée aux sections utiles (références, mentions exclues)."""
+    # Routage par page (PyMuPDF / pdfplumber), pypdf si PyMuPDF indisponible
+    pages, methode, _ = extraire_pages_routees(pdf_content, max_pages=20)
+    if sum(len(p) for p in pages) <= 100:
+        pages, methode = extract_pages_with_pypdf(pdf_content), "pypdf"
+    # En-têtes / pieds répétés retirés page par page, avant toute troncature
+    pages, economie = retirer_entetes_pieds(pages, editeur)
+    txt = "\n\n".join(pages)
     if len(txt) > 100:
-        return nettoyer_texte_pdf(txt), "pypdf"
+        # Segmentation avant nettoyage : elle a besoin des retours à la ligne
+        txt, _ = filtrer_sections(txt, sections_gardees)
+        if economie:
+            methode += f", {economie} car. d'en-têtes/pieds retirés"
+        return nettoyer_texte_pdf(txt), methode
 
     return "", "echec_extraction"
 
 
+def tache_traduction_article(parametres, ctx):
+    """Tâche de fond : texte intégral (JATS puis PDF) + traduction d'un article."""
+    art = parametres["art"]
+
+    ctx.progres(0.1, "📥 Récupération du texte intégral...")
+    # JATS d'abord, puis cascade PDF
+    texte_pdf_en, source_msg, erreur = fetch_texte_integral(
+        pmid=art["pmid"],
+        doi=art.get("doi"),
+        pmcid=art.get("pmcid"),
+        unpaywall_email=UNPAYWALL_EMAIL,
+        utiliser_scihub=False,
+        sections_gardees=tuple(parametres["sections"]),
+        journal=art.get("journal")
+    )
+    if erreur:
+        return {"texte_fr": None, "source": None, "erreur": f"Impossible de récupérer le texte intégral : {erreur}"}
+
+    texte_pdf_en = tronquer(texte_pdf_en, max_len=12000)
+    if not texte_pdf_en:
+        return {"texte_fr": None, "source": source_msg, "erreur": "Texte PDF non exploitable ou trop court."}
+
+    ctx.progres(0.4, f"🌐 Traduction ({len(texte_pdf_en)} caractères)...")
+    texte_pdf_fr = traduire_long_texte_cache(
+        texte_pdf_en,
+        parametres["mode"],
+        deepl_key=DEEPL_KEY,
+        g_key=G_KEY,
+        chunk_size=2000
+    )
+
+    ctx.progres(0.9, "📄 Génération du PDF et de l'export NotebookLM...")
+    return dict({"texte_fr": texte_pdf_fr, "source": source_msg, "erreur": None},
+                **fichiers_traduction(art, texte_pdf_fr))
+
+def tache_disponibilite_pdf(parametres, ctx):
+    """Tâche de fond : disponibilité d'un PDF Open Access (Unpaywall) pour une page d'articles."""
+    articles = parametres["articles"]
+    for i, art in enumerate(articles):
+        if art["pmid"] in ctx.partiel:
+            continue
+        ok, _, _ = check_pdf_free_unpaywall(art.get("doi"), UNPAYWALL_EMAIL)
+        ctx.point_de_reprise(art["pmid"], ok)
+        ctx.progres((i + 1) / len(articles))
+    return None
+
+def disponibilite_pdf_page(articles_page: list, suivre: bool = True):
+    """
+    Reporte dans les articles (has_free_pdf) les vérifications Unpaywall déjà
+    faites, et lance en arrière-plan celles de la page si besoin. Avec
+    `suivre`, la page est réaffichée à la fin de la vérification.
+    """
+    if all("has_free_pdf" in a for a in articles_page):
+        return
+    cle = "oa:" + ",".join(a["pmid"] for a in articles_page)
+    job = job_par_cle(cle)
+    if job is None or job["statut"] in ("erreur", "annule"):
+        job_id = soumettre(
+            "disponibilite_pdf",
+            {"articles": [{"pmid": a["pmid"], "doi": a.get("doi")} for a in articles_page]},
+            cle=cle
+        )
+        if suivre:
+            suivre_job(job_id, progression=False)
+        return
+    for art in articles_page:
+        if art["pmid"] in job["partiel"]:
+            art["has_free_pdf"] = job["partiel"][art["pmid"]]
+    if suivre and job["statut"] in STATUTS_ACTIFS:
+        suivre_job(job["id"], progression=False)
+
+enregistrer_tache("traduction_article", tache_traduction_article)
+enregistrer_tache("disponibilite_pdf", tache_disponibilite_pdf)
+enregistrer_tache("prechargement_ia", tache_prechargement_ia)
+reprendre_jobs()
+
+# Reconnexion : les traductions en cours (identifiants dans l'URL) sont retrouvées
+if "jobs_traduction" not in st.session_state:
+    st.session_state.jobs_traduction = {}  # pmid -> identifiant de tâche de fond
+    for job_id in st.query_params.get_all("trad"):
+        job_url = etat_job(job_id)
+        if job_url and job_url["type"] == "traduction_article":
+            art = job_url["parametres"]["art"]
+            st.session_state.jobs_traduction[art["pmid"]] = job_id
+            if art["pmid"] not in {a["pmid"] for a in st.session_state.articles}:
+                st.session_state.articles.append(art)
+
 # ============================================
 # PARTIE 6 — EXPORT NOTEBOOKLM
 # ============================================
@@ -802,8 +860,8 @@ def extract_text_from_pdf(pdf_content: bytes):
 def build_pdf_from_text(titre: str, contenu: str) -> bytes:
     """Génère un PDF simple (A4) contenant le titre et le texte."""
     buffer = BytesIO()
-    c = canvas.Canvas(buffer, pagesize=A4)
-    width, height = A4
+    c = canvas.Canvas(buffer, pagesize=pagesizes.A4)
+    width, height = pagesizes.A4
 
     # Paramètres de base
     x_margin = 50
@@ -811,45 +869,35 @@ def build_pdf_from_text(titre: str, contenu: str) -> bytes:
     max_width = width - 2 * x_margin
     line_height = 14
 
-    # Fonction de découpe de ligne
-    def wrap_text(text, canvas_obj, max_width):
-        words = text.split()
-        lines = []
-        line = ""
-        for w in words:
-            test_line = (line + " " + w).strip()
-            if canvas_obj.stringWidth(test_line, "Helvetica", 11) <= max_width:
-                line = test_line
-            else:
-                lines.append(line)
-                line = w
-        if line:
-            lines.append(line)
-        return lines
+    # Police Unicode embarquée (≥, µ, β, ±...), repli Helvetica si aucune TTF
+    police_titre = police_unicode("B")
+    police_corps = police_unicode("")
+
+    # Césure incrémentale (largeurs de mots en cache, temps linéaire)
+    mep_titre = mise_en_page_pour(police_titre, 14)
+    mep_corps = mise_en_page_pour(police_corps, 11)
 
     y = height - y_margin
 
     # Titre
-    c.setFont("Helvetica-Bold", 14)
-    for line in wrap_text(titre, c, max_width):
+    c.setFont(police_titre, 14)
+    for line in mep_titre.couper_paragraphe(titre, max_width):
         c.drawString(x_margin, y, line)
         y -= line_height
     y -= 2 * line_height
 
     # Corps
-    c.setFont("Helvetica", 11)
-    for paragraphe in contenu.split("\n"):
-        paragraphe = paragraphe.strip()
-        if not paragraphe:
+    c.setFont(police_corps, 11)
+    for line in mep_corps.couper_document(contenu, max_width):
+        if line is None:
             y -= line_height
             continue
-        for line in wrap_text(paragraphe, c, max_width):
-            if y < y_margin:
-                c.showPage()
-                y = height - y_margin
-                c.setFont("Helvetica", 11)
-            c.drawString(x_margin, y, line)
-            y -= line_height
+        if y < y_margin:
+            c.showPage()
+            y = height - y_margin
+            c.setFont(police_corps, 11)
+        c.drawString(x_margin, y, line)
+        y -= line_height
 
     c.showPage()
     c.save()
@@ -870,32 +918,79 @@ Texte complet traduit:
 {texte_fr}
 """
 
+def build_notebooklm_zip(meta, texte_fr: str) -> bytes:
+    """Export NotebookLM en zip, découpé automatiquement aux limites par source."""
+    buffer = BytesIO()
+    export = ExportNotebookLM(buffer, prefixe=f"veille_{meta['pmid']}")
+    export.ajouter_section(build_notebooklm_export(meta, texte_fr), meta["pmid"])
+    export.fermer()
+    return buffer.getvalue()
+
+
+def fichiers_traduction(art, texte_fr: str) -> dict:
+    """
+    PDF et zip NotebookLM d'une traduction, générés une seule fois (dans la
+    tâche de fond) et stockés : {"pdf": id d'artefact, "zip": id d'artefact}.
+    """
+    titre_pdf = art.get("title_fr") or art.get("title_en")
+    pdf_bytes = build_pdf_from_text(titre_pdf, build_notebooklm_export(art, texte_fr))
+    return {
+        "pdf": stocker_artefact(pdf_bytes, "application/pdf"),
+        "zip": stocker_artefact(build_notebooklm_zip(art, texte_fr), "application/zip"),
+    }
+
 
-def bouton_download_ios_safe(label: str, content: str, filename: str):
-    """Génère un lien de téléchargement compatible iPhone."""
-    b64 = base64.b64encode(content.encode()).decode()
-    href = (
-        f'<a href="data:text/plain;base64,{b64}" '
-        f'download="{filename}" '
+def _lien_telechargement(label: str, contenu: bytes, filename: str, mime: str) -> str:
+    """
+    Lien HTML vers l'artefact servi par lien signé (VEILLE_ARTEFACTS_URL +
+    VEILLE_ARTEFACTS_SECRET), ou "" si les liens signés ne sont pas
+    configurés : st.download_button reste alors le seul téléchargement
+    (un lien data: dupliquerait le fichier en base64 dans la page).
+    """
+    url = publier_artefact(contenu, filename, mime)
+    if not url:
+        return ""
+    return (
+        f'<a href="{url}" target="_blank" '
         f'style="text-decoration:none; font-weight:600;">{label}</a>'
     )
-    return href
+
+def bouton_download_ios_safe(label: str, content: str, filename: str):
+    """Lien de téléchargement compatible iPhone ("" sans liens signés)."""
+    return _lien_telechargement(label, content.encode("utf-8"), filename, "text/plain; charset=utf-8")
 
 def bouton_download_pdf_ios_safe(label: str, pdf_bytes: bytes, filename: str):
-    """Génère un lien de téléchargement PDF compatible iPhone."""
-    b64 = base64.b64encode(pdf_bytes).decode()
-    href = (
-        f'<a href="data:application/pdf;base64,{b64}" '
-        f'download="{filename}" '
-        f'style="text-decoration:none; font-weight:600;">{label}</a>'
-    )
-    return href
+    """Lien de téléchargement PDF compatible iPhone ("" sans liens signés)."""
+    return _lien_telechargement(label, pdf_bytes, filename, "application/pdf")
     
-@st.cache_data(ttl=60 * 60 * 24 * 5)  # 5 jours
-def get_traductions_pdf_historiques(entries):
-    """Persiste la liste des traductions PDF pendant quelques jours (si le cache n'est pas vidé)."""
+FICHIER_TRADUCTIONS_PDF = "traductions_pdf.json"
+DUREE_TRADUCTIONS_PDF = 60 * 60 * 24 * 5  # 5 jours
+
+
+def get_traductions_pdf_historiques() -> list:
+    """Traductions PDF des 5 derniers jours (fichier local, conservé entre sessions)."""
+    try:
+        with open(chemin_donnees(FICHIER_TRADUCTIONS_PDF), encoding="utf-8") as f:
+            entries = json.load(f)
+    except (OSError, ValueError):
+        return []
+    limite = time.time() - DUREE_TRADUCTIONS_PDF
+    return [e for e in entries if e.get("enregistre", 0) >= limite]
+
+
+def enregistrer_traduction_pdf(entry: dict):
+    """Ajoute une traduction à l'historique persistant (entrées de plus de 5 jours purgées)."""
+    entries = get_traductions_pdf_historiques() + [dict(entry, enregistre=time.time())]
+    chemin = chemin_donnees(FICHIER_TRADUCTIONS_PDF)
+    with open(chemin + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(entries, f, ensure_ascii=False)
+    os.replace(chemin + ".tmp", chemin)
     return entries
 
+
+if "traductions_pdf" not in st.session_state:
+    st.session_state.traductions_pdf = get_traductions_pdf_historiques()  # historique des 5 derniers jours
+
 # ============================================
 # PARTIE 7 — INTERFACE : SIDEBAR & PARAMÈTRES
 # ============================================
@@ -908,7 +1003,7 @@ with st.sidebar:
     st.subheader("🔬 Mode de recherche")
     mode_recherche = st.radio(
         "Choisir le mode",
-        ["Par mots-clés", "Par spécialité médicale"],
+        ["Par mots-clés", "Par spécialité médicale", MODE_CORPUS_LOCAL],
         index=0
     )
 
@@ -917,7 +1012,18 @@ with st.sidebar:
     choix_journaux = []
     inclure_keywords = False
 
-    if mode_recherche == "Par mots-clés":
+    if mode_recherche == MODE_CORPUS_LOCAL:
+        mots_cles_fr = st.text_input(
+            "Rechercher dans les articles déjà récupérés",
+            placeholder="endométriose, dienogest...",
+            help="Titres et abstracts (FR et EN), termes MeSH. Une virgule sépare des alternatives (OU)."
+        )
+        st.caption(
+            f"📚 {statistiques_index()['articles']} articles indexés : résultats instantanés, sans PubMed. "
+            "« Lancer la recherche » interroge PubMed et ne récupère que les articles nouveaux."
+        )
+
+    elif mode_recherche == "Par mots-clés":
         mots_cles_fr = st.text_input(
             "Mots-clés",
             placeholder="diabète, hypertension..."
@@ -987,6 +1093,19 @@ with st.sidebar:
         ["Tous les articles", "Titre + abstract disponibles", "PDF gratuit uniquement"]
     )
 
+    sections_a_traduire = st.multiselect(
+        "Sections à traduire (texte intégral)",
+        list(SECTIONS_UTILES) + ["references", "boilerplate"],
+        default=list(SECTIONS_UTILES),
+        format_func=lambda s: LIBELLES_SECTIONS.get(s, s)
+    )
+
+    nb_prechargement_ia = st.slider(
+        "Pré-calculer les résumés des N premiers résultats",
+        0, 10, 0,
+        help="En arrière-plan ; les autres résultats sont traités à la demande."
+    )
+
     lancer = st.button("🔍 Lancer la recherche", type="primary", use_container_width=True)
 
     st.markdown("---")
@@ -1008,19 +1127,97 @@ if st.session_state.get("traductions_pdf"):
 # PARTIE 8 — LOGIQUE DE RECHERCHE (ADAPTÉE)
 # ============================================
 
+def charger_articles(pmids):
+    """
+    Métadonnées + traduction par lots des titres et abstracts d'une page de PMIDs.
+    Les articles déjà présents dans le corpus local ne sont pas redemandés à PubMed.
+    """
+    connus = articles_indexes(pmids)
+    nouveaux = [p for p in pmids if p not in connus]
+    if st.session_state.debug and connus:
+        st.caption(f"📚 {len(connus)} article(s) servis par le corpus local, {len(nouveaux)} demandé(s) à PubMed")
+
+    articles, erreur = pubmed_fetch_metadata_and_abstracts(nouveaux) if nouveaux else ([], None)
+    if erreur:
+        st.error(f"❌ {erreur}")
+    if articles:
+        enrichir_et_indexer(articles)
+    par_pmid = {**connus, **{a["pmid"]: a for a in articles}}
+    return [par_pmid[p] for p in pmids if p in par_pmid]
+
+
+def enrichir_et_indexer(articles):
+    """Traduction par lots (avec cache) puis ajout au corpus local."""
+    barre_enrichissement = st.progress(0.0, text="🇫🇷 Traduction des titres et abstracts...")
+    stats_enrichissement = enrichir_resultats(
+        articles,
+        progress_callback=lambda p: barre_enrichissement.progress(
+            p, text="🇫🇷 Traduction des titres et abstracts..."
+        )
+    )
+    barre_enrichissement.empty()
+    if st.session_state.debug:
+        st.caption(
+            f"Enrichissement : {stats_enrichissement['textes']} textes, "
+            f"{stats_enrichissement['en_cache']} en cache, "
+            f"{stats_enrichissement['traduits']} traduits en {stats_enrichissement['appels']} appel(s)"
+        )
+    indexer_articles(articles)
+
+
+def filtrer_par_acces(articles, type_acces):
+    """Articles conformes au type d'accès choisi dans la barre latérale."""
+    retenus = []
+    for meta in articles:
+        if type_acces == "Titre + abstract disponibles" and not meta.get("abstract_en"):
+            continue
+        if type_acces == "PDF gratuit uniquement":
+            ok, url_pdf, reason = check_pdf_free_unpaywall(meta.get("doi"), UNPAYWALL_EMAIL)
+            if not ok:
+                if st.session_state.debug:
+                    st.warning(f"PMID {meta['pmid']} — PDF non disponible : {reason}")
+                continue
+        retenus.append(meta)
+    return retenus
+
+
+# Corpus local : recherche instantanée à chaque saisie, sans PubMed ni traduction des mots-clés
+if mode_recherche == MODE_CORPUS_LOCAL and not lancer:
+    filtres_locaux = (mots_cles_fr.strip(), date_debut.year, date_fin.year, nb_max, type_acces)
+    if filtres_locaux != st.session_state.filtres_locaux:
+        st.session_state.filtres_locaux = filtres_locaux
+        articles_locaux, erreur_locale = rechercher_local(
+            mots_cles_fr, limite=nb_max, annee_min=date_debut.year, annee_max=date_fin.year
+        )
+        if erreur_locale:
+            st.error(f"❌ {erreur_locale}")
+        st.session_state.articles = articles_locaux
+        st.session_state.articles_affiches = filtrer_par_acces(articles_locaux, type_acces)
+        st.session_state.recherche_courante = None
+        st.session_state.page_resultats = 0
+        st.session_state.page_articles = 0
+elif mode_recherche != MODE_CORPUS_LOCAL:
+    st.session_state.filtres_locaux = None
+
 if lancer:
     st.info("🔍 Recherche lancée...")
 
     st.session_state.articles = []
     st.session_state.details = {}
-
-    if mode_recherche == "Par mots-clés" and not mots_cles_fr.strip():
+    st.session_state.articles_affiches = []
+    st.session_state.actions_ia_demandees = set()
+    st.session_state.job_prechargement_ia = None
+    st.session_state.page_resultats = 0
+    st.session_state.page_articles = 0
+    st.session_state.recherche_courante = None
+
+    if mode_recherche != "Par spécialité médicale" and not mots_cles_fr.strip():
         st.error("❌ Merci de saisir au moins un mot-clé.")
         st.stop()
 
     try:
         # 1️⃣ Construction de la requête
-        if mode_recherche == "Par mots-clés":
+        if mode_recherche != "Par spécialité médicale":
             st.info("📝 Traduction des mots-clés...")
             mots_cles_en = traduire_mots_cles_gemini(mots_cles_fr, G_KEY)
             base_query = mots_cles_en
@@ -1047,61 +1244,102 @@ if lancer:
         if st.session_state.debug:
             st.code(query, language="text")
 
-        # 2️⃣ Recherche des PMIDs
-        pmids = pubmed_search_ids(query, max_results=nb_max)
+        # 2️⃣ Recherche des PMIDs (les pages suivantes : « Charger plus »)
+        recherche = pubmed_search_ids(query, max_results=nb_max)
+        pmids = recherche["ids"][:nb_max] if recherche else []
         if not pmids:
             st.warning("Aucun article trouvé pour cette requête.")
             st.stop()
-        st.success(f"📄 {len(pmids)} articles trouvés")
+        st.session_state.recherche_courante = dict(recherche, ids=pmids)
+        st.success(f"📄 {recherche['count']} articles trouvés — {len(pmids)} chargés")
 
-        # 3️⃣ Récupération des métadonnées
-        articles = pubmed_fetch_metadata_and_abstracts(pmids)
+        # 3️⃣ Récupération des métadonnées + traduction des titres et abstracts par lots (avec cache)
+        articles = charger_articles(pmids)
         if not articles:
             st.error("❌ Impossible de récupérer les métadonnées PubMed.")
             st.stop()
         st.session_state.articles = articles
 
         # 4️⃣ Filtrage selon type d'accès
-        articles_affiches = []
-        for meta in articles:
-            if type_acces == "Titre + abstract disponibles" and not meta.get("abstract_en"):
-                continue
-            if type_acces == "PDF gratuit uniquement":
-                ok, url_pdf, reason = check_pdf_free_unpaywall(meta.get("doi"), UNPAYWALL_EMAIL)
-                if not ok:
-                    if st.session_state.debug:
-                        st.warning(f"PMID {meta['pmid']} — PDF non disponible : {reason}")
-                    continue
-            articles_affiches.append(meta)
-
-        # 5️⃣ Affichage des résultats
-        st.subheader("📑 Résultats de la recherche")
-
+        articles_affiches = filtrer_par_acces(articles, type_acces)
+        st.session_state.articles_affiches = articles_affiches
         if not articles_affiches:
             st.warning("Aucun article ne correspond aux critères d'accès sélectionnés.")
-        else:
-            for meta in articles_affiches:
-                with st.expander(f"{meta['title_en']} ({meta['journal']} {meta['year']})"):
-                    st.write(f"**PMID :** {meta['pmid']}")
-                    st.write(f"**DOI :** {meta.get('doi', 'N/A')}")
-                    st.write("### Abstract (EN)")
-                    st.write(meta.get("abstract_en", "_Non disponible_"))
 
-                    with st.expander("🇫🇷 Traduction du titre"):
-                        st.write(traduire_avec_fallback(meta["title_en"]))
-
-                    with st.expander("🇫🇷 Traduction de l'abstract"):
-                        st.write(traduire_avec_fallback(meta["abstract_en"]))
-
-                    with st.expander("📝 Résumé court"):
-                        st.write(resumer_avec_fallback(meta["abstract_en"], mode="court"))
-
-                    with st.expander("📘 Résumé long"):
-                        st.write(resumer_avec_fallback(meta["abstract_en"], mode="long"))
+        # Pré-calcul optionnel des premiers résultats, en tâche de fond
+        if nb_prechargement_ia and articles_affiches:
+            st.session_state.job_prechargement_ia = soumettre(
+                "prechargement_ia",
+                {"articles": [
+                    {"pmid": m["pmid"], "title_en": m.get("title_en"), "abstract_en": m.get("abstract_en")}
+                    for m in articles_affiches[:nb_prechargement_ia]
+                ]}
+            )
 
     except Exception as e:
         st.error(f"❌ Erreur lors de la recherche : {e}")
 
+# 5️⃣ Affichage des résultats (hors du bloc de recherche : les boutons survivent aux reruns).
+# Aucun appel IA au rendu : chaque traduction / résumé est calculé à la demande
+# (ou pré-calculé en arrière-plan), puis servi depuis le cache.
+if st.session_state.articles_affiches:
+    st.subheader("📑 Résultats de la recherche")
+
+    job_ia = etat_job(st.session_state.job_prechargement_ia)
+    precalcules = job_ia["partiel"] if job_ia else {}
+    if job_ia and job_ia["statut"] in STATUTS_ACTIFS:
+        st.caption(f"⏳ Pré-calcul IA en arrière-plan : {int(job_ia['progression'] * 100)} %")
+
+    # Seule la page visible est construite
+    _, debut, fin = navigation_pages("page_resultats", len(st.session_state.articles_affiches))
+
+    for meta in st.session_state.articles_affiches[debut:fin]:
+        with st.expander(f"{meta['title_fr']} ({meta['journal']} {meta['year']})"):
+            st.markdown(f"*{meta['title_en']}*")
+            if meta.get("extrait"):
+                st.caption(f"📚 {meta['extrait']}")
+            st.write(f"**PMID :** {meta['pmid']}")
+            st.write(f"**DOI :** {meta.get('doi', 'N/A')}")
+            st.write("### Abstract (FR)")
+            st.write(meta.get("abstract_fr") or "_Non disponible_")
+            if st.checkbox("Voir abstract original (EN)", key=f"abstract_en_{meta['pmid']}"):
+                st.write(meta.get("abstract_en") or "_Non disponible_")
+
+            for action, libelle in ACTIONS_IA.items():
+                cle = f"{meta['pmid']}:{action}"
+                if cle not in st.session_state.actions_ia_demandees and cle not in precalcules:
+                    if st.button(libelle, key=f"ia_{cle}"):
+                        st.session_state.actions_ia_demandees.add(cle)
+                    else:
+                        continue
+                st.markdown(f"**{libelle}**")
+                with st.spinner("Calcul en cours..."):
+                    st.write(calculer_action_ia(action, meta.get("abstract_en")))
+
+# « Charger plus » : page suivante de la même recherche (retstart), sans relancer esearch en entier
+recherche = st.session_state.recherche_courante
+if recherche and reste_a_charger(recherche) and len(st.session_state.articles) >= MAX_ARTICLES_SESSION:
+    st.caption(
+        f"{len(recherche['ids'])} articles chargés sur {recherche['count']} — limite de {MAX_ARTICLES_SESSION} "
+        f"articles par session atteinte : affinez la recherche ou interrogez le corpus local"
+    )
+elif recherche and reste_a_charger(recherche):
+    st.caption(f"{len(recherche['ids'])} articles chargés sur {recherche['count']}")
+    if st.button(f"⬇️ Charger {min(nb_max, reste_a_charger(recherche))} articles de plus", key="charger_plus"):
+        charges = len(recherche["ids"])
+        recherche, nouveaux, erreur = charger_plus(recherche, par_page=nb_max)
+        if erreur:
+            st.error(f"❌ {erreur}")
+        else:
+            st.session_state.recherche_courante = dict(recherche, ids=recherche["ids"][:charges + len(nouveaux)])
+            deja = {a["pmid"] for a in st.session_state.articles}
+            articles = charger_articles([p for p in nouveaux if p not in deja])
+            st.session_state.articles = st.session_state.articles + articles
+            st.session_state.articles_affiches = (
+                st.session_state.articles_affiches + filtrer_par_acces(articles, type_acces)
+            )
+            st.rerun()
+
 
 # ============================================
 # PARTIE 9 — AFFICHAGE DES ARTICLES
@@ -1111,8 +1349,17 @@ total_articles = len(st.session_state.articles)
 
 if total_articles > 0:
     st.success(f"📊 {total_articles} articles disponibles")
-    
-    for art in st.session_state.articles:
+
+    # Pagination : seuls les widgets de la page visible sont construits
+    page_articles, debut, fin = navigation_pages("page_articles", total_articles)
+
+    # Disponibilité PDF OA : page visible, et page suivante pré-chargée en arrière-plan
+    disponibilite_pdf_page(st.session_state.articles[debut:fin])
+    debut_suiv, fin_suiv = bornes_page(page_articles + 1, total_articles)
+    if debut_suiv >= fin:
+        disponibilite_pdf_page(st.session_state.articles[debut_suiv:fin_suiv], suivre=False)
+
+    for art in st.session_state.articles[debut:fin]:
         pmid = art["pmid"]
 
         with st.expander(f"{art['title_fr']} ({art['journal']} {art['year']}) - PMID {pmid}"):
@@ -1134,89 +1381,112 @@ if total_articles > 0:
             # Indication de disponibilité PDF OA
             if art.get("has_free_pdf"):
                 st.success("✅ PDF gratuit (Open Access) disponible")
+            elif "has_free_pdf" not in art:
+                st.caption("⏳ Vérification Unpaywall en cours...")
             else:
                 st.info("ℹ️ PDF gratuit non identifié via Unpaywall")
 
-            # Sélection et extraction/traduction du PDF pour cet article
-            if art.get("has_free_pdf"):
+            # Sélection et extraction/traduction du texte intégral pour cet article
+            # (XML JATS si PMCID, sinon PDF Open Access)
+            if art.get("has_free_pdf") or art.get("pmcid"):
                 if st.button(
                     "📄 Extraire & traduire le PDF en français",
                     key=f"btn_extract_{pmid}"
                 ):
-                    with st.spinner("Récupération du PDF et traduction..."):
-                        # Récupération du PDF via cascade
-                        pdf_content, source_msg = fetch_pdf_cascade(
-                            pmid=art["pmid"],
-                            doi=art.get("doi"),
-                            pmcid=art.get("pmcid"),
-                            unpaywall_email=UNPAYWALL_EMAIL,
-                            utiliser_scihub=False
+                    # Tâche de fond : survit aux reruns (autres boutons, expanders...)
+                    st.session_state.jobs_traduction[pmid] = soumettre(
+                        "traduction_article",
+                        {
+                            "art": art,
+                            "sections": list(sections_a_traduire),
+                            "mode": MODE_TRAD
+                        },
+                        cle=f"traduction:{pmid}:{MODE_TRAD}:{','.join(sections_a_traduire)}"
+                    )
+                    st.query_params["trad"] = list(st.session_state.jobs_traduction.values())
+
+                job = etat_job(st.session_state.jobs_traduction.get(pmid))
+                if job and job["statut"] in STATUTS_ACTIFS:
+                    suivre_job(job["id"])
+                    st.caption("⚙️ Traitement en arrière-plan : la page se met à jour automatiquement.")
+                elif job and job["statut"] == "erreur":
+                    st.error(f"Erreur pendant le traitement : {job['erreur']}")
+                elif job and job["statut"] == "termine":
+                    resultat = job["resultat"]
+
+                    if resultat["erreur"]:
+                        st.error(resultat["erreur"])
+                    else:
+                        if st.session_state.debug:
+                            st.caption(f"Source : {resultat['source']}")
+                        # PDF et zip générés par la tâche ; régénérés une fois si purgés (24 h)
+                        ids = st.session_state.fichiers_regeneres.get(job["id"], resultat)
+                        pdf_bytes, zip_bytes = lire_artefact(ids.get("pdf")), lire_artefact(ids.get("zip"))
+                        if pdf_bytes is None or zip_bytes is None:
+                            ids = fichiers_traduction(art, resultat["texte_fr"])
+                            st.session_state.fichiers_regeneres[job["id"]] = ids
+                            pdf_bytes, zip_bytes = lire_artefact(ids["pdf"]), lire_artefact(ids["zip"])
+                        filename = f"veille_{art['pmid']}.pdf"
+
+                        # Bouton de téléchargement classique
+                        st.download_button(
+                            label="⬇️ Télécharger la traduction en PDF",
+                            data=pdf_bytes,
+                            file_name=filename,
+                            mime="application/pdf",
+                            key=f"download_{pmid}"
+                        )
+
+                        # Export NotebookLM (sources découpées + manifeste)
+                        st.download_button(
+                            label="🎙️ Télécharger pour NotebookLM (.zip)",
+                            data=zip_bytes,
+                            file_name=f"veille_{art['pmid']}_notebooklm.zip",
+                            mime="application/zip",
+                            key=f"download_nlm_{pmid}"
                         )
 
-                        if not pdf_content:
-                            st.error(f"Impossible de récupérer le PDF : {source_msg}")
-                        else:
-                            texte_pdf_en, methode = extract_text_from_pdf(pdf_content)
-                            texte_pdf_en = tronquer(texte_pdf_en, max_len=12000)
-
-                            if not texte_pdf_en:
-                                st.warning("Texte PDF non exploitable ou trop court.")
-                            else:
-                                texte_pdf_fr = traduire_long_texte_cache(
-                                    texte_pdf_en,
-                                    MODE_TRAD,
-                                    deepl_key=DEEPL_KEY,
-                                    g_key=G_KEY,
-                                    chunk_size=2000
-                                )
-
-                                # Construire un texte structuré pour NotebookLM
-                                contenu_notebooklm = build_notebooklm_export(
-                                    art,
-                                    texte_pdf_fr
-                                )
-
-                                # Générer le PDF
-                                titre_pdf = f"{art.get('title_fr') or art.get('title_en')}"
-                                pdf_bytes = build_pdf_from_text(
-                                    titre_pdf,
-                                    contenu_notebooklm
-                                )
-                                filename = f"veille_{art['pmid']}.pdf"
-
-                                # Bouton de téléchargement classique
-                                st.download_button(
-                                    label="⬇️ Télécharger la traduction en PDF",
-                                    data=pdf_bytes,
-                                    file_name=filename,
-                                    mime="application/pdf",
-                                    key=f"download_{pmid}"
-                                )
-
-                                # Lien iOS-safe
-                                st.markdown(
-                                    bouton_download_pdf_ios_safe(
-                                        "⬇️ Télécharger pour iPhone / iPad",
-                                        pdf_bytes,
-                                        filename
-                                    ),
-                                    unsafe_allow_html=True
-                                )
-
-                                # Sauvegarde dans un historique de traductions
-                                if "traductions_pdf" not in st.session_state:
-                                    st.session_state.traductions_pdf = []
-                                st.session_state.traductions_pdf.append({
-                                    "timestamp": maintenant_str(),
-                                    "pmid": art["pmid"],
-                                    "title_fr": art.get("title_fr"),
-                                    "title_en": art.get("title_en"),
-                                    "journal": art.get("journal"),
-                                    "year": art.get("year"),
-                                    "filename": filename
-                                })
-                                get_traductions_pdf_historiques(st.session_state.traductions_pdf)
-
-                                st.success("✅ PDF extrait, traduit et prêt pour NotebookLM.")
+                        # Lien iOS-safe, seulement si les liens signés sont configurés
+                        lien_ios = bouton_download_pdf_ios_safe(
+                            "⬇️ Télécharger pour iPhone / iPad",
+                            pdf_bytes,
+                            filename
+                        )
+                        if lien_ios:
+                            st.markdown(lien_ios, unsafe_allow_html=True)
+
+                        # Sauvegarde dans un historique de traductions (une fois par tâche)
+                        if not any(t.get("job") == job["id"] for t in st.session_state.traductions_pdf):
+                            st.session_state.traductions_pdf = enregistrer_traduction_pdf({
+                                "timestamp": maintenant_str(),
+                                "pmid": art["pmid"],
+                                "title_fr": art.get("title_fr"),
+                                "title_en": art.get("title_en"),
+                                "journal": art.get("journal"),
+                                "year": art.get("year"),
+                                "filename": filename,
+                                "job": job["id"]
+                            })
+
+                        st.success("✅ PDF extrait, traduit et prêt pour NotebookLM.")
 else:
     st.info("👈 Utilisez le menu latéral pour lancer une recherche")
+
+# Profil de démarrage (mode debug) : durée du script et chargements différés
+if st.session_state.debug:
+    with st.sidebar.expander("⏱️ Profil de démarrage"):
+        st.caption(f"Exécution du script : {(time.perf_counter() - DEBUT_SCRIPT) * 1000:.0f} ms")
+        for module, secondes in sorted(TEMPS_CHARGEMENT.items(), key=lambda m: -m[1]):
+            st.caption(f"{module} : chargé au premier usage en {secondes * 1000:.0f} ms")
+
+    with st.sidebar.expander("🗄️ Cache partagé"):
+        for espace, stats in cache_partage().statistiques().items():
+            appels = stats["succes"] + stats["echecs"]
+            taux = f"{stats['succes'] / appels:.0%}" if appels else "—"
+            st.caption(
+                f"{espace} : {stats['entrees']} entrées, {stats['octets'] / 1024:.0f} Ko — "
+                f"succès {taux} ({stats['succes']}/{appels}), {stats['evictions']} évictions"
+            )
+
+    with st.sidebar.expander("🧠 Mémoire de la session"):
+        panneau_memoire_session()
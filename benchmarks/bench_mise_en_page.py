@@ -0,0 +1,113 @@
+# ============================================
+# MICROBENCHMARK — CÉSURE DES LIGNES PDF
+# ============================================
+
+"""
+Compare l'ancienne césure de build_pdf_from_text (largeur recalculée sur
+toute la ligne à chaque mot) au moteur incrémental de utils_mise_en_page.
+
+Usage :
+    python benchmarks/bench_mise_en_page.py [--caracteres 12000] [--repetitions 20]
+
+Utilise les métriques Helvetica de reportlab ; sans reportlab, une largeur
+synthétique proportionnelle au nombre de caractères est employée.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils_mise_en_page import MiseEnPage
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "traduction_article.txt")
+
+POLICE = "Helvetica"
+TAILLE = 11
+LARGEUR_MAX = 595.27 - 2 * 50  # A4 moins les marges de build_pdf_from_text
+
+
+def fonction_largeur():
+    """stringWidth reportlab si disponible, sinon largeur synthétique."""
+    try:
+        from reportlab.pdfbase.pdfmetrics import stringWidth
+        return (lambda texte: stringWidth(texte, POLICE, TAILLE)), "reportlab"
+    except ImportError:
+        # Somme par glyphe, comme stringWidth (coût proportionnel à la longueur)
+        largeurs = {c: 0.28 if c in " il.,;:'" else 0.56 for c in map(chr, range(32, 256))}
+        return (lambda texte: sum(largeurs.get(c, 0.6) for c in texte) * TAILLE), "synthétique"
+
+
+def ancienne_cesure(texte, largeur_fn, max_width):
+    """Implémentation d'origine de wrap_text (app.py), appliquée à tout le document."""
+    resultat = []
+    for paragraphe in texte.split("\n"):
+        paragraphe = paragraphe.strip()
+        if not paragraphe:
+            resultat.append(None)
+            continue
+        words = paragraphe.split()
+        lines = []
+        line = ""
+        for w in words:
+            test_line = (line + " " + w).strip()
+            if largeur_fn(test_line) <= max_width:
+                line = test_line
+            else:
+                lines.append(line)
+                line = w
+        if line:
+            lines.append(line)
+        resultat.extend(lines)
+    return resultat
+
+
+def charger_document(nb_caracteres):
+    """Fixture répétée jusqu'à la taille demandée (traduction de 12 000 caractères par défaut)."""
+    with open(FIXTURE, encoding="utf-8") as f:
+        base = f.read()
+    texte = base
+    while len(texte) < nb_caracteres:
+        texte += "\n" + base
+    return texte[:nb_caracteres]
+
+
+def chronometrer(fn, repetitions):
+    """Meilleur temps sur N répétitions (secondes)."""
+    meilleur = float("inf")
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        fn()
+        meilleur = min(meilleur, time.perf_counter() - debut)
+    return meilleur
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--caracteres", type=int, default=12000)
+    parser.add_argument("--repetitions", type=int, default=20)
+    args = parser.parse_args()
+
+    largeur_fn, source = fonction_largeur()
+    texte = charger_document(args.caracteres)
+
+    # Le moteur est recréé à chaque passe : on mesure aussi le remplissage du cache
+    t_ancien = chronometrer(lambda: ancienne_cesure(texte, largeur_fn, LARGEUR_MAX), args.repetitions)
+    t_nouveau = chronometrer(
+        lambda: MiseEnPage(POLICE, TAILLE, largeur_fn).couper_document(texte, LARGEUR_MAX),
+        args.repetitions
+    )
+
+    lignes_ancien = ancienne_cesure(texte, largeur_fn, LARGEUR_MAX)
+    lignes_nouveau = MiseEnPage(POLICE, TAILLE, largeur_fn).couper_document(texte, LARGEUR_MAX)
+
+    print(f"Métriques : {source} | document : {len(texte)} caractères, {len(lignes_nouveau)} lignes")
+    print(f"Ancienne césure    : {t_ancien * 1000:8.2f} ms")
+    print(f"Césure incrémentale: {t_nouveau * 1000:8.2f} ms  (x{t_ancien / t_nouveau:.1f})")
+    print(f"Lignes identiques  : {'oui' if lignes_ancien == lignes_nouveau else 'non'}")
+
+
+if __name__ == "__main__":
+    main()
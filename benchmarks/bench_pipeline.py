@@ -0,0 +1,143 @@
+# ============================================
+# BENCHMARK — PIPELINE RECHERCHE → TEXTE → TRADUCTION
+# ============================================
+
+"""
+Mesure, étape par étape, le pipeline des apps : recherche PubMed
+(esearch), métadonnées (efetch), disponibilité PDF (Unpaywall), cascade
+texte intégral (JATS PMC / Europe PMC, sinon PDF Unpaywall), extraction
+PDF, traduction par lots.
+
+Hors ligne grâce à utils_rejeu :
+    VEILLE_REJEU=enregistrer python benchmarks/bench_pipeline.py   # une fois, en ligne
+    VEILLE_REJEU=rejouer python benchmarks/bench_pipeline.py       # hors ligne / CI
+    VEILLE_REJEU=rejouer VEILLE_REJEU_LATENCE=0 python benchmarks/bench_pipeline.py   # CPU seul
+
+Usage :
+    python benchmarks/bench_pipeline.py [--query "..."] [--max 10] [--repetitions 3]
+
+Traduction : DeepL si DEEPL_KEY est défini, sinon Gemini (GEMINI_KEY).
+Chaque essai utilise des données locales vierges (dossier temporaire,
+VEILLE_DATA_DIR) et un cache partagé vidé : aucun cache ne sert d'un
+essai à l'autre et .veille_data n'est pas modifié.
+Chaque étape appelle les fonctions des apps elles-mêmes (utils_recherche,
+utils_pubmed, utils_jats, utils_pdf, utils_enrichissement).
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_DONNEES_BENCH = tempfile.TemporaryDirectory(prefix="veille_bench_")
+os.environ["VEILLE_DATA_DIR"] = _DONNEES_BENCH.name
+
+import config_stockage
+from utils_rejeu import activer_rejeu, MODE_REJEU, STATS_REJEU
+
+activer_rejeu()
+
+from utils_cache import cache_partage
+from utils_jats import recuperer_texte_jats
+from utils_pdf import extraire_pages_routees
+from utils_pubmed import pubmed_fetch_metadata_and_abstracts, check_pdf_free_unpaywall, fetch_pdf_from_unpaywall
+from utils_recherche import rechercher
+
+QUERY_DEFAUT = "(Endometriosis[MeSH Terms]) AND (2024/01/01:2024/06/30[Date - Publication]) AND free full text[sb]"
+EMAIL_UNPAYWALL = os.getenv("UNPAYWALL_EMAIL", "example@email.com")
+
+
+def etape_recherche(query, max_results):
+    resultat, erreur = rechercher(query, max_results)
+    if erreur:
+        raise RuntimeError(erreur)
+    return resultat["ids"][:max_results]
+
+
+def etape_metadonnees(pmids):
+    articles, erreur = pubmed_fetch_metadata_and_abstracts(pmids)
+    if erreur:
+        raise RuntimeError(erreur)
+    return articles
+
+
+def etape_disponibilite(articles):
+    """Badge « PDF gratuit » de la liste de résultats (Unpaywall, sans téléchargement)."""
+    return sum(check_pdf_free_unpaywall(a["doi"], EMAIL_UNPAYWALL)[0] for a in articles)
+
+
+def etape_cascade(articles):
+    """Texte JATS si PMCID, sinon PDF Unpaywall. Retourne ({pmid: texte}, {pmid: pdf})."""
+    textes, pdfs = {}, {}
+    for article in articles:
+        if article["pmcid"]:
+            texte, _, _ = recuperer_texte_jats(article["pmcid"])
+            if texte:
+                textes[article["pmid"]] = texte
+                continue
+        if article["doi"]:
+            pdf, _ = fetch_pdf_from_unpaywall(article["doi"], EMAIL_UNPAYWALL)
+            if pdf:
+                pdfs[article["pmid"]] = pdf
+    return textes, pdfs
+
+
+def etape_extraction(pdfs):
+    return {pmid: "\n".join(extraire_pages_routees(pdf)[0]) for pmid, pdf in pdfs.items()}
+
+
+def etape_traduction(articles):
+    from utils_enrichissement import enrichir_articles, traduire_lot_deepl, traduire_lot_gemini
+
+    if os.getenv("DEEPL_KEY"):
+        return enrichir_articles(articles, lambda t: traduire_lot_deepl(t, os.getenv("DEEPL_KEY")), fournisseur="deepl")
+    return enrichir_articles(articles, lambda t: traduire_lot_gemini(t, os.getenv("GEMINI_KEY")), fournisseur="gemini")
+
+
+def executer(query, max_results):
+    temps = {}
+
+    def mesurer(nom, fonction, *args):
+        debut = time.perf_counter()
+        resultat = fonction(*args)
+        temps[nom] = time.perf_counter() - debut
+        return resultat
+
+    pmids = mesurer("recherche", etape_recherche, query, max_results)
+    articles = mesurer("metadonnees", etape_metadonnees, pmids)
+    disponibles = mesurer("disponibilite", etape_disponibilite, articles)
+    textes, pdfs = mesurer("cascade", etape_cascade, articles)
+    mesurer("extraction", etape_extraction, pdfs)
+    stats = mesurer("traduction", etape_traduction, articles)
+    return temps, {"articles": len(articles), "pdf_oa": disponibles, "jats": len(textes), "pdf": len(pdfs), "traduction": stats}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--query", default=QUERY_DEFAUT)
+    parser.add_argument("--max", type=int, default=10)
+    parser.add_argument("--repetitions", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"Mode : {MODE_REJEU or 'direct (réseau)'}")
+    mesures = []
+    for i in range(args.repetitions):
+        config_stockage.DOSSIER_DONNEES = os.path.join(_DONNEES_BENCH.name, f"essai_{i + 1}")
+        cache_partage().vider()
+        temps, resume = executer(args.query, args.max)
+        mesures.append(temps)
+        print(f"  essai {i + 1} : " + ", ".join(f"{k} {v * 1000:.0f} ms" for k, v in temps.items()))
+
+    print(f"\n{resume}")
+    print("\nMédiane par étape :")
+    for etape in mesures[0]:
+        valeurs = sorted(m[etape] for m in mesures)
+        print(f"  {etape:<12} {valeurs[len(valeurs) // 2] * 1000:8.1f} ms")
+    print(f"\nRejeu : {STATS_REJEU}")
+
+
+if __name__ == "__main__":
+    main()
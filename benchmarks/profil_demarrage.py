@@ -0,0 +1,73 @@
+# ============================================
+# PROFIL DE DÉMARRAGE — COÛT DES IMPORTS
+# ============================================
+
+"""
+Coût d'import à froid (processus neuf, python -X importtime) des
+dépendances des apps Streamlit et des modules utilitaires du dépôt.
+
+Usage :
+    python benchmarks/profil_demarrage.py [modules...]
+
+Sans argument, profile les SDK et bibliothèques PDF (chargés à la demande
+depuis utils_chargement) et les modules importés au démarrage des apps.
+Les modules absents de l'environnement sont signalés.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils_chargement import profil_imports_a_froid
+
+# Chargés à la demande (premier usage)
+MODULES_DIFFERES = [
+    "google.generativeai",
+    "anthropic",
+    "reportlab.pdfgen.canvas",
+    "pypdf",
+    "pdfplumber",
+    "fitz",
+]
+
+# Chargés au démarrage des apps
+MODULES_DEMARRAGE = [
+    "streamlit",
+    "requests",
+    "utils_text",
+    "utils_jats",
+    "utils_pdf",
+    "utils_cache_export",
+    "utils_enrichissement",
+    "utils_jobs",
+    "utils_artefacts",
+    "utils_cache",
+    "utils_recherche",
+    "utils_index",
+]
+
+
+def afficher(titre, resultats):
+    print(f"\n{titre}")
+    total = 0.0
+    for module, ms, details in resultats:
+        if ms is None:
+            print(f"  {module:<28} non installé")
+            continue
+        total += ms
+        principaux = ", ".join(f"{nom} {d:.0f}" for nom, d in details[:3])
+        print(f"  {module:<28} {ms:8.1f} ms   {principaux}")
+    print(f"  {'(somme, imports partagés comptés à chaque fois)':<28} {total:8.1f} ms")
+
+
+def main():
+    if len(sys.argv) > 1:
+        afficher("Imports à froid", profil_imports_a_froid(sys.argv[1:]))
+        return
+    afficher("Chargés à la demande (hors démarrage)", profil_imports_a_froid(MODULES_DIFFERES))
+    afficher("Chargés au démarrage", profil_imports_a_froid(MODULES_DEMARRAGE))
+
+
+if __name__ == "__main__":
+    main()
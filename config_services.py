@@ -0,0 +1,47 @@
+# ============================================
+# CONFIGURATION DES SERVICES EXTERNES
+# ============================================
+
+"""
+URL de base des services externes (NCBI, Unpaywall, Europe PMC, PMC,
+DeepL, Gemini, Claude), modifiables par variables d'environnement
+(VEILLE_URL_EUTILS, VEILLE_URL_DEEPL...).
+
+VEILLE_SERVICES_SIMULES=http://127.0.0.1:8600 fait pointer tous les
+services vers les serveurs simulés (python -m services_simules), pour
+les tests de charge et de repli.
+"""
+
+import os
+
+SERVICES_SIMULES = os.getenv("VEILLE_SERVICES_SIMULES", "").rstrip("/")
+
+
+def _url(variable: str, reelle: str, chemin_simule: str) -> str:
+    defaut = f"{SERVICES_SIMULES}{chemin_simule}" if SERVICES_SIMULES else reelle
+    return os.getenv(variable, defaut).rstrip("/")
+
+
+BASE_EUTILS = _url("VEILLE_URL_EUTILS", "https://eutils.ncbi.nlm.nih.gov/entrez/eutils", "/eutils")
+BASE_UNPAYWALL = _url("VEILLE_URL_UNPAYWALL", "https://api.unpaywall.org/v2", "/unpaywall/v2")
+BASE_EUROPEPMC = _url("VEILLE_URL_EUROPEPMC", "https://www.ebi.ac.uk/europepmc/webservices/rest", "/europepmc/rest")
+BASE_EUROPEPMC_RENDU = _url("VEILLE_URL_EUROPEPMC_RENDU", "https://europepmc.org/backend", "/europepmc/backend")
+BASE_PMC = _url("VEILLE_URL_PMC", "https://www.ncbi.nlm.nih.gov/pmc", "/pmc")
+BASE_PMC_OA = _url("VEILLE_URL_PMC_OA", "https://ftp.ncbi.nlm.nih.gov/pub/pmc", "/pmc-oa")
+URL_DEEPL = _url("VEILLE_URL_DEEPL", "https://api-free.deepl.com/v2/translate", "/deepl/v2/translate")
+
+# SDK LLM : None = point d'accès officiel
+URL_GEMINI = os.getenv("VEILLE_URL_GEMINI") or SERVICES_SIMULES or None
+URL_ANTHROPIC = os.getenv("VEILLE_URL_ANTHROPIC") or (f"{SERVICES_SIMULES}/anthropic" if SERVICES_SIMULES else None)
+
+
+def options_gemini() -> dict:
+    """Arguments supplémentaires de genai.configure() (point d'accès REST personnalisé)."""
+    if not URL_GEMINI:
+        return {}
+    return {"transport": "rest", "client_options": {"api_endpoint": URL_GEMINI}}
+
+
+def options_claude() -> dict:
+    """Arguments supplémentaires de anthropic.Anthropic()."""
+    return {"base_url": URL_ANTHROPIC} if URL_ANTHROPIC else {}
@@ -90,13 +90,3 @@ SPECIALITES = {
         "mesh_terms": "Hematology[MeSH Terms] OR Hematologic Diseases[MeSH Terms]"
     }
 }
-```
-
-**Structure de votre projet :**
-```
-votre-dossier/
-├── app.py
-├── config_specialites.py  ← créez ce fichier
-├── utils_text.py (si séparé)
-├── utils_traduction.py (si séparé)
-└── requirements.txt
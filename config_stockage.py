@@ -0,0 +1,23 @@
+# ============================================
+# CONFIGURATION DU STOCKAGE LOCAL
+# ============================================
+
+"""
+Emplacement des données locales de l'application (corpus appris,
+caches, exports...). Modifiable via la variable d'environnement
+VEILLE_DATA_DIR.
+"""
+
+import os
+
+DOSSIER_DONNEES = os.getenv(
+    "VEILLE_DATA_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".veille_data")
+)
+
+
+def chemin_donnees(*parties: str) -> str:
+    """Chemin dans le dossier de données (le dossier parent est créé si besoin)."""
+    chemin = os.path.join(DOSSIER_DONNEES, *parties)
+    os.makedirs(os.path.dirname(chemin), exist_ok=True)
+    return chemin
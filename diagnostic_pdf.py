@@ -1,16 +1,40 @@
 import streamlit as st
-import google.generativeai as genai
 import requests
 import json
 from datetime import datetime, date, timedelta
 import xml.etree.ElementTree as ET
-from fpdf import FPDF
-import io
-import pypdf
 from io import BytesIO
 import re
-import time
 import tarfile
+import time
+from utils_chargement import differe
+from utils_rejeu import activer_rejeu
+
+# Enregistrement / rejeu des appels externes si VEILLE_REJEU est défini (benchmarks hors ligne)
+activer_rejeu()
+
+# SDK et bibliothèques chargés au premier usage (démarrage plus rapide)
+genai = differe("google.generativeai")
+pypdf = differe("pypdf")
+from utils_jats import recuperer_texte_jats
+from config_services import (
+    BASE_EUTILS, BASE_UNPAYWALL, BASE_EUROPEPMC, BASE_EUROPEPMC_RENDU, BASE_PMC, BASE_PMC_OA, URL_DEEPL,
+    options_gemini
+)
+from utils_pdf import extraire_pages_routees
+from utils_cache_export import export_pdf_selection, export_notebooklm_selection
+from utils_enrichissement import enrichir_articles, traduire_lot_deepl, traduire_lot_gemini
+from utils_jobs import (
+    STATUTS_ACTIFS, soumettre, etat_job, job_par_cle, annuler, enregistrer_tache, reprendre_jobs, suivre_job
+)
+from utils_pagination import PAR_PAGE_DEFAUT, navigation_pages
+from utils_recherche import rechercher, charger_plus, reste_a_charger
+from utils_index import indexer_articles
+from utils_session import decharger, recharger, panneau_memoire_session
+from utils_text import (
+    SECTIONS_UTILES, LIBELLES_SECTIONS, filtrer_sections, resume_stats_sections,
+    retirer_entetes_pieds, cle_editeur
+)
 
 st.set_page_config(page_title="Veille Médicale Pro", layout="wide")
 
@@ -114,11 +138,17 @@ if 'info_recherche' not in st.session_state:
     st.session_state.info_recherche = {}
 if 'analyses_individuelles' not in st.session_state:
     st.session_state.analyses_individuelles = {}
+if 'ids_previsualises' not in st.session_state:
+    st.session_state.ids_previsualises = []  # tous les PMID trouvés (titres chargés page par page)
+if 'selection_previsualisation' not in st.session_state:
+    st.session_state.selection_previsualisation = []  # PMID cochés, conservés d'une page à l'autre
+if 'recherche_courante' not in st.session_state:
+    st.session_state.recherche_courante = None  # count, WebEnv, PMID chargés (« Charger plus »)
 
 def traduire_avec_deepl(texte, api_key):
     """Traduit avec DeepL"""
     try:
-        url = "https://api-free.deepl.com/v2/translate"
+        url = URL_DEEPL
         data = {"auth_key": api_key, "text": texte, "target_lang": "FR", "source_lang": "EN", "formality": "more"}
         response = requests.post(url, data=data, timeout=30)
         if response.status_code == 200:
@@ -146,10 +176,12 @@ def nettoyer_titre(titre):
     
     return titre.strip()
 
-def traduire_texte(texte, mode="gemini"):
+def traduire_texte(texte, mode="gemini", erreurs=None):
     """
     Traduit avec prompt engineering optimisé
     AMÉLIORATION: Prompt plus structuré pour éviter les artefacts
+    Avec `erreurs` (liste), les erreurs y sont ajoutées au lieu d'être
+    affichées (appel depuis une tâche de fond, sans contexte Streamlit).
     """
     if not texte or len(texte.strip()) < 3:
         return texte
@@ -160,7 +192,7 @@ def traduire_texte(texte, mode="gemini"):
             return nettoyer_titre(trad)
     
     try:
-        genai.configure(api_key=G_KEY)
+        genai.configure(api_key=G_KEY, **options_gemini())
         model = genai.GenerativeModel('gemini-2.0-flash-exp')
         
         # NOUVEAU PROMPT OPTIMISÉ
@@ -189,13 +221,16 @@ TRADUCTION FRANÇAISE:"""
         
         return traduction
     except Exception as e:
-        st.warning(f"Erreur traduction: {str(e)}")
+        if erreurs is not None:
+            erreurs.append(f"Erreur traduction: {str(e)}")
+        else:
+            st.warning(f"Erreur traduction: {str(e)}")
         return texte
 
 def get_doi_from_pubmed(pmid):
     """Récupère le DOI depuis PubMed"""
     try:
-        base_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi"
+        base_url = f"{BASE_EUTILS}/efetch.fcgi"
         params = {
             "db": "pubmed",
             "id": pmid,
@@ -221,7 +256,7 @@ def get_pmcid_from_pubmed(pmid):
     Essentiel pour accéder aux articles PMC Open Access
     """
     try:
-        base_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi"
+        base_url = f"{BASE_EUTILS}/efetch.fcgi"
         params = {
             "db": "pubmed",
             "id": pmid,
@@ -251,7 +286,7 @@ def verifier_pdf_disponible_pubmed(pmid):
     Évite les tentatives inutiles et accélère le processus
     """
     try:
-        base_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/elink.fcgi"
+        base_url = f"{BASE_EUTILS}/elink.fcgi"
         params = {
             "dbfrom": "pubmed",
             "id": pmid,
@@ -292,7 +327,7 @@ def get_pdf_via_pmc_ftp(pmcid):
             dir2 = pmcid_num[-3:].zfill(3)
         
         # Méthode 1: Essayer le tar.gz (archive complète)
-        tar_url = f"https://ftp.ncbi.nlm.nih.gov/pub/pmc/oa_pdf/{dir1}/{dir2}/PMC{pmcid_num}.tar.gz"
+        tar_url = f"{BASE_PMC_OA}/oa_pdf/{dir1}/{dir2}/PMC{pmcid_num}.tar.gz"
         
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
@@ -315,7 +350,7 @@ def get_pdf_via_pmc_ftp(pmcid):
                 pass
         
         # Méthode 2: Essayer le PDF direct (URL web)
-        pdf_url_direct = f"https://www.ncbi.nlm.nih.gov/pmc/articles/PMC{pmcid_num}/pdf/"
+        pdf_url_direct = f"{BASE_PMC}/articles/PMC{pmcid_num}/pdf/"
         response = requests.get(pdf_url_direct, timeout=20, headers=headers, allow_redirects=True)
         
         if response.status_code == 200 and 'application/pdf' in response.headers.get('Content-Type', ''):
@@ -336,7 +371,7 @@ def get_pdf_via_pmc(pmcid):
     
     try:
         # URL directe PMC PDF
-        pdf_url = f"https://www.ncbi.nlm.nih.gov/pmc/articles/PMC{pmcid}/pdf/"
+        pdf_url = f"{BASE_PMC}/articles/PMC{pmcid}/pdf/"
         
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
@@ -363,7 +398,7 @@ def get_pdf_via_unpaywall(doi, email="medical.research@pubmed.search"):
         return None, "Pas de DOI"
     
     try:
-        url = f"https://api.unpaywall.org/v2/{doi}"
+        url = f"{BASE_UNPAYWALL}/{doi}"
         params = {"email": email}
         
         response = requests.get(url, params=params, timeout=15)
@@ -415,7 +450,7 @@ def get_pdf_via_europepmc(pmid, pmcid=None):
     try:
         # Méthode 1: Via PMCID si disponible
         if pmcid:
-            pdf_url = f"https://europepmc.org/backend/ptpmcrender.fcgi?accid=PMC{pmcid}&blobtype=pdf"
+            pdf_url = f"{BASE_EUROPEPMC_RENDU}/ptpmcrender.fcgi?accid=PMC{pmcid}&blobtype=pdf"
             
             headers = {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
@@ -427,7 +462,7 @@ def get_pdf_via_europepmc(pmid, pmcid=None):
                 return response.content, None
         
         # Méthode 2: Recherche via API Europe PMC
-        api_url = f"https://www.ebi.ac.uk/europepmc/webservices/rest/search"
+        api_url = f"{BASE_EUROPEPMC}/search"
         params = {
             "query": f"EXT_ID:{pmid}",
             "format": "json",
@@ -450,7 +485,7 @@ def get_pdf_via_europepmc(pmid, pmcid=None):
                     ext_id = result.get('id', '')
                     
                     if source == 'PMC' and ext_id:
-                        pdf_url = f"https://europepmc.org/backend/ptpmcrender.fcgi?accid={ext_id}&blobtype=pdf"
+                        pdf_url = f"{BASE_EUROPEPMC_RENDU}/ptpmcrender.fcgi?accid={ext_id}&blobtype=pdf"
                         
                         pdf_response = requests.get(pdf_url, timeout=20, headers=headers)
                         
@@ -506,12 +541,18 @@ def get_pdf_via_scihub(doi):
     except Exception as e:
         return None, f"Erreur Sci-Hub: {str(e)}"
 
-def extraire_texte_pdf_ameliore(pdf_content):
+def extraire_pages_pdf(pdf_content):
     """
-    AMÉLIORATION: Essaie pdfplumber d'abord, puis pypdf en fallback
-    pdfplumber est meilleur pour les PDFs médicaux multi-colonnes
+    AMÉLIORATION: Routage par page (PyMuPDF rapide, pdfplumber seulement
+    pour les pages multi-colonnes ou tableaux), puis pdfplumber / pypdf en fallback
+    Retourne (liste des textes de page, méthode)
     """
-    texte_complet = ""
+    # Méthode 0: Routage selon la mise en page (pages scannées signalées pour OCR)
+    pages, methode, _ = extraire_pages_routees(pdf_content, max_pages=15)
+    if sum(len(p) for p in pages) > 100:
+        return pages, methode
+    
+    pages = []
     
     # Méthode 1: Essayer pdfplumber (meilleur pour texte structuré)
     try:
@@ -526,12 +567,12 @@ def extraire_texte_pdf_ameliore(pdf_content):
                     page = pdf.pages[i]
                     texte_page = page.extract_text()
                     if texte_page:
-                        texte_complet += texte_page + "\n\n"
+                        pages.append(texte_page)
                 except:
                     continue
         
-        if len(texte_complet) > 100:
-            return texte_complet, "pdfplumber"
+        if sum(len(p) for p in pages) > 100:
+            return pages, "pdfplumber"
     
     except ImportError:
         # pdfplumber n'est pas installé
@@ -545,29 +586,30 @@ def extraire_texte_pdf_ameliore(pdf_content):
         pdf_file = BytesIO(pdf_content)
         pdf_reader = pypdf.PdfReader(pdf_file)
         
-        texte_complet = ""
+        pages = []
         nb_pages = min(len(pdf_reader.pages), 15)
         
         for i in range(nb_pages):
             try:
                 texte_page = pdf_reader.pages[i].extract_text()
-                texte_complet += texte_page + "\n\n"
+                pages.append(texte_page or "")
             except:
                 continue
         
-        if len(texte_complet) > 100:
-            return texte_complet, "pypdf"
+        if sum(len(p) for p in pages) > 100:
+            return pages, "pypdf"
     
     except Exception as e:
-        return "", f"Erreur extraction: {str(e)}"
+        return [], f"Erreur extraction: {str(e)}"
     
-    return texte_complet, "extraction_partielle"
+    return pages, "extraction_partielle"
 
-def telecharger_et_extraire_pdf_multi_sources(pmid, mode_traduction="gemini", progress_callback=None, utiliser_scihub=False):
+def telecharger_et_extraire_pdf_multi_sources(pmid, mode_traduction="gemini", progress_callback=None, utiliser_scihub=False, sections_gardees=SECTIONS_UTILES, journal=None):
     """
     VERSION AMÉLIORÉE v4: Système CASCADE optimisé pour PubMed gratuit
     
     Ordre de priorité OPTIMISÉ:
+    0. Texte intégral JATS PMC / Europe PMC (pas de PDF à parser)
     1. PMC FTP (source officielle - NOUVELLE)
     2. PMC Web (fallback)
     3. Unpaywall (Open Access)
@@ -575,6 +617,9 @@ def telecharger_et_extraire_pdf_multi_sources(pmid, mode_traduction="gemini", pr
     5. Sci-Hub (optionnel, dernier recours)
     
     Taux de succès attendu: 75-85% sans Sci-Hub, 90-95% avec Sci-Hub
+    
+    Seules les sections de `sections_gardees` sont traduites (références exclues par défaut)
+    `journal` affine le profil d'en-têtes/pieds appris (préfixe DOI + journal)
     """
     try:
         if progress_callback:
@@ -604,9 +649,28 @@ def telecharger_et_extraire_pdf_multi_sources(pmid, mode_traduction="gemini", pr
         
         pdf_content = None
         source_utilisee = None
+        texte_complet = None
+        methode = None
         
-        # MÉTHODE 1: PMC FTP (NOUVELLE - Source officielle prioritaire)
+        # MÉTHODE 0: XML JATS (texte déjà structuré, bien plus rapide qu'un PDF)
         if pmcid:
+            if progress_callback:
+                progress_callback(f"📥 Tentative texte intégral XML (PMC / Europe PMC)...")
+            
+            texte_jats, source_jats, erreur = recuperer_texte_jats(pmcid, sections_gardees=sections_gardees)
+            
+            if texte_jats:
+                texte_complet = texte_jats
+                methode = "jats"
+                source_utilisee = f"{source_jats} (PMC{pmcid})"
+                if progress_callback:
+                    progress_callback(f"✅ Texte intégral trouvé via {source_utilisee}")
+            else:
+                if progress_callback:
+                    progress_callback(f"❌ JATS: {erreur}")
+        
+        # MÉTHODE 1: PMC FTP (NOUVELLE - Source officielle prioritaire)
+        if not texte_complet and pmcid:
             if progress_callback:
                 progress_callback(f"📥 Tentative PMC FTP (source officielle)...")
             
@@ -621,7 +685,7 @@ def telecharger_et_extraire_pdf_multi_sources(pmid, mode_traduction="gemini", pr
                     progress_callback(f"❌ PMC FTP: {erreur}")
         
         # MÉTHODE 2: PMC Web (fallback si FTP échoue)
-        if not pdf_content and pmcid:
+        if not texte_complet and not pdf_content and pmcid:
             if progress_callback:
                 progress_callback(f"📥 Tentative PMC Web...")
             
@@ -637,7 +701,7 @@ def telecharger_et_extraire_pdf_multi_sources(pmid, mode_traduction="gemini", pr
                     progress_callback(f"❌ PMC Web: {erreur}")
         
         # MÉTHODE 3: Unpaywall
-        if not pdf_content and doi:
+        if not texte_complet and not pdf_content and doi:
             if progress_callback:
                 progress_callback(f"📥 Tentative Unpaywall ({doi})...")
             
@@ -653,7 +717,7 @@ def telecharger_et_extraire_pdf_multi_sources(pmid, mode_traduction="gemini", pr
                     progress_callback(f"❌ Unpaywall: {erreur}")
         
         # MÉTHODE 4: Europe PMC
-        if not pdf_content:
+        if not texte_complet and not pdf_content:
             if progress_callback:
                 progress_callback(f"📥 Tentative Europe PMC...")
             
@@ -669,7 +733,7 @@ def telecharger_et_extraire_pdf_multi_sources(pmid, mode_traduction="gemini", pr
                     progress_callback(f"❌ Europe PMC: {erreur}")
         
         # MÉTHODE 5: Sci-Hub (optionnel, dernier recours)
-        if not pdf_content and utiliser_scihub and doi:
+        if not texte_complet and not pdf_content and utiliser_scihub and doi:
             if progress_callback:
                 progress_callback(f"⚠️ Tentative Sci-Hub (dernier recours)...")
             
@@ -685,7 +749,7 @@ def telecharger_et_extraire_pdf_multi_sources(pmid, mode_traduction="gemini", pr
                     progress_callback(f"❌ Sci-Hub: {erreur}")
         
         # Si aucune source n'a fonctionné
-        if not pdf_content:
+        if not texte_complet and not pdf_content:
             message_erreur = "PDF non disponible via aucune source gratuite"
             if not doi and not pmcid:
                 message_erreur += " (pas de DOI ni PMCID)"
@@ -696,15 +760,29 @@ def telecharger_et_extraire_pdf_multi_sources(pmid, mode_traduction="gemini", pr
             
             return None, message_erreur
         
-        # Étape 2: Extraire le texte
-        if progress_callback:
-            progress_callback(f"📄 Extraction du texte PDF...")
-        
-        texte_complet, methode = extraire_texte_pdf_ameliore(pdf_content)
+        # Étape 2: Extraire le texte (inutile si le XML JATS a été récupéré)
+        if not texte_complet:
+            if progress_callback:
+                progress_callback(f"📄 Extraction du texte PDF...")
+            
+            pages, methode = extraire_pages_pdf(pdf_content)
+            
+            # Suppression des en-têtes / pieds répétés AVANT troncature
+            pages, economie = retirer_entetes_pieds(pages, cle_editeur(doi, journal))
+            if progress_callback and economie:
+                progress_callback(f"🧹 En-têtes/pieds de page retirés : {economie} caractères économisés")
+            
+            texte_complet = "\n\n".join(pages)
         
         if len(texte_complet) < 100:
             return None, f"Contenu PDF insuffisant (méthode: {methode})"
         
+        # Ne garder que les sections utiles (références, affiliations, tableaux exclus)
+        if methode != "jats":
+            texte_complet, stats_sections = filtrer_sections(texte_complet, sections_gardees)
+            if progress_callback:
+                progress_callback(f"✂️ {resume_stats_sections(stats_sections, sections_gardees)}")
+        
         # Tronquer si trop long
         if len(texte_complet) > 12000:
             texte_complet = texte_complet[:12000] + "\n\n[PDF tronqué pour analyse]"
@@ -738,7 +816,7 @@ def traduire_mots_cles(mots_cles_fr):
     Traduit mots-clés avec prompt optimisé
     """
     try:
-        genai.configure(api_key=G_KEY)
+        genai.configure(api_key=G_KEY, **options_gemini())
         model = genai.GenerativeModel('gemini-2.0-flash-exp')
         
         prompt = f"""Tu es un expert en terminologie médicale. Traduis ces mots-clés français en termes médicaux anglais optimisés pour PubMed.
@@ -759,9 +837,18 @@ TERMES ANGLAIS:"""
     except:
         return mots_cles_fr
 
+def traduire_lot_titres(textes, mode_traduction="gemini"):
+    """Traduit un lot de titres en un appel (DeepL si choisi, sinon Gemini)"""
+    if mode_traduction == "deepl" and DEEPL_KEY:
+        return traduire_lot_deepl(textes, DEEPL_KEY)
+    return traduire_lot_gemini(textes, G_KEY)
+
 def recuperer_titres_rapides(pmids, traduire_titres=False, mode_traduction="gemini"):
-    """Récupère titres avec nettoyage optimal"""
-    base_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi"
+    """
+    Récupère titres avec nettoyage optimal. Retourne (articles, erreur) ;
+    aucun appel Streamlit (exécutée aussi en tâche de fond).
+    """
+    base_url = f"{BASE_EUTILS}/efetch.fcgi"
     params = {"db": "pubmed", "id": ",".join(pmids), "retmode": "xml", "rettype": "abstract"}
     
     try:
@@ -769,6 +856,7 @@ def recuperer_titres_rapides(pmids, traduire_titres=False, mode_traduction="gemi
         if response.status_code == 200:
             root = ET.fromstring(response.content)
             articles_data = []
+            erreurs = []
             
             for article in root.findall('.//PubmedArticle'):
                 pmid = article.find('.//PMID').text if article.find('.//PMID') is not None else "N/A"
@@ -783,13 +871,6 @@ def recuperer_titres_rapides(pmids, traduire_titres=False, mode_traduction="gemi
                 # Nettoyer AVANT traduction
                 title = nettoyer_titre(title)
                 
-                # Traduire si demandé
-                if traduire_titres and title != "Titre non disponible":
-                    title_fr = traduire_texte(title, mode=mode_traduction)
-                    title_fr = nettoyer_titre(title_fr)
-                else:
-                    title_fr = title
-                
                 journal_elem = article.find('.//Journal/Title')
                 journal = journal_elem.text if journal_elem is not None else "Journal non disponible"
                 
@@ -809,107 +890,189 @@ def recuperer_titres_rapides(pmids, traduire_titres=False, mode_traduction="gemi
                 else:
                     date_pub = year
                 
+                abstract = " ".join(''.join(a.itertext()).strip() for a in article.findall('.//Abstract/AbstractText'))
+                mesh = [d.text for d in article.findall('.//MeshHeadingList/MeshHeading/DescriptorName') if d.text]
+                
                 articles_data.append({
                     'pmid': pmid,
                     'title': title,
-                    'title_fr': title_fr,
+                    'title_fr': title,
                     'journal': journal,
                     'year': year,
-                    'date_pub': date_pub
+                    'date_pub': date_pub,
+                    'abstract': abstract,
+                    'mesh': mesh
                 })
             
-            return articles_data
+            # Traduire si demandé : tous les titres par lots (avec cache)
+            if traduire_titres:
+                a_traduire = [a for a in articles_data if a['title'] != "Titre non disponible"]
+                enrichir_articles(
+                    a_traduire,
+                    lambda textes: traduire_lot_titres(textes, mode_traduction),
+                    fournisseur=mode_traduction if mode_traduction == "deepl" and DEEPL_KEY else "gemini",
+                    champs=(('title', 'title_fr'),),
+                    traduire_un=lambda texte: traduire_texte(texte, mode=mode_traduction, erreurs=erreurs),
+                    post_traitement={'title_fr': nettoyer_titre}
+                )
+            
+            # Corpus local partagé avec app.py (recherche instantanée)
+            indexer_articles(articles_data)
+            
+            erreur = f"{len(erreurs)} titre(s) non traduit(s) — {erreurs[0]}" if erreurs else None
+            return articles_data, erreur
+        return [], f"PubMed efetch : HTTP {response.status_code}"
     except Exception as e:
-        st.warning(f"Erreur: {str(e)}")
-        return []
-    return []
-
-class PDF(FPDF):
-    def header(self):
-        self.set_font('Arial', 'B', 16)
-        self.cell(0, 10, 'Veille Medicale', 0, 1, 'C')
-        self.ln(5)
-    
-    def footer(self):
-        self.set_y(-15)
-        self.set_font('Arial', 'I', 8)
-        self.cell(0, 10, f'Page {self.page_no()}', 0, 0, 'C')
-    
-    def section_title(self, title):
-        self.set_font('Arial', 'B', 14)
-        self.set_fill_color(200, 220, 255)
-        self.cell(0, 10, title, 0, 1, 'L', 1)
-        self.ln(3)
+        return [], f"Erreur: {str(e)}"
 
 def generer_pdf_selectionne(spec, periode, articles_selectionnes):
-    """Génère PDF"""
-    pdf = PDF()
-    pdf.add_page()
+    """Génère PDF (écrit page par page, texte intégral sans troncature, fragments par article en cache)"""
+    return export_pdf_selection(spec, periode, articles_selectionnes)
+
+def generer_notebooklm_selectionne(articles_selectionnes):
+    """Génère NotebookLM : zip de sources découpées aux limites NotebookLM + manifeste (fragments en cache)"""
+    return export_notebooklm_selection(articles_selectionnes)
+
+def analyser_article_ia(article_info, pdf_texte_fr):
+    """Analyse structurée Gemini d'un article traduit"""
+    genai.configure(api_key=G_KEY, **options_gemini())
+    model = genai.GenerativeModel('gemini-2.0-flash-exp')
     
-    pdf.set_font('Arial', 'B', 20)
-    pdf.ln(30)
-    pdf.cell(0, 15, 'VEILLE MEDICALE', 0, 1, 'C')
-    pdf.ln(20)
+    # Prompt optimisé pour l'analyse
+    prompt = f"""Tu es un médecin expert. Analyse cet article médical en français de manière structurée et professionnelle.
+
+ARTICLE:
+Titre: {article_info['title_fr']}
+Journal: {article_info['journal']} ({article_info['year']})
+
+CONTENU COMPLET:
+{pdf_texte_fr}
+
+CONSIGNES D'ANALYSE:
+- Rédige une analyse médicale professionnelle en français
+- Structure obligatoire: Objectif, Méthodologie, Résultats, Implications cliniques, Limites, Conclusion
+- Sois précis et concis
+- Utilise la terminologie médicale française appropriée
+- Ne commence pas par "Analyse:" ou tout autre préambule
+
+ANALYSE STRUCTURÉE:"""
     
-    pdf.set_font('Arial', '', 12)
-    pdf.cell(0, 8, f'Specialite: {spec}', 0, 1, 'C')
-    pdf.cell(0, 8, f'Periode: {periode}', 0, 1, 'C')
-    pdf.cell(0, 8, f'Articles: {len(articles_selectionnes)}', 0, 1, 'C')
-    pdf.cell(0, 8, f'Date: {datetime.now().strftime("%d/%m/%Y")}', 0, 1, 'C')
+    response = model.generate_content(prompt)
+    return response.text
+
+def tache_analyse_articles(parametres, ctx):
+    """
+    Tâche de fond : cascade PDF + traduction + analyse IA de chaque article.
+    Chaque article terminé est un point de reprise (ctx.partiel[pmid]).
+    """
+    articles = parametres['articles']
+    info = parametres['info_recherche']
     
-    for i, article in enumerate(articles_selectionnes, 1):
-        pdf.add_page()
-        pdf.section_title(f'Article {i} - PMID {article["pmid"]}')
-        
-        pdf.set_font('Arial', 'B', 12)
-        try:
-            title_clean = article['title_fr'].encode('latin-1', 'ignore').decode('latin-1')
-        except:
-            title_clean = article['title_fr'].encode('ascii', 'ignore').decode('ascii')
-        pdf.multi_cell(0, 6, title_clean)
-        pdf.ln(3)
-        
-        pdf.set_font('Arial', '', 10)
-        pdf.cell(0, 5, f"Journal: {article['journal']} ({article['year']})", 0, 1)
-        pdf.ln(3)
-        
-        if article.get('pdf_texte_fr'):
+    for idx, article_info in enumerate(articles):
+        pmid = article_info['pmid']
+        if pmid in ctx.partiel:
+            continue  # Déjà traité avant une reprise
+        if ctx.annule:
+            break
+        
+        def callback(msg, idx=idx, pmid=pmid):
+            ctx.progres(idx / len(articles), f"📄 {idx+1}/{len(articles)} PMID {pmid} — {msg}")
+        
+        pdf_texte_fr, erreur = telecharger_et_extraire_pdf_multi_sources(
+            pmid,
+            mode_traduction=info.get('mode_traduction', 'gemini'),
+            progress_callback=callback,
+            utiliser_scihub=info.get('utiliser_scihub', False),
+            sections_gardees=tuple(info.get('sections_gardees', SECTIONS_UTILES)),
+            journal=article_info.get('journal')
+        )
+        
+        resultat = {'pdf_texte_fr': pdf_texte_fr, 'analyse_ia': None, 'erreur': erreur}
+        if pdf_texte_fr:
+            callback("🤖 Analyse IA...")
             try:
-                pdf_clean = article['pdf_texte_fr'][:8000].encode('latin-1', 'ignore').decode('latin-1')
-            except:
-                pdf_clean = article['pdf_texte_fr'][:8000].encode('ascii', 'ignore').decode('ascii')
-            pdf.multi_cell(0, 4, pdf_clean)
-    
-    pdf_output = io.BytesIO()
-    pdf_string = pdf.output(dest='S').encode('latin-1')
-    pdf_output.write(pdf_string)
-    pdf_output.seek(0)
+                resultat['analyse_ia'] = analyser_article_ia(article_info, pdf_texte_fr)
+            except Exception as e:
+                resultat['erreur'] = str(e)
+        
+        ctx.point_de_reprise(pmid, resultat)
     
-    return pdf_output.getvalue()
+    return {'termines': len(ctx.partiel)}
 
-def generer_notebooklm_selectionne(articles_selectionnes):
-    """Génère NotebookLM"""
-    contenu = f"""# VEILLE MEDICALE - PODCAST
-Date: {datetime.now().strftime("%d/%m/%Y")}
+def tache_previsualisation_titres(parametres, ctx):
+    """Tâche de fond : pré-chargement des titres de la page suivante (erreur affichée par le script)"""
+    articles, erreur = recuperer_titres_rapides(
+        parametres['pmids'],
+        traduire_titres=parametres['traduire_titres'],
+        mode_traduction=parametres['mode_traduction']
+    )
+    return {'articles': articles, 'erreur': erreur}
 
-## ARTICLES SELECTIONNES
-
-"""
+def charger_titres_page(pmids, attendre=True):
+    """
+    Charge les titres des PMID de la page qui ne le sont pas encore. Le
+    résultat d'un pré-chargement est réutilisé ; sans attendre, le
+    chargement est lancé en arrière-plan (page suivante).
+    """
+    charges = {a['pmid'] for a in st.session_state.articles_previsualises}
+    manquants = [p for p in pmids if p not in charges]
+    if not manquants:
+        return
+    
+    info = st.session_state.info_recherche
+    parametres = {
+        'pmids': manquants,
+        'traduire_titres': info.get('traduire_titres', False),
+        'mode_traduction': info.get('mode_traduction', 'gemini')
+    }
+    cle = f"titres:{parametres['mode_traduction']}:{parametres['traduire_titres']}:{','.join(manquants)}"
+    job = job_par_cle(cle)
+    
+    if not attendre:
+        if job is None or job['statut'] in ('erreur', 'annule'):
+            soumettre("previsualisation_titres", parametres, cle=cle)
+        return
     
-    for i, article in enumerate(articles_selectionnes, 1):
-        contenu += f"""
-### Article {i}
-Titre: {article['title_fr']}
-Journal: {article['journal']} ({article['year']})
-PMID: {article['pmid']}
+    if job and job['statut'] in STATUTS_ACTIFS:
+        # Pré-chargement en cours : seul le fragment de suivi est rafraîchi, la page l'est à la fin
+        st.info("📄 Récupération des titres...")
+        suivre_job(job['id'], progression=False)
+        return
+    if job and job['statut'] == 'termine':
+        nouveaux, erreur = job['resultat']['articles'], job['resultat']['erreur']
+    else:
+        with st.spinner("📄 Récupération..."):
+            nouveaux, erreur = recuperer_titres_rapides(manquants, **{k: v for k, v in parametres.items() if k != 'pmids'})
+    if erreur:
+        st.warning(f"⚠️ {erreur}")
+    
+    st.session_state.articles_previsualises = st.session_state.articles_previsualises + [
+        a for a in nouveaux if a['pmid'] not in charges
+    ]
 
-Contenu complet:
-{article.get('pdf_texte_fr', 'Non disponible')}
+def basculer_selection(pmid):
+    """Coche / décoche un article (sélection indépendante des widgets affichés)"""
+    selection = st.session_state.selection_previsualisation
+    if pmid in selection:
+        selection.remove(pmid)
+    else:
+        selection.append(pmid)
 
----
-"""
-    
-    return contenu
+enregistrer_tache("analyse_articles", tache_analyse_articles)
+enregistrer_tache("previsualisation_titres", tache_previsualisation_titres)
+reprendre_jobs()
+
+# Reconnexion : la tâche d'analyse en cours (identifiant dans l'URL) est retrouvée
+if 'job_analyse' not in st.session_state:
+    st.session_state.job_analyse = None
+    job_url = etat_job(st.query_params.get("job"))
+    if job_url and job_url['type'] == "analyse_articles":
+        st.session_state.job_analyse = job_url['id']
+        st.session_state.info_recherche = job_url['parametres']['info_recherche']
+        st.session_state.articles_previsualises = job_url['parametres']['articles']
+        st.session_state.ids_previsualises = [a['pmid'] for a in job_url['parametres']['articles']]
+        st.session_state.selection_previsualisation = list(st.session_state.ids_previsualises)
+        st.session_state.mode_etape = 2
 
 # Interface
 st.title("🩺 Veille Médicale Professionnelle v4")
@@ -926,6 +1089,7 @@ with st.expander("ℹ️ Nouvelles fonctionnalités v4 - OPTIMISATION PDF PUBMED
     - 🔄 **Extraction améliorée** : Support pdfplumber + pypdf
     
     **Sources utilisées (par ordre de priorité):**
+    0. **Texte intégral XML (JATS)** - PMC / Europe PMC, sans parsing PDF
     1. **PMC FTP** (nouveau) - Source officielle PubMed
     2. **PMC Web** - Fallback PMC
     3. **Unpaywall** - Base Open Access
@@ -1066,6 +1230,14 @@ with tab1:
                 help="Sci-Hub est juridiquement discutable. Utilisez uniquement si les sources légales échouent."
             )
             
+            sections_gardees = st.multiselect(
+                "✂️ Sections à traduire",
+                list(SECTIONS_UTILES) + ["references", "boilerplate"],
+                default=list(SECTIONS_UTILES),
+                format_func=lambda s: LIBELLES_SECTIONS.get(s, s),
+                help="Les références et mentions annexes représentent souvent 20-30% du texte."
+            )
+            
             mode_trad = "deepl" if DEEPL_KEY else "gemini"
             traduire_titres = st.checkbox("🌐 Traduire titres", value=True)
         
@@ -1129,20 +1301,16 @@ with tab1:
             with st.expander("🔍 Requête PubMed"):
                 st.code(query)
             
-            base_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi"
-            params = {"db": "pubmed", "term": query, "retmode": "json", "retmax": nb_max, "sort": "date"}
-            
             try:
                 with st.spinner("🔎 Recherche..."):
-                    response = requests.get(base_url, params=params, timeout=15)
+                    recherche, erreur = rechercher(query, nb_max, tri="date")
                 
-                if response.status_code != 200:
-                    st.error(f"❌ Erreur: {response.status_code}")
+                if erreur:
+                    st.error(f"❌ {erreur}")
                     st.stop()
                 
-                data = response.json()
-                ids = data.get("esearchresult", {}).get("idlist", [])
-                count = data.get("esearchresult", {}).get("count", "0")
+                ids = recherche["ids"][:nb_max] if recherche else []
+                count = recherche["count"] if recherche else 0
                 
                 if not ids:
                     st.warning(f"⚠️ Aucun article pour: `{term}`")
@@ -1150,10 +1318,17 @@ with tab1:
                 
                 st.success(f"✅ {count} articles - Affichage de {len(ids)}")
                 
+                # Seule la première page est chargée ; les suivantes le sont à la demande / en avance
                 with st.spinner("📄 Récupération..."):
-                    articles_preview = recuperer_titres_rapides(ids, traduire_titres=traduire_titres, mode_traduction=mode_trad)
+                    articles_preview, erreur_titres = recuperer_titres_rapides(ids[:PAR_PAGE_DEFAUT], traduire_titres=traduire_titres, mode_traduction=mode_trad)
+                if erreur_titres:
+                    st.warning(f"⚠️ {erreur_titres}")
                 
                 st.session_state.articles_previsualises = articles_preview
+                st.session_state.ids_previsualises = ids
+                st.session_state.recherche_courante = dict(recherche, ids=ids, par_page=nb_max)
+                st.session_state.selection_previsualisation = []
+                st.session_state.page_previsualisation = 0
                 st.session_state.info_recherche = {
                     'display_term': display_term,
                     'periode': f"du {date_debut.strftime('%d/%m/%Y')} au {date_fin.strftime('%d/%m/%Y')}",
@@ -1162,7 +1337,9 @@ with tab1:
                     'mode_traduction': mode_trad,
                     'requete': query,
                     'langue': langue_selectionnee,
-                    'utiliser_scihub': utiliser_scihub
+                    'utiliser_scihub': utiliser_scihub,
+                    'sections_gardees': tuple(sections_gardees),
+                    'traduire_titres': traduire_titres
                 }
                 
                 st.session_state.mode_etape = 2
@@ -1187,221 +1364,263 @@ with tab1:
         
         st.info(info_affichage)
         
+        ids = st.session_state.ids_previsualises or [a['pmid'] for a in st.session_state.articles_previsualises]
+        
+        # Pagination : titres de la page visible, page suivante pré-chargée en arrière-plan
+        _, debut, fin = navigation_pages("page_previsualisation", len(ids))
+        charger_titres_page(ids[debut:fin])
+        charger_titres_page(ids[fin:fin + PAR_PAGE_DEFAUT], attendre=False)
+        articles_charges = {a['pmid']: a for a in st.session_state.articles_previsualises}
+        
         col_btn1, col_btn2 = st.columns(2)
         
         with col_btn1:
-            if st.button("✅ Tout sélectionner"):
-                for i in range(len(st.session_state.articles_previsualises)):
-                    st.session_state[f"select_{i}"] = True
+            if st.button("✅ Tout sélectionner (page)"):
+                for pmid in ids[debut:fin]:
+                    if pmid not in st.session_state.selection_previsualisation:
+                        st.session_state.selection_previsualisation.append(pmid)
+                    st.session_state.pop(f"select_{pmid}", None)
                 st.rerun()
         
         with col_btn2:
             if st.button("↩️ Nouvelle recherche"):
                 st.session_state.mode_etape = 1
                 st.session_state.articles_previsualises = []
+                st.session_state.ids_previsualises = []
+                st.session_state.recherche_courante = None
+                st.session_state.selection_previsualisation = []
                 st.session_state.analyses_individuelles = {}
+                st.session_state.job_analyse = None
+                st.query_params.clear()
                 st.rerun()
         
-        st.divider()
+        # « Charger plus » : page suivante de la même recherche (retstart) ; les titres
+        # sont ensuite chargés page par page comme les autres
+        recherche = st.session_state.recherche_courante
+        if recherche and reste_a_charger(recherche):
+            par_page = recherche.get('par_page', PAR_PAGE_DEFAUT)
+            col_plus, col_total = st.columns([0.4, 0.6])
+            with col_total:
+                st.caption(f"{len(ids)} PMID chargés sur {recherche['count']}")
+            with col_plus:
+                if st.button(f"⬇️ Charger {min(par_page, reste_a_charger(recherche))} de plus"):
+                    recherche, nouveaux, erreur = charger_plus(recherche, par_page=par_page)
+                    if erreur:
+                        st.error(f"❌ {erreur}")
+                    else:
+                        st.session_state.recherche_courante = dict(
+                            recherche, ids=recherche["ids"][:len(ids) + len(nouveaux)], par_page=par_page
+                        )
+                        st.session_state.ids_previsualises = ids + [p for p in nouveaux if p not in set(ids)]
+                        st.rerun()
         
-        articles_selectionnes = []
+        st.divider()
         
-        for i, article in enumerate(st.session_state.articles_previsualises):
+        for i, pmid in enumerate(ids[debut:fin], debut):
+            article = articles_charges.get(pmid)
+            if not article:
+                continue
+            
             col_check, col_info = st.columns([0.1, 0.9])
             
             with col_check:
-                selected = st.checkbox("", key=f"select_{i}", label_visibility="collapsed")
+                st.checkbox(
+                    "", key=f"select_{pmid}", label_visibility="collapsed",
+                    value=pmid in st.session_state.selection_previsualisation,
+                    on_change=basculer_selection, args=(pmid,)
+                )
             
             with col_info:
                 st.markdown(f"**{i+1}. {article['title_fr']}**")
                 st.caption(f"📰 {article['journal']} | 📅 {article['date_pub']} | PMID: [{article['pmid']}](https://pubmed.ncbi.nlm.nih.gov/{article['pmid']}/)")
             
-            if selected:
-                articles_selectionnes.append(article['pmid'])
-            
             st.divider()
         
+        articles_selectionnes = [p for p in ids if p in st.session_state.selection_previsualisation]
+        
         st.markdown(f"**{len(articles_selectionnes)} sélectionné(s)**")
         
         if 0 < len(articles_selectionnes) <= 20:
             st.divider()
             
             if st.button("🚀 ANALYSER", type="primary", use_container_width=True):
-                
+                # L'analyse tourne en tâche de fond : elle survit aux reruns et aux déconnexions
+                job_id = soumettre("analyse_articles", {
+                    'articles': [articles_charges[p] for p in articles_selectionnes if p in articles_charges],
+                    'info_recherche': st.session_state.info_recherche
+                })
+                st.session_state.job_analyse = job_id
                 st.session_state.analyses_individuelles = {}
-                mode_trad = st.session_state.info_recherche.get('mode_traduction', 'gemini')
-                utiliser_scihub = st.session_state.info_recherche.get('utiliser_scihub', False)
+                st.query_params["job"] = job_id
+                st.rerun()
+        
+        job_analyse = etat_job(st.session_state.get('job_analyse'))
+        
+        if job_analyse:
+            st.divider()
+            en_cours = job_analyse['statut'] in STATUTS_ACTIFS
+            
+            if en_cours:
+                st.progress(job_analyse['progression'], text=job_analyse['message'])
+                col_info_job, col_stop_job = st.columns([0.8, 0.2])
+                with col_info_job:
+                    st.caption(f"⚙️ Tâche {job_analyse['id']} en arrière-plan : vous pouvez fermer la page et revenir plus tard.")
+                with col_stop_job:
+                    if st.button("⏹️ Arrêter"):
+                        annuler(job_analyse['id'])
+            elif job_analyse['statut'] == 'erreur':
+                st.error(f"❌ Tâche interrompue : {job_analyse['erreur']}")
+            
+            with st.expander("📜 Journal de la tâche"):
+                for evenement in job_analyse['evenements'][-30:]:
+                    st.caption(f"{datetime.fromtimestamp(evenement['t']).strftime('%H:%M:%S')} — {evenement['message']}")
+            
+            articles_job = job_analyse['parametres']['articles']
+            resultats = job_analyse['partiel']
+            
+            # Statistiques de réussite
+            stats = {
+                'total': len(articles_job),
+                'reussis': 0,
+                'echoues': 0,
+                'sources': {}
+            }
+            
+            st.session_state.analyses_individuelles = {}
+            
+            for idx, article_info in enumerate(articles_job):
+                pmid = article_info['pmid']
+                resultat = resultats.get(pmid)
                 
-                # Statistiques de réussite
-                stats = {
-                    'total': len(articles_selectionnes),
-                    'reussis': 0,
-                    'echoues': 0,
-                    'sources': {}
-                }
+                st.subheader(f"📄 Article {idx+1}/{len(articles_job)} - PMID {pmid}")
+                st.markdown(f"**{article_info['title_fr']}**")
                 
-                for idx, pmid in enumerate(articles_selectionnes):
-                    st.subheader(f"📄 Article {idx+1}/{len(articles_selectionnes)} - PMID {pmid}")
+                if resultat is None:
+                    st.info("⏳ En attente..." if en_cours else "⏹️ Non traité")
+                elif resultat['pdf_texte_fr']:
+                    pdf_texte_fr = resultat['pdf_texte_fr']
+                    stats['reussis'] += 1
                     
-                    article_info = next((a for a in st.session_state.articles_previsualises if a['pmid'] == pmid), None)
+                    st.success(f"✅ PDF extrait et traduit ({len(pdf_texte_fr)} caractères)")
                     
-                    if not article_info:
-                        continue
+                    with st.expander("📄 Lire le PDF complet"):
+                        st.text_area("Contenu:", pdf_texte_fr, height=400, key=f"pdf_{pmid}")
                     
-                    st.markdown(f"**{article_info['title_fr']}**")
+                    if resultat['analyse_ia']:
+                        st.markdown("### 🤖 Analyse IA")
+                        st.markdown(resultat['analyse_ia'])
+                        
+                        # Texte intégral et analyse déchargés sur disque : la session ne garde que des références
+                        st.session_state.analyses_individuelles[pmid] = decharger({
+                            'pmid': pmid,
+                            'title': article_info['title'],
+                            'title_fr': article_info['title_fr'],
+                            'journal': article_info['journal'],
+                            'year': article_info['year'],
+                            'date_pub': article_info['date_pub'],
+                            'pdf_texte_fr': pdf_texte_fr,
+                            'analyse_ia': resultat['analyse_ia']
+                        })
+                    else:
+                        st.error(f"❌ Erreur analyse: {resultat['erreur']}")
+                else:
+                    stats['echoues'] += 1
+                    st.error(f"❌ {resultat['erreur']}")
+                    st.info(f"💡 Accès direct: https://pubmed.ncbi.nlm.nih.gov/{pmid}/")
+                
+                st.divider()
+            
+            if en_cours:
+                # Rafraîchissement périodique tant que la tâche tourne
+                time.sleep(2)
+                st.rerun()
+            
+            # Afficher les statistiques finales
+            st.header("📊 Statistiques de récupération")
+            
+            col1, col2, col3 = st.columns(3)
+            
+            with col1:
+                st.metric("Total", stats['total'])
+            
+            with col2:
+                taux_reussite = (stats['reussis'] / stats['total'] * 100) if stats['total'] > 0 else 0
+                st.metric("Réussis", f"{stats['reussis']} ({taux_reussite:.1f}%)")
+            
+            with col3:
+                st.metric("Échecs", stats['echoues'])
+            
+            if st.session_state.analyses_individuelles:
+                st.header("📚 Étape 3 : Sélection finale")
+                
+                articles_finaux = []
+                
+                for pmid, data in st.session_state.analyses_individuelles.items():
+                    col_check, col_info = st.columns([0.1, 0.9])
                     
-                    status_box = st.empty()
+                    with col_check:
+                        include = st.checkbox("", key=f"final_{pmid}", value=True, label_visibility="collapsed")
                     
-                    def callback(msg):
-                        status_box.info(msg)
+                    with col_info:
+                        st.markdown(f"**{data['title_fr']}**")
+                        st.caption(f"{data['journal']} | {data['date_pub']}")
                     
-                    # Utilisation de la fonction multi-sources AMÉLIORÉE v4
-                    pdf_texte_fr, erreur = telecharger_et_extraire_pdf_multi_sources(
-                        pmid,
-                        mode_traduction=mode_trad,
-                        progress_callback=callback,
-                        utiliser_scihub=utiliser_scihub
-                    )
+                    if include:
+                        articles_finaux.append(recharger(data))
                     
-                    status_box.empty()
+                    st.divider()
+                
+                if articles_finaux:
+                    st.success(f"✅ {len(articles_finaux)} pour PDF et podcast")
                     
-                    if pdf_texte_fr:
-                        stats['reussis'] += 1
-                        
-                        # Extraire la source depuis le callback
-                        # Note: callback stocke le dernier message, on pourrait améliorer ça
-                        st.success(f"✅ PDF extrait et traduit ({len(pdf_texte_fr)} caractères)")
-                        
-                        with st.expander("📄 Lire le PDF complet"):
-                            st.text_area("Contenu:", pdf_texte_fr, height=400, key=f"pdf_{pmid}")
+                    with st.spinner("📦 Génération..."):
+                        pdf_final = generer_pdf_selectionne(
+                            st.session_state.info_recherche['spec'],
+                            st.session_state.info_recherche['periode'],
+                            articles_finaux
+                        )
                         
-                        with st.spinner("🤖 Analyse IA..."):
-                            try:
-                                genai.configure(api_key=G_KEY)
-                                model = genai.GenerativeModel('gemini-2.0-flash-exp')
-                                
-                                # Prompt optimisé pour l'analyse
-                                prompt = f"""Tu es un médecin expert. Analyse cet article médical en français de manière structurée et professionnelle.
-
-ARTICLE:
-Titre: {article_info['title_fr']}
-Journal: {article_info['journal']} ({article_info['year']})
-
-CONTENU COMPLET:
-{pdf_texte_fr}
-
-CONSIGNES D'ANALYSE:
-- Rédige une analyse médicale professionnelle en français
-- Structure obligatoire: Objectif, Méthodologie, Résultats, Implications cliniques, Limites, Conclusion
-- Sois précis et concis
-- Utilise la terminologie médicale française appropriée
-- Ne commence pas par "Analyse:" ou tout autre préambule
-
-ANALYSE STRUCTURÉE:"""
-                                
-                                response = model.generate_content(prompt)
-                                analyse = response.text
-                                
-                                st.markdown("### 🤖 Analyse IA")
-                                st.markdown(analyse)
-                                
-                                st.session_state.analyses_individuelles[pmid] = {
-                                    'pmid': pmid,
-                                    'title': article_info['title'],
-                                    'title_fr': article_info['title_fr'],
-                                    'journal': article_info['journal'],
-                                    'year': article_info['year'],
-                                    'date_pub': article_info['date_pub'],
-                                    'pdf_texte_fr': pdf_texte_fr,
-                                    'analyse_ia': analyse
-                                }
-                            except Exception as e:
-                                st.error(f"❌ Erreur analyse: {str(e)}")
-                    else:
-                        stats['echoues'] += 1
-                        st.error(f"❌ {erreur}")
-                        st.info(f"💡 Accès direct: https://pubmed.ncbi.nlm.nih.gov/{pmid}/")
+                        notebooklm, manifeste_notebooklm = generer_notebooklm_selectionne(articles_finaux)
                     
                     st.divider()
-                
-                # Afficher les statistiques finales
-                st.header("📊 Statistiques de récupération")
-                
-                col1, col2, col3 = st.columns(3)
-                
-                with col1:
-                    st.metric("Total", stats['total'])
-                
-                with col2:
-                    taux_reussite = (stats['reussis'] / stats['total'] * 100) if stats['total'] > 0 else 0
-                    st.metric("Réussis", f"{stats['reussis']} ({taux_reussite:.1f}%)")
-                
-                with col3:
-                    st.metric("Échecs", stats['echoues'])
-                
-                if st.session_state.analyses_individuelles:
-                    st.header("📚 Étape 3 : Sélection finale")
+                    st.subheader("📥 Téléchargements")
                     
-                    articles_finaux = []
+                    col1, col2 = st.columns(2)
                     
-                    for pmid, data in st.session_state.analyses_individuelles.items():
-                        col_check, col_info = st.columns([0.1, 0.9])
-                        
-                        with col_check:
-                            include = st.checkbox("", key=f"final_{pmid}", value=True, label_visibility="collapsed")
-                        
-                        with col_info:
-                            st.markdown(f"**{data['title_fr']}**")
-                            st.caption(f"{data['journal']} | {data['date_pub']}")
-                        
-                        if include:
-                            articles_finaux.append(data)
-                        
-                        st.divider()
+                    with col1:
+                        st.download_button(
+                            "📄 PDF Final",
+                            pdf_final,
+                            f"veille_{datetime.now().strftime('%Y%m%d')}.pdf",
+                            mime="application/pdf",
+                            use_container_width=True
+                        )
                     
-                    if articles_finaux:
-                        st.success(f"✅ {len(articles_finaux)} pour PDF et podcast")
-                        
-                        with st.spinner("📦 Génération..."):
-                            pdf_final = generer_pdf_selectionne(
-                                st.session_state.info_recherche['spec'],
-                                st.session_state.info_recherche['periode'],
-                                articles_finaux
-                            )
-                            
-                            notebooklm = generer_notebooklm_selectionne(articles_finaux)
-                        
-                        st.divider()
-                        st.subheader("📥 Téléchargements")
-                        
-                        col1, col2 = st.columns(2)
-                        
-                        with col1:
-                            st.download_button(
-                                "📄 PDF Final",
-                                pdf_final,
-                                f"veille_{datetime.now().strftime('%Y%m%d')}.pdf",
-                                mime="application/pdf",
-                                use_container_width=True
-                            )
-                        
-                        with col2:
-                            st.download_button(
-                                "🎙️ NotebookLM",
-                                notebooklm,
-                                f"podcast_{datetime.now().strftime('%Y%m%d')}.txt",
-                                use_container_width=True
-                            )
-                        
-                        st.link_button("🔗 NotebookLM", "https://notebooklm.google.com", use_container_width=True)
-                        
-                        if st.button("🔄 Nouvelle recherche", use_container_width=True):
-                            st.session_state.mode_etape = 1
-                            st.session_state.articles_previsualises = []
-                            st.session_state.analyses_individuelles = {}
-                            st.rerun()
-                else:
-                    st.warning("⚠️ Aucun article n'a pu être analysé. Essayez d'activer Sci-Hub dans les paramètres ou choisissez d'autres articles.")
+                    with col2:
+                        st.download_button(
+                            "🎙️ NotebookLM (.zip)",
+                            notebooklm,
+                            f"podcast_{datetime.now().strftime('%Y%m%d')}.zip",
+                            mime="application/zip",
+                            use_container_width=True
+                        )
+                        nb_sources = len(manifeste_notebooklm['fichiers'])
+                        if nb_sources > 1:
+                            st.caption(f"📚 {nb_sources} sources NotebookLM (limite par source respectée)")
+                    
+                    st.link_button("🔗 NotebookLM", "https://notebooklm.google.com", use_container_width=True)
+                    
+                    if st.button("🔄 Nouvelle recherche", use_container_width=True):
+                        st.session_state.mode_etape = 1
+                        st.session_state.articles_previsualises = []
+                        st.session_state.ids_previsualises = []
+                        st.session_state.selection_previsualisation = []
+                        st.session_state.analyses_individuelles = {}
+                        st.session_state.job_analyse = None
+                        st.query_params.clear()
+                        st.rerun()
+            else:
+                st.warning("⚠️ Aucun article n'a pu être analysé. Essayez d'activer Sci-Hub dans les paramètres ou choisissez d'autres articles.")
 
 with tab2:
     st.header("📚 Historique")
@@ -1467,6 +1686,7 @@ with tab4:
     st.subheader("📄 Extraction PDF")
     st.markdown("""
     **Méthodes utilisées (par ordre de priorité):**
+    0. **Routage par page** (PyMuPDF) : pages simples en extraction rapide, pdfplumber réservé aux pages multi-colonnes / tableaux, pages scannées signalées pour OCR
     1. **pdfplumber** (recommandé) : Meilleure extraction pour PDFs structurés
     2. **pypdf** (fallback) : Compatible mais moins précis
     
@@ -1521,6 +1741,9 @@ with tab4:
     st.info("Prochainement : Tableau de bord avec statistiques de récupération par source")
 
 with tab5:
+    with st.expander("🧠 Mémoire de la session"):
+        panneau_memoire_session()
+    
     st.header("🔧 Diagnostic Récupération PDF")
     
     st.info("""
@@ -1569,7 +1792,7 @@ with tab5:
         # Étape 1: Identifiants
         with st.spinner("🔍 Récupération des identifiants..."):
             try:
-                base_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi"
+                base_url = f"{BASE_EUTILS}/efetch.fcgi"
                 params = {"db": "pubmed", "id": pmid_test, "retmode": "xml"}
                 
                 response = requests.get(base_url, params=params, timeout=10)
@@ -1643,7 +1866,7 @@ with tab5:
                         dir1 = "000"
                         dir2 = pmcid_num[-3:].zfill(3)
                     
-                    tar_url = f"https://ftp.ncbi.nlm.nih.gov/pub/pmc/oa_pdf/{dir1}/{dir2}/PMC{pmcid_num}.tar.gz"
+                    tar_url = f"{BASE_PMC_OA}/oa_pdf/{dir1}/{dir2}/PMC{pmcid_num}.tar.gz"
                     
                     st.code(tar_url, language=None)
                     
@@ -1682,7 +1905,7 @@ with tab5:
                         st.warning(f"❌ Échec tar.gz (HTTP {response.status_code})")
                         
                         # Essayer URL directe
-                        pdf_url = f"https://www.ncbi.nlm.nih.gov/pmc/articles/PMC{pmcid_num}/pdf/"
+                        pdf_url = f"{BASE_PMC}/articles/PMC{pmcid_num}/pdf/"
                         st.write("**Test URL directe:**")
                         st.code(pdf_url, language=None)
                         
@@ -1704,7 +1927,7 @@ with tab5:
             
             with st.spinner("Test en cours..."):
                 try:
-                    url = f"https://api.unpaywall.org/v2/{doi}"
+                    url = f"{BASE_UNPAYWALL}/{doi}"
                     params = {"email": "test@example.com"}
                     
                     st.code(f"{url}?email=test@example.com", language=None)
@@ -1753,7 +1976,7 @@ with tab5:
         with st.spinner("Test en cours..."):
             try:
                 if pmcid:
-                    pdf_url = f"https://europepmc.org/backend/ptpmcrender.fcgi?accid=PMC{pmcid}&blobtype=pdf"
+                    pdf_url = f"{BASE_EUROPEPMC_RENDU}/ptpmcrender.fcgi?accid=PMC{pmcid}&blobtype=pdf"
                     st.code(pdf_url, language=None)
                     
                     headers = {'User-Agent': 'Mozilla/5.0'}
@@ -0,0 +1,18 @@
+# ============================================
+# SERVICES SIMULÉS
+# ============================================
+
+"""
+Serveurs locaux qui imitent les services externes des apps (E-utilities
+NCBI, Unpaywall, Europe PMC, PMC et son espace OA, DeepL, Gemini, Claude)
+avec latence, erreurs et plafonds de débit réglables.
+
+    python -m services_simules --port 8600 --latence 0.2 --erreurs 0.05
+    VEILLE_SERVICES_SIMULES=http://127.0.0.1:8600 streamlit run app.py
+
+Voir config_services pour les URL de base substituées.
+"""
+
+from .serveur import ConfigurationSimulee, demarrer_services, SERVICES
+
+__all__ = ["ConfigurationSimulee", "demarrer_services", "SERVICES"]
@@ -0,0 +1,59 @@
+# ============================================
+# SERVICES SIMULÉS — LIGNE DE COMMANDE
+# ============================================
+
+"""
+Usage :
+    python -m services_simules [--port 8600] [--latence 0.05] [--gigue 0.5]
+                               [--erreurs 0.0] [--debit 0]
+                               [--regle eutils:debit_max=3 --regle deepl:taux_erreur=0.2]
+"""
+
+import argparse
+import time
+
+from .serveur import ConfigurationSimulee, demarrer_services, SERVICES
+
+CLES_REGLES = {"latence": float, "gigue": float, "taux_erreur": float, "debit_max": float}
+
+
+def lire_regles(regles: list) -> dict:
+    """["eutils:debit_max=3", ...] -> {"eutils": {"debit_max": 3.0}}"""
+    services = {}
+    for regle in regles:
+        service, _, affectation = regle.partition(":")
+        cle, _, valeur = affectation.partition("=")
+        if service not in SERVICES or cle not in CLES_REGLES:
+            raise SystemExit(f"Règle invalide : {regle} (services : {', '.join(SERVICES)} ; "
+                             f"clés : {', '.join(CLES_REGLES)})")
+        services.setdefault(service, {})[cle] = CLES_REGLES[cle](valeur)
+    return services
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Services externes simulés pour les tests de charge")
+    parser.add_argument("--hote", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8600)
+    parser.add_argument("--latence", type=float, default=0.05, help="latence moyenne (s)")
+    parser.add_argument("--gigue", type=float, default=0.5, help="variation relative de la latence")
+    parser.add_argument("--erreurs", type=float, default=0.0, help="proportion de réponses 503")
+    parser.add_argument("--debit", type=float, default=0, help="requêtes/s par service avant 429 (0 = illimité)")
+    parser.add_argument("--regle", action="append", default=[], help="service:cle=valeur")
+    parser.add_argument("--graine", type=int, default=None)
+    args = parser.parse_args()
+
+    configuration = ConfigurationSimulee(args.latence, args.gigue, args.erreurs, args.debit,
+                                         lire_regles(args.regle), args.graine)
+    serveur, url = demarrer_services(args.hote, args.port, configuration)
+    print(f"Services simulés sur {url}")
+    print(f"  export VEILLE_SERVICES_SIMULES={url}")
+    print(f"  statistiques : {url}/_stats")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        serveur.shutdown()
+
+
+if __name__ == "__main__":
+    main()
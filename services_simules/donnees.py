@@ -0,0 +1,302 @@
+# ============================================
+# SERVICES SIMULÉS — CONTENUS GÉNÉRÉS
+# ============================================
+
+"""
+Réponses réalistes et déterministes (même PMID, même contenu) au format
+des vrais services : PubMed XML, JSON E-utilities, JATS, Unpaywall,
+Europe PMC, PDF, DeepL, Gemini, Claude.
+
+Un article sur trois n'a pas de PMCID (accès PDF via Unpaywall seulement),
+un sur cinq n'est pas en accès libre.
+"""
+
+import hashlib
+import io
+import json
+import random
+import re
+import tarfile
+from xml.sax.saxutils import escape
+
+JOURNAUX = [
+    "Obstetrics and Gynecology", "Human Reproduction", "Diabetes Care", "Thyroid",
+    "Circulation", "European Heart Journal", "Neurology", "Blood",
+]
+SUJETS = ["endometriosis", "gestational diabetes", "preeclampsia", "polycystic ovary syndrome",
+          "thyroid nodules", "heart failure", "migraine", "iron deficiency anemia"]
+INTERVENTIONS = ["metformin", "low-dose aspirin", "dienogest", "levothyroxine", "SGLT2 inhibitors",
+                 "lifestyle intervention", "vitamin D supplementation", "ferric carboxymaltose"]
+TYPES = ["a randomized controlled trial", "a prospective cohort study", "a systematic review and meta-analysis",
+         "a multicentre retrospective study"]
+PHRASES = [
+    "Participants were recruited from {n} centres between 2018 and 2022.",
+    "The primary outcome was the change in {sujet} severity at 12 months.",
+    "Compared with usual care, {intervention} was associated with a relative risk of 0.{rr} (95% CI 0.{ic1}-0.{ic2}).",
+    "Adverse events were reported in {pct}% of patients and were mostly mild.",
+    "Subgroup analyses did not show significant heterogeneity across age groups.",
+    "These findings support the use of {intervention} in routine clinical practice.",
+    "Further trials are needed to confirm long-term safety in larger populations.",
+]
+
+
+def _alea(*graines) -> random.Random:
+    return random.Random(hashlib.sha256("|".join(map(str, graines)).encode()).hexdigest())
+
+
+def _phrases(rng, nombre, sujet, intervention) -> str:
+    return " ".join(
+        rng.choice(PHRASES).format(n=rng.randint(3, 40), sujet=sujet, intervention=intervention,
+                                   rr=rng.randint(55, 95), ic1=rng.randint(40, 60), ic2=rng.randint(70, 99),
+                                   pct=rng.randint(2, 30))
+        for _ in range(nombre)
+    )
+
+
+def article(pmid: str) -> dict:
+    """Métadonnées et contenu d'un article simulé."""
+    rng = _alea("article", pmid)
+    sujet, intervention = rng.choice(SUJETS), rng.choice(INTERVENTIONS)
+    numero = int(re.sub(r"\D", "", pmid) or 0)
+    annee = rng.randint(2019, 2026)
+    return {
+        "pmid": pmid,
+        "titre": f"{intervention.capitalize()} for {sujet}: {rng.choice(TYPES)}",
+        "journal": rng.choice(JOURNAUX),
+        "annee": str(annee),
+        "mois": rng.choice(["Jan", "Mar", "May", "Jul", "Sep", "Nov"]),
+        "doi": f"10.5555/simule.{pmid}",
+        "pmcid": f"PMC{numero + 7000000}" if numero % 3 else None,
+        "libre": numero % 5 != 0,
+        "abstract": {
+            "BACKGROUND": _phrases(rng, 2, sujet, intervention),
+            "METHODS": _phrases(rng, 3, sujet, intervention),
+            "RESULTS": _phrases(rng, 3, sujet, intervention),
+            "CONCLUSIONS": _phrases(rng, 2, sujet, intervention),
+        },
+        "sections": [
+            ("Introduction", _phrases(rng, 12, sujet, intervention)),
+            ("Methods", _phrases(rng, 20, sujet, intervention)),
+            ("Results", _phrases(rng, 20, sujet, intervention)),
+            ("Discussion", _phrases(rng, 16, sujet, intervention)),
+        ],
+        "mesh": [sujet.title(), intervention.title(), "Humans", "Female"],
+    }
+
+
+def pmid_depuis_pmcid(pmcid: str) -> str:
+    return str(int(re.sub(r"\D", "", pmcid) or 0) - 7000000)
+
+
+# ============================================
+# E-UTILITIES
+# ============================================
+
+def resultats_recherche(terme: str) -> tuple:
+    """(nombre total, premier PMID) d'une requête, stables pour un même terme."""
+    rng = _alea("recherche", " ".join(terme.split()).lower())
+    return rng.randint(30, 2500), rng.randint(30000000, 39000000)
+
+
+def esearch_json(terme: str, retstart: int, retmax: int, webenv: str = "", query_key: str = "") -> dict:
+    total, premier = resultats_recherche(terme)
+    ids = [str(premier + i) for i in range(retstart, min(total, retstart + retmax))]
+    resultat = {"count": str(total), "retmax": str(len(ids)), "retstart": str(retstart), "idlist": ids}
+    if webenv:
+        resultat.update(webenv=webenv, querykey=query_key)
+    return {"header": {"type": "esearch", "version": "0.3"}, "esearchresult": resultat}
+
+
+def ids_historique(terme: str, retstart: int, retmax: int) -> list:
+    return esearch_json(terme, retstart, retmax)["esearchresult"]["idlist"]
+
+
+def efetch_pubmed_xml(pmids: list) -> bytes:
+    blocs = []
+    for pmid in pmids:
+        a = article(pmid)
+        abstract = "".join(
+            f'<AbstractText Label="{label}">{escape(texte)}</AbstractText>' for label, texte in a["abstract"].items()
+        )
+        ids = f'<ArticleId IdType="pubmed">{pmid}</ArticleId><ArticleId IdType="doi">{a["doi"]}</ArticleId>'
+        if a["pmcid"]:
+            ids += f'<ArticleId IdType="pmc">{a["pmcid"]}</ArticleId>'
+        mesh = "".join(f"<MeshHeading><DescriptorName>{escape(m)}</DescriptorName></MeshHeading>" for m in a["mesh"])
+        blocs.append(
+            f"<PubmedArticle><MedlineCitation><PMID>{pmid}</PMID><Article>"
+            f"<Journal><JournalIssue><PubDate><Year>{a['annee']}</Year><Month>{a['mois']}</Month></PubDate>"
+            f"</JournalIssue><Title>{escape(a['journal'])}</Title></Journal>"
+            f"<ArticleTitle>{escape(a['titre'])}</ArticleTitle><Abstract>{abstract}</Abstract>"
+            f"<AuthorList><Author><LastName>Martin</LastName><ForeName>Claire</ForeName></Author></AuthorList>"
+            f"<Language>eng</Language></Article><MeshHeadingList>{mesh}</MeshHeadingList></MedlineCitation>"
+            f"<PubmedData><ArticleIdList>{ids}</ArticleIdList></PubmedData></PubmedArticle>"
+        )
+    return ('<?xml version="1.0" ?><PubmedArticleSet>' + "".join(blocs) + "</PubmedArticleSet>").encode("utf-8")
+
+
+def esummary_json(pmids: list) -> dict:
+    resultat = {"uids": pmids}
+    for pmid in pmids:
+        a = article(pmid)
+        resultat[pmid] = {"uid": pmid, "title": a["titre"], "fulljournalname": a["journal"],
+                          "pubdate": f"{a['annee']} {a['mois']}"}
+    return {"result": resultat}
+
+
+def elink_llinks(pmid: str, base: str) -> str:
+    a = article(pmid)
+    if not a["pmcid"]:
+        return f"<eLinkResult><LinkSet><IdUrlList><IdUrlSet><Id>{pmid}</Id></IdUrlSet></IdUrlList></LinkSet></eLinkResult>"
+    return (f"<eLinkResult><LinkSet><IdUrlList><IdUrlSet><Id>{pmid}</Id><ObjUrl>"
+            f"<Url>{base}/pmc/articles/{a['pmcid']}/</Url><LinkName>Free in PMC</LinkName>"
+            f"</ObjUrl></IdUrlSet></IdUrlList></LinkSet></eLinkResult>")
+
+
+# ============================================
+# TEXTE INTÉGRAL (JATS, PDF)
+# ============================================
+
+def jats_xml(pmcid: str) -> bytes:
+    a = article(pmid_depuis_pmcid(pmcid))
+    abstract = "".join(f"<sec><title>{l.title()}</title><p>{escape(t)}</p></sec>" for l, t in a["abstract"].items())
+    corps = "".join(f"<sec><title>{titre}</title><p>{escape(texte)}</p></sec>" for titre, texte in a["sections"])
+    return (
+        f'<article article-type="research-article"><front><article-meta>'
+        f'<article-id pub-id-type="pmc">{pmcid}</article-id>'
+        f"<title-group><article-title>{escape(a['titre'])}</article-title></title-group>"
+        f"<abstract>{abstract}</abstract></article-meta></front><body>{corps}</body>"
+        f"<back><ref-list><ref><mixed-citation>Reference 1.</mixed-citation></ref></ref-list></back></article>"
+    ).encode("utf-8")
+
+
+def pdf_article(pmid: str) -> bytes:
+    """PDF texte minimal (Helvetica, pages A4) avec le titre, l'abstract et les sections."""
+    a = article(pmid)
+    lignes = [a["titre"], ""]
+    for titre, texte in list(a["abstract"].items()) + a["sections"]:
+        lignes.append(titre.upper())
+        mots, ligne = texte.split(), ""
+        for mot in mots:
+            if len(ligne) + len(mot) > 90:
+                lignes.append(ligne)
+                ligne = ""
+            ligne = f"{ligne} {mot}".strip()
+        lignes += [ligne, ""]
+
+    pages = [lignes[i:i + 50] for i in range(0, len(lignes), 50)]
+    objets = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page in pages:
+        texte = "\n".join(
+            f"({l.replace(chr(92), '').replace('(', '[').replace(')', ']')}) Tj T*" for l in page
+        )
+        flux = f"BT /F1 10 Tf 14 TL 50 800 Td\n{texte}\nET".encode("latin-1", "replace")
+        objets.append(f"<< /Length {len(flux)} >>\nstream\n".encode("latin-1") + flux + b"\nendstream")
+        kids.append(len(objets) + 1)
+        objets.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                      f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objets)} 0 R >>")
+    objets[1] = f"<< /Type /Pages /Kids [{' '.join(f'{k} 0 R' for k in kids)}] /Count {len(kids)} >>"
+
+    sortie = io.BytesIO()
+    sortie.write(b"%PDF-1.4\n")
+    positions = []
+    for numero, objet in enumerate(objets, 1):
+        positions.append(sortie.tell())
+        contenu = objet if isinstance(objet, bytes) else objet.encode("latin-1")
+        sortie.write(f"{numero} 0 obj\n".encode() + contenu + b"\nendobj\n")
+    xref = sortie.tell()
+    sortie.write(f"xref\n0 {len(objets) + 1}\n0000000000 65535 f \n".encode())
+    sortie.write("".join(f"{p:010d} 00000 n \n" for p in positions).encode())
+    sortie.write(f"trailer\n<< /Size {len(objets) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+    return sortie.getvalue()
+
+
+def archive_oa(pmcid: str) -> bytes:
+    """Archive tar.gz du paquet Open Access PMC (PDF + XML)."""
+    tampon = io.BytesIO()
+    with tarfile.open(fileobj=tampon, mode="w:gz") as tar:
+        for nom, contenu in ((f"{pmcid}/{pmcid}.pdf", pdf_article(pmid_depuis_pmcid(pmcid))),
+                             (f"{pmcid}/{pmcid}.nxml", jats_xml(pmcid))):
+            info = tarfile.TarInfo(nom)
+            info.size = len(contenu)
+            tar.addfile(info, io.BytesIO(contenu))
+    return tampon.getvalue()
+
+
+# ============================================
+# UNPAYWALL, EUROPE PMC
+# ============================================
+
+def unpaywall_json(doi: str, base: str):
+    """None si le DOI n'est pas simulé (404)."""
+    m = re.match(r"10\.5555/simule\.(\d+)$", doi)
+    if not m:
+        return None
+    a = article(m.group(1))
+    emplacement = {"url_for_pdf": f"{base}/editeur/pdf/{a['pmid']}", "host_type": "publisher",
+                   "license": "cc-by", "version": "publishedVersion"}
+    return {"doi": doi, "is_oa": a["libre"], "title": a["titre"], "journal_name": a["journal"],
+            "best_oa_location": emplacement if a["libre"] else None,
+            "oa_locations": [emplacement] if a["libre"] else []}
+
+
+def europepmc_recherche(requete: str) -> dict:
+    m = re.search(r"EXT_ID:(\d+)", requete)
+    resultats = []
+    if m:
+        a = article(m.group(1))
+        resultats.append({
+            "id": a["pmcid"] or a["pmid"], "source": "PMC" if a["pmcid"] else "MED", "pmid": a["pmid"],
+            "pmcid": a["pmcid"], "doi": a["doi"], "title": a["titre"],
+            "hasPDF": "Y" if a["pmcid"] else "N", "isOpenAccess": "Y" if a["libre"] else "N",
+        })
+    return {"hitCount": len(resultats), "resultList": {"result": resultats}}
+
+
+# ============================================
+# TRADUCTION ET LLM
+# ============================================
+
+def traduction_simulee(texte: str) -> str:
+    return f"[FR] {texte}"
+
+
+def deepl_json(textes: list) -> dict:
+    return {"translations": [{"detected_source_language": "EN", "text": traduction_simulee(t)} for t in textes]}
+
+
+def reponse_llm(prompt: str) -> str:
+    """Réponse plausible selon le type de prompt des apps (lots [[n]], digest JSON, texte libre)."""
+    balises = re.findall(r"\[\[(\d+)\]\]\s*(.*?)(?=\[\[\d+\]\]|\Z)", prompt.split("TEXTES:", 1)[-1], re.DOTALL)
+    if balises:
+        return "\n\n".join(f"[[{n}]] {traduction_simulee(t.strip().split('TRADUCTIONS:')[0].strip())}"
+                           for n, t in balises)
+    pmids = re.findall(r"\[PMID (\d+)\]", prompt)
+    if pmids and "JSON" in prompt:
+        return json.dumps([{"pmid": p, "titre_fr": traduction_simulee(article(p)["titre"]),
+                            "resume": "Essai simulé : résultat principal favorable.",
+                            "interet": "Intérêt clinique simulé."} for p in pmids], ensure_ascii=False)
+    extrait = " ".join(prompt.split()[-60:])
+    return f"Réponse simulée. {traduction_simulee(extrait)}"
+
+
+def gemini_json(corps: dict) -> dict:
+    prompt = "\n".join(p.get("text", "") for c in corps.get("contents", []) for p in c.get("parts", []))
+    texte = reponse_llm(prompt)
+    return {
+        "candidates": [{"content": {"parts": [{"text": texte}], "role": "model"}, "finishReason": "STOP", "index": 0}],
+        "usageMetadata": {"promptTokenCount": len(prompt) // 4, "candidatesTokenCount": len(texte) // 4,
+                          "totalTokenCount": (len(prompt) + len(texte)) // 4},
+    }
+
+
+def anthropic_json(corps: dict) -> dict:
+    prompt = "\n".join(
+        m["content"] if isinstance(m.get("content"), str)
+        else "\n".join(b.get("text", "") for b in m.get("content", []))
+        for m in corps.get("messages", [])
+    )
+    texte = reponse_llm(prompt)
+    return {"id": "msg_simule", "type": "message", "role": "assistant", "model": corps.get("model", ""),
+            "content": [{"type": "text", "text": texte}], "stop_reason": "end_turn", "stop_sequence": None,
+            "usage": {"input_tokens": len(prompt) // 4, "output_tokens": len(texte) // 4}}
@@ -0,0 +1,232 @@
+# ============================================
+# SERVICES SIMULÉS — SERVEUR HTTP
+# ============================================
+
+"""
+Un seul serveur HTTP local sert tous les services, par préfixe de chemin
+(voir config_services pour la correspondance avec les URL réelles) :
+
+    /eutils/{esearch,efetch,esummary,elink}.fcgi
+    /unpaywall/v2/<doi>                  /editeur/pdf/<pmid>
+    /europepmc/rest/search               /europepmc/rest/<PMCID>/fullTextXML
+    /europepmc/backend/ptpmcrender.fcgi  /pmc/articles/<PMCID>/pdf/
+    /pmc-oa/oa_pdf/<d1>/<d2>/<PMCID>.tar.gz
+    /deepl/v2/translate
+    /v1beta/models/<modele>:generateContent   (Gemini, transport REST)
+    /anthropic/v1/messages
+    /_stats                                   (compteurs par service)
+
+Pour chaque service : latence simulée (moyenne + gigue), taux d'erreurs
+503 et plafond de requêtes par seconde au-delà duquel le serveur répond
+429 (Retry-After), comme NCBI ou DeepL.
+"""
+
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from collections import defaultdict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from . import donnees
+
+SERVICES = ("eutils", "unpaywall", "editeur", "europepmc", "pmc", "pmc-oa", "deepl", "gemini", "anthropic")
+
+
+class ConfigurationSimulee:
+    """
+    Comportement des services. `services` surcharge les valeurs par
+    service : {"eutils": {"debit_max": 3}, "deepl": {"taux_erreur": 0.2}}.
+    """
+
+    def __init__(self, latence=0.05, gigue=0.5, taux_erreur=0.0, debit_max=0, services=None, graine=None):
+        self.defaut = {"latence": latence, "gigue": gigue, "taux_erreur": taux_erreur, "debit_max": debit_max}
+        self.services = services or {}
+        self.rng = random.Random(graine)
+        self._verrou = threading.Lock()
+        self._fenetres = defaultdict(deque)
+        self.stats = defaultdict(lambda: defaultdict(int))
+        self.historiques = {}  # WebEnv -> terme de recherche
+
+    def regle(self, service: str, cle: str):
+        return self.services.get(service, {}).get(cle, self.defaut[cle])
+
+    def decider(self, service: str):
+        """Latence à appliquer et statut forcé (429, 503) ou None."""
+        with self._verrou:
+            debit = self.regle(service, "debit_max")
+            if debit:
+                fenetre, maintenant = self._fenetres[service], time.monotonic()
+                while fenetre and maintenant - fenetre[0] > 1.0:
+                    fenetre.popleft()
+                if len(fenetre) >= debit:
+                    return 0.0, 429
+                fenetre.append(maintenant)
+            latence = self.regle(service, "latence")
+            gigue = self.regle(service, "gigue")
+            latence = max(0.0, latence * (1 + self.rng.uniform(-gigue, gigue)))
+            erreur = 503 if self.rng.random() < self.regle(service, "taux_erreur") else None
+        return latence, erreur
+
+    def compter(self, service: str, statut: int):
+        with self._verrou:
+            self.stats[service][str(statut)] += 1
+
+
+def _service(chemin: str) -> str:
+    if chemin.startswith("/v1beta/"):
+        return "gemini"
+    premier = chemin.strip("/").split("/", 1)[0]
+    return premier if premier in SERVICES else ""
+
+
+class _Gestionnaire(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    configuration: ConfigurationSimulee = None
+
+    def log_message(self, *args):
+        pass
+
+    def _base(self) -> str:
+        return f"http://{self.headers.get('Host', '%s:%d' % self.server.server_address[:2])}"
+
+    def _repondre(self, statut: int, contenu=b"", type_contenu="application/json", entetes=None):
+        if isinstance(contenu, (dict, list)):
+            contenu = json.dumps(contenu, ensure_ascii=False).encode("utf-8")
+        elif isinstance(contenu, str):
+            contenu = contenu.encode("utf-8")
+        self.send_response(statut)
+        self.send_header("Content-Type", type_contenu)
+        self.send_header("Content-Length", str(len(contenu)))
+        for cle, valeur in (entetes or {}).items():
+            self.send_header(cle, valeur)
+        self.end_headers()
+        self.wfile.write(contenu)
+
+    def _parametres(self, url) -> dict:
+        parametres = parse_qs(url.query, keep_blank_values=True)
+        if self.command == "POST":
+            longueur = int(self.headers.get("Content-Length", 0) or 0)
+            corps = self.rfile.read(longueur) if longueur else b""
+            if "json" in self.headers.get("Content-Type", ""):
+                return {"_json": json.loads(corps or b"{}")}
+            for cle, valeurs in parse_qs(corps.decode("utf-8"), keep_blank_values=True).items():
+                parametres.setdefault(cle, []).extend(valeurs)
+        return parametres
+
+    def _traiter(self):
+        url = urlsplit(self.path)
+        chemin = unquote(url.path)
+        parametres = self._parametres(url)
+        config = self.configuration
+
+        if chemin == "/_stats":
+            return self._repondre(200, {s: dict(c) for s, c in config.stats.items()})
+
+        service = _service(chemin)
+        if not service:
+            return self._repondre(404, {"erreur": f"chemin inconnu : {chemin}"})
+
+        latence, erreur = config.decider(service)
+        if latence:
+            time.sleep(latence)
+        if erreur == 429:
+            config.compter(service, 429)
+            return self._repondre(429, {"error": "API rate limit exceeded"}, entetes={"Retry-After": "1"})
+        if erreur:
+            config.compter(service, erreur)
+            return self._repondre(erreur, {"error": "Service temporarily unavailable"})
+
+        statut, contenu, type_contenu = self._router(service, chemin, parametres)
+        config.compter(service, statut)
+        return self._repondre(statut, contenu, type_contenu)
+
+    def _router(self, service, chemin, p):
+        un = lambda cle, defaut="": (p.get(cle) or [defaut])[0]
+        base = self._base()
+        json_t, xml_t, pdf_t = "application/json", "text/xml; charset=UTF-8", "application/pdf"
+
+        if service == "eutils":
+            outil = chemin.rsplit("/", 1)[-1]
+            if outil == "esearch.fcgi":
+                terme = un("term")
+                webenv, query_key = "", ""
+                if un("usehistory") == "y":
+                    webenv, query_key = un("WebEnv") or f"MCID_{uuid.uuid4().hex[:16]}", "1"
+                    self.configuration.historiques[webenv] = terme
+                resultat = donnees.esearch_json(terme, int(un("retstart", "0")), int(un("retmax", "20")), webenv, query_key)
+                return 200, resultat, json_t
+            ids = [i for i in ",".join(p.get("id", [])).split(",") if i]
+            if not ids and un("WebEnv") in self.configuration.historiques:
+                ids = donnees.ids_historique(self.configuration.historiques[un("WebEnv")],
+                                             int(un("retstart", "0")), int(un("retmax", "20")))
+            if outil == "efetch.fcgi" and un("db") == "pmc":
+                pmcids = [i if i.startswith("PMC") else f"PMC{i}" for i in ids]
+                articles = b"".join(donnees.jats_xml(i) for i in pmcids if donnees.article(donnees.pmid_depuis_pmcid(i))["pmcid"])
+                return 200, b"<pmc-articleset>" + articles + b"</pmc-articleset>", xml_t
+            if outil == "efetch.fcgi":
+                return 200, donnees.efetch_pubmed_xml(ids), xml_t
+            if outil == "esummary.fcgi":
+                return 200, donnees.esummary_json(ids), json_t
+            if outil == "elink.fcgi":
+                return 200, "".join(donnees.elink_llinks(i, base) for i in ids), xml_t
+
+        elif service == "unpaywall":
+            resultat = donnees.unpaywall_json(chemin.split("/v2/", 1)[-1], base)
+            if resultat is None:
+                return 404, {"error": True, "message": "DOI not found"}, json_t
+            return 200, resultat, json_t
+
+        elif service == "editeur":
+            return 200, donnees.pdf_article(chemin.rstrip("/").rsplit("/", 1)[-1]), pdf_t
+
+        elif service == "europepmc":
+            if chemin.endswith("/search"):
+                return 200, donnees.europepmc_recherche(un("query")), json_t
+            m = re.search(r"/(PMC\d+)/fullTextXML$", chemin)
+            if m:
+                return 200, donnees.jats_xml(m.group(1)), xml_t
+            if chemin.endswith("/ptpmcrender.fcgi"):
+                return 200, donnees.pdf_article(donnees.pmid_depuis_pmcid(un("accid"))), pdf_t
+
+        elif service == "pmc":
+            m = re.search(r"/articles/(PMC\d+)/pdf", chemin)
+            if m:
+                return 200, donnees.pdf_article(donnees.pmid_depuis_pmcid(m.group(1))), pdf_t
+
+        elif service == "pmc-oa":
+            m = re.search(r"/(PMC\d+)\.tar\.gz$", chemin)
+            if m:
+                return 200, donnees.archive_oa(m.group(1)), "application/x-gzip"
+
+        elif service == "deepl":
+            return 200, donnees.deepl_json(p.get("text", [])), json_t
+
+        elif service == "gemini":
+            return 200, donnees.gemini_json(p.get("_json", {})), json_t
+
+        elif service == "anthropic":
+            return 200, donnees.anthropic_json(p.get("_json", {})), json_t
+
+        return 404, {"erreur": f"ressource inconnue : {chemin}"}, json_t
+
+    def do_GET(self):
+        self._traiter()
+
+    def do_POST(self):
+        self._traiter()
+
+
+def demarrer_services(hote="127.0.0.1", port=8600, configuration=None):
+    """
+    Démarre le serveur dans un thread daemon. Retourne (serveur, url de base) ;
+    serveur.shutdown() l'arrête. port=0 choisit un port libre.
+    """
+    gestionnaire = type("Gestionnaire", (_Gestionnaire,), {"configuration": configuration or ConfigurationSimulee()})
+    serveur = ThreadingHTTPServer((hote, port), gestionnaire)
+    serveur.daemon_threads = True
+    threading.Thread(target=serveur.serve_forever, daemon=True).start()
+    return serveur, f"http://{hote}:{serveur.server_address[1]}"
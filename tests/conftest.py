@@ -0,0 +1,28 @@
+"""
+Fixtures communes : chaque test écrit dans un dossier de données vierge
+(jamais dans .veille_data) avec un cache partagé vide.
+
+    python -m pytest -q
+"""
+
+import os
+import sys
+
+import pytest
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RACINE)
+
+import config_stockage
+from utils_cache import cache_partage
+
+
+@pytest.fixture(autouse=True)
+def donnees(tmp_path, monkeypatch):
+    """Dossier de données local propre au test."""
+    dossier = tmp_path / "donnees"
+    monkeypatch.setattr(config_stockage, "DOSSIER_DONNEES", str(dossier))
+    monkeypatch.setenv("VEILLE_DATA_DIR", str(dossier))
+    cache_partage().vider()
+    yield dossier
+    cache_partage().vider()
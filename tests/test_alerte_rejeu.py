@@ -0,0 +1,59 @@
+"""
+Test de fumée d'alerte.py hors ligne : une exécution enregistrée contre les
+services simulés (services_simules), puis rejouée serveur arrêté
+(utils_rejeu), doit produire le même digest.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from conftest import RACINE
+
+pytest.importorskip("google.generativeai")
+pytest.importorskip("requests")
+
+from services_simules import demarrer_services
+
+
+def executer_alerte(env):
+    return subprocess.run(
+        [sys.executable, os.path.join(RACINE, "alerte.py"), "--specialites", "Cardiologie", "--sans-envoi"],
+        env=env, capture_output=True, text=True, timeout=120, cwd=RACINE
+    )
+
+
+def digest(sortie: str) -> str:
+    """Partie de la sortie qui ne dépend pas des durées mesurées."""
+    assert "--- " in sortie, sortie
+    return sortie[sortie.index("--- "):]
+
+
+def test_alerte_enregistree_puis_rejouee(tmp_path, donnees):
+    serveur, url = demarrer_services(port=0)
+    env = dict(
+        os.environ,
+        PYTHONPATH=os.pathsep.join(filter(None, [RACINE, os.environ.get("PYTHONPATH")])),
+        VEILLE_SERVICES_SIMULES=url,
+        VEILLE_FIXTURES=str(tmp_path / "fixtures"),
+        VEILLE_DATA_DIR=str(donnees),
+        VEILLE_ABONNES='{"cardio@exemple.fr": ["Cardiologie"]}',
+        VEILLE_REJEU_LATENCE="0",
+        GEMINI_KEY="cle-de-test",
+    )
+    try:
+        enregistre = executer_alerte(dict(env, VEILLE_REJEU="enregistrer"))
+    finally:
+        serveur.shutdown()
+    assert enregistre.returncode == 0, enregistre.stderr
+    assert "✅ Cardiologie" in enregistre.stdout
+    assert "--- cardio@exemple.fr : Veille Cardiologie ---" in enregistre.stdout
+    assert os.listdir(tmp_path / "fixtures" / "http") and os.listdir(tmp_path / "fixtures" / "llm")
+
+    rejoue = executer_alerte(dict(env, VEILLE_REJEU="rejouer"))
+    assert rejoue.returncode == 0, rejoue.stderr
+    assert "FixtureAbsente" not in rejoue.stdout + rejoue.stderr
+    assert digest(rejoue.stdout) == digest(enregistre.stdout)
+    assert "Résumé indisponible (erreur IA)" not in rejoue.stdout
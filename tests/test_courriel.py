@@ -0,0 +1,134 @@
+"""Nouvelles tentatives et échecs définitifs de l'envoi SMTP (utils_courriel)."""
+
+import smtplib
+
+import pytest
+
+import utils_courriel
+from utils_courriel import ConnexionSMTP, EnvoiImpossible, TENTATIVES, rendre_message
+
+
+class ServeurFactice:
+    """Remplace smtplib.SMTP : chaque envoi consomme la prochaine réaction du scénario."""
+
+    instances = []
+
+    def __init__(self, scenario, erreur_login=None):
+        self.scenario = scenario
+        self.erreur_login = erreur_login
+        self.envoyes = []
+
+    def __call__(self, hote, port, timeout=None):
+        ServeurFactice.instances.append(self)
+        return self
+
+    def starttls(self):
+        pass
+
+    def login(self, login, mot_de_passe):
+        if self.erreur_login:
+            raise self.erreur_login
+
+    def send_message(self, msg, to_addrs):
+        reaction = self.scenario.pop(0) if self.scenario else None
+        if reaction is not None:
+            raise reaction
+        self.envoyes.append((to_addrs[0], msg["Subject"]))
+
+    def quit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def serveur(monkeypatch):
+    """Fabrique de serveur factice branché à la place de smtplib.SMTP, sans attente."""
+    monkeypatch.setattr(utils_courriel, "ATTENTE_TENTATIVE", 0)
+    ServeurFactice.instances = []
+
+    def brancher(*scenario, erreur_login=None):
+        factice = ServeurFactice(list(scenario), erreur_login)
+        monkeypatch.setattr(smtplib, "SMTP", factice)
+        return factice
+    return brancher
+
+
+def envoyer(destinataire="a@exemple.fr"):
+    msg = rendre_message("veille@exemple.fr", "Veille", "corps")
+    with ConnexionSMTP("veille", "secret", securite="starttls", debit_max=0) as smtp:
+        return smtp.envoyer(msg, destinataire), smtp.stats
+
+
+def refus(code):
+    return smtplib.SMTPRecipientsRefused({"a@exemple.fr": (code, b"refus")})
+
+
+def test_envoi_direct(serveur):
+    factice = serveur()
+    (ok, erreur, definitif), stats = envoyer()
+    assert (ok, erreur, definitif) == (True, None, False)
+    assert factice.envoyes == [("a@exemple.fr", "Veille")]
+    assert stats["tentatives"] == 1
+
+
+def test_refus_temporaire_puis_succes(serveur):
+    serveur(refus(451))
+    (ok, _, _), stats = envoyer()
+    assert ok and stats["tentatives"] == 2
+
+
+def test_refus_temporaire_persistant_non_definitif(serveur):
+    serveur(*[refus(452)] * TENTATIVES)
+    (ok, erreur, definitif), stats = envoyer()
+    assert not ok and not definitif and erreur.startswith("452")
+    assert stats["tentatives"] == TENTATIVES and stats["echecs"] == 1
+
+
+def test_destinataire_refuse_definitif_sans_nouvel_essai(serveur):
+    serveur(refus(550))
+    (ok, erreur, definitif), stats = envoyer()
+    assert not ok and definitif and erreur.startswith("550")
+    assert stats["tentatives"] == 1
+
+
+def test_message_refuse_5xx_reessaye_a_la_prochaine_execution(serveur):
+    serveur(smtplib.SMTPDataError(554, b"contenu refuse"))
+    (ok, _, definitif), stats = envoyer()
+    assert not ok and not definitif and stats["tentatives"] == 1
+
+
+def test_deconnexion_reconnecte(serveur):
+    serveur(smtplib.SMTPServerDisconnected("coupure"))
+    (ok, _, _), stats = envoyer()
+    assert ok and stats["connexions"] == 2
+
+
+def test_authentification_refusee(serveur):
+    serveur(erreur_login=smtplib.SMTPAuthenticationError(535, b"bad credentials"))
+    with pytest.raises(EnvoiImpossible):
+        envoyer()
+
+
+def test_expediteur_refuse(serveur):
+    serveur(smtplib.SMTPSenderRefused(553, b"sender", "veille@exemple.fr"))
+    with pytest.raises(EnvoiImpossible):
+        envoyer()
+
+
+def test_expediteur_refuse_temporairement(serveur):
+    serveur(smtplib.SMTPSenderRefused(451, b"greylisted", "veille@exemple.fr"))
+    (ok, _, _), stats = envoyer()
+    assert ok and stats["tentatives"] == 2
+
+
+def test_destinataire_remplace_sur_message_reutilise(serveur):
+    factice = serveur()
+    msg = rendre_message("veille@exemple.fr", "Veille", "corps")
+    with ConnexionSMTP(securite="aucune", debit_max=0) as smtp:
+        smtp.envoyer(msg, "a@exemple.fr")
+        smtp.envoyer(msg, "b@exemple.fr")
+    assert msg["To"] == "b@exemple.fr"
+    assert [d for d, _ in factice.envoyes] == ["a@exemple.fr", "b@exemple.fr"]
+    assert len(ServeurFactice.instances) == 1
@@ -0,0 +1,75 @@
+"""Filigranes des alertes et boîte d'envoi (utils_filigranes)."""
+
+import utils_filigranes
+from utils_filigranes import (
+    JOURS_CONSERVATION_VUS, avancer_filigrane, envois_en_attente, lire_filigrane, marquer_envoi,
+    pmids_nouveaux, valider_digests
+)
+
+QUERY = "Cardiology[MeSH Terms] AND (Circulation[ta] OR Heart[ta])"
+
+
+def test_sans_filigrane():
+    assert lire_filigrane(QUERY) is None
+    assert pmids_nouveaux(QUERY, ["1", "2"]) == ["1", "2"]
+
+
+def test_avancee_du_filigrane():
+    avancer_filigrane(QUERY, "2026/10/01", ["1", "2"])
+    assert lire_filigrane(QUERY) == "2026/10/01"
+    # Le jour du filigrane est relu : les PMID déjà envoyés sont écartés, l'ordre est conservé
+    assert pmids_nouveaux(QUERY, ["3", "2", "1", "4"]) == ["3", "4"]
+
+    avancer_filigrane(QUERY, "2026/10/02", ["3"])
+    assert lire_filigrane(QUERY) == "2026/10/02"
+    assert pmids_nouveaux(QUERY, ["1", "3", "4"]) == ["4"]
+
+
+def test_cle_insensible_aux_espaces():
+    avancer_filigrane(QUERY, "2026/10/01", ["1"])
+    assert lire_filigrane("  " + QUERY.replace(" ", "   ")) == "2026/10/01"
+    assert lire_filigrane("Neurology[MeSH Terms]") is None
+
+
+def test_pmids_vus_oublies_apres_conservation(monkeypatch):
+    maintenant = 2_000_000_000.0
+    monkeypatch.setattr(utils_filigranes.time, "time", lambda: maintenant - (JOURS_CONSERVATION_VUS + 1) * 86400)
+    avancer_filigrane(QUERY, "2026/09/01", ["1"])
+    monkeypatch.setattr(utils_filigranes.time, "time", lambda: maintenant)
+    avancer_filigrane(QUERY, "2026/10/01", ["2"])
+    assert pmids_nouveaux(QUERY, ["1", "2"]) == ["1"]
+
+
+def test_filigranes_et_envois_dans_la_meme_transaction():
+    valider_digests(
+        [(QUERY, "2026/10/01", ["1", "2"])],
+        [("a@exemple.fr", "Veille", "corps"), ("b@exemple.fr", "Veille", "corps")]
+    )
+    assert lire_filigrane(QUERY) == "2026/10/01"
+    assert [(d, s) for _, d, s, _ in envois_en_attente()] == [("a@exemple.fr", "Veille"), ("b@exemple.fr", "Veille")]
+
+
+def test_seul_le_destinataire_en_echec_reste_en_attente():
+    valider_digests([], [("a@exemple.fr", "Veille", "corps"), ("b@exemple.fr", "Veille", "corps")])
+    (id_a, _, _, _), (id_b, _, _, _) = envois_en_attente()
+    marquer_envoi(id_a, True)
+    marquer_envoi(id_b, False, "451 greylisted")
+    assert [d for _, d, _, _ in envois_en_attente()] == ["b@exemple.fr"]
+
+    conn = utils_filigranes._connexion()
+    try:
+        assert conn.execute("SELECT tentatives, erreur FROM envois").fetchall() == [(1, "451 greylisted")]
+    finally:
+        conn.close()
+
+    marquer_envoi(id_b, True)
+    assert envois_en_attente() == []
+
+
+def test_envois_trop_anciens_abandonnes(monkeypatch):
+    maintenant = 2_000_000_000.0
+    monkeypatch.setattr(utils_filigranes.time, "time", lambda: maintenant - (JOURS_CONSERVATION_VUS + 1) * 86400)
+    valider_digests([], [("a@exemple.fr", "Ancienne veille", "corps")])
+    monkeypatch.setattr(utils_filigranes.time, "time", lambda: maintenant)
+    valider_digests([], [("a@exemple.fr", "Veille", "corps")])
+    assert [s for _, _, s, _ in envois_en_attente()] == ["Veille"]
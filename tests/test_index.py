@@ -0,0 +1,73 @@
+"""Index local FTS5 et migration des anciens index (utils_index)."""
+
+import sqlite3
+
+import utils_index
+from utils_index import articles_indexes, indexer_articles, rechercher_local, requete_fts, statistiques_index
+
+ARTICLE = {
+    "pmid": "101", "title_en": "Endometriosis and pelvic pain", "title_fr": "Endométriose et douleur pelvienne",
+    "abstract_en": "Background.", "abstract_fr": "Contexte.", "mesh": ["Endometriosis", "Pelvic Pain"],
+    "journal": "Fertil Steril", "year": "2025", "doi": "10.1016/x", "pmcid": None,
+}
+
+
+def test_article_complet_resservi():
+    indexer_articles([ARTICLE])
+    article = articles_indexes(["101", "999"])["101"]
+    assert article["title_fr"] == ARTICLE["title_fr"]
+    assert article["mesh"] == ["Endometriosis", "Pelvic Pain"]
+
+
+def test_mise_a_jour_partielle_garde_les_champs_connus():
+    indexer_articles([ARTICLE])
+    indexer_articles([{"pmid": "101", "title_en": "Endometriosis and pelvic pain", "journal": ""}])
+    article = articles_indexes(["101"])["101"]
+    assert article["abstract_fr"] == "Contexte." and article["journal"] == "Fertil Steril"
+
+
+def test_traduction_identique_non_complete():
+    indexer_articles([dict(ARTICLE, abstract_fr=ARTICLE["abstract_en"])])
+    assert articles_indexes(["101"]) == {}
+
+
+def test_recherche_sans_accents():
+    indexer_articles([ARTICLE, dict(ARTICLE, pmid="102", title_fr="Asthme de l'enfant",
+                                    title_en="Childhood asthma", mesh=["Asthma"], abstract_en="", abstract_fr="")])
+    articles, erreur = rechercher_local("endometriose")
+    assert erreur is None and [a["pmid"] for a in articles] == ["101"]
+    assert "**" in articles[0]["extrait"]
+
+    articles, _ = rechercher_local("asthm, pelvienne")
+    assert sorted(a["pmid"] for a in articles) == ["101", "102"]
+
+
+def test_requete_fts():
+    assert requete_fts('douleur pelv, "pelvic pain"') == '("douleur"* "pelv"*) OR ("pelvic pain")'
+    assert requete_fts("  ,  ") == ""
+
+
+def test_migration_ancien_index():
+    # Index créé avant la version 1 : abstracts « traduits » identiques marqués complets
+    utils_index._connexion().close()
+    conn = sqlite3.connect(utils_index.chemin_donnees(utils_index.FICHIER_INDEX))
+    with conn:
+        conn.execute(
+            "INSERT INTO articles (pmid, title_en, title_fr, abstract_en, abstract_fr, mesh, journal, complet, maj) "
+            "VALUES ('1', 'Title', 'Titre', 'Same text', 'Same text', '', '', 1, 0), "
+            "('2', 'Title', 'Titre', 'Abstract', 'Résumé', '', '', 1, 0)"
+        )
+        conn.execute("PRAGMA user_version = 0")
+    conn.close()
+
+    assert list(articles_indexes(["1", "2"])) == ["2"]
+    conn = sqlite3.connect(utils_index.chemin_donnees(utils_index.FICHIER_INDEX))
+    try:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == 1
+        assert conn.execute("SELECT abstract_fr, complet FROM articles WHERE pmid = '1'").fetchone() == ("", 0)
+    finally:
+        conn.close()
+    # L'index plein texte suit la migration (déclencheur de mise à jour)
+    articles, _ = rechercher_local("same")
+    assert [a["pmid"] for a in articles] == ["1"]
+    assert statistiques_index()["articles"] == 2
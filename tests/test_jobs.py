@@ -0,0 +1,134 @@
+"""Bail, reprise des tâches orphelines et plafond de reprises (utils_jobs)."""
+
+import time
+
+import pytest
+
+import utils_jobs
+from utils_jobs import (
+    DUREE_BAIL, MAX_REPRISES, _charger, _revendiquer, _sauver, enregistrer_tache, etat_job, job_par_cle,
+    reprendre_jobs, soumettre
+)
+
+
+@pytest.fixture(autouse=True)
+def processus_vierge(monkeypatch):
+    """Chaque test part d'un processus sans tâche active ni reprise récente."""
+    monkeypatch.setattr(utils_jobs, "_actifs", {})
+    monkeypatch.setattr(utils_jobs, "_index_cles", {})
+    monkeypatch.setattr(utils_jobs, "_derniere_reprise", [0.0])
+
+
+def attendre_fin(job_id, delai=5.0):
+    limite = time.time() + delai
+    while time.time() < limite:
+        etat = etat_job(job_id)
+        if etat and etat["statut"] not in utils_jobs.STATUTS_ACTIFS:
+            return etat
+        time.sleep(0.02)
+    raise AssertionError(f"tâche {job_id} toujours active")
+
+
+def tache_comptage(parametres, ctx):
+    """Compte jusqu'à n ; chaque étape est un point de reprise."""
+    for i in range(parametres["n"]):
+        if str(i) not in ctx.partiel:
+            ctx.point_de_reprise(str(i), i * i)
+    return sum(ctx.partiel.values())
+
+
+def job_orphelin(job_id, reprises=0, bail=None, partiel=None):
+    """État sur disque d'une tâche dont le processus s'est arrêté."""
+    maintenant = time.time()
+    etat = {
+        "id": job_id, "type": "comptage", "cle": None, "parametres": {"n": 4},
+        "statut": "en_cours", "progression": 0.5, "message": "", "evenements": [],
+        "partiel": partiel or {}, "resultat": None, "erreur": None,
+        "cree_le": maintenant, "maj_le": maintenant,
+        "proprietaire": {"hote": "autre-hote", "pid": 1},
+        "bail": maintenant - 1 if bail is None else bail, "reprises": reprises,
+    }
+    _sauver(etat)
+    return etat
+
+
+enregistrer_tache("comptage", tache_comptage)
+
+
+def test_execution_et_resultat():
+    job_id = soumettre("comptage", {"n": 4})
+    etat = attendre_fin(job_id)
+    assert etat["statut"] == "termine" and etat["resultat"] == 0 + 1 + 4 + 9
+    assert etat["bail"] > time.time()
+    assert _charger(job_id)["statut"] == "termine"
+
+
+def test_cle_reutilise_la_tache_active():
+    def bloquee(parametres, ctx):
+        while not ctx.annule:
+            time.sleep(0.01)
+
+    enregistrer_tache("bloquee", bloquee)
+    premier = soumettre("bloquee", {}, cle="article:1")
+    try:
+        assert soumettre("bloquee", {}, cle="article:1") == premier
+        assert job_par_cle("article:1")["id"] == premier
+    finally:
+        utils_jobs.annuler(premier)
+    assert attendre_fin(premier)["statut"] == "annule"
+
+
+def test_bail_valide_non_revendique():
+    job_orphelin("vivant", bail=time.time() + DUREE_BAIL)
+    assert _revendiquer("vivant") is None
+    assert _charger("vivant")["reprises"] == 0
+
+
+def test_bail_expire_revendique():
+    job_orphelin("orphelin")
+    etat = _revendiquer("orphelin")
+    assert etat["statut"] == "en_attente" and etat["reprises"] == 1
+    assert etat["proprietaire"] == utils_jobs.PROPRIETAIRE
+    assert etat["bail"] > time.time()
+    # Déjà revendiquée (bail renouvelé) : un second processus ne la reprend pas
+    assert _revendiquer("orphelin") is None
+
+
+def test_revendication_concurrente_exclue():
+    job_orphelin("disputee")
+    verrou = utils_jobs._chemin_job("disputee") + ".verrou"
+    open(verrou, "w").close()
+    assert _revendiquer("disputee") is None
+
+
+def test_plafond_de_reprises():
+    job_orphelin("instable", reprises=MAX_REPRISES)
+    assert _revendiquer("instable") is None
+    etat = _charger("instable")
+    assert etat["statut"] == "erreur" and "Abandon" in etat["erreur"]
+    assert etat["reprises"] == MAX_REPRISES + 1
+
+
+def test_reprise_depuis_le_partiel():
+    job_orphelin("interrompu", partiel={"0": 0, "1": 1})
+    appels = []
+
+    def comptage_trace(parametres, ctx):
+        appels.append(dict(ctx.partiel))
+        return tache_comptage(parametres, ctx)
+
+    enregistrer_tache("comptage", comptage_trace)
+    try:
+        reprendre_jobs()
+        etat = attendre_fin("interrompu")
+    finally:
+        enregistrer_tache("comptage", tache_comptage)
+    assert appels == [{"0": 0, "1": 1}]
+    assert etat["statut"] == "termine" and etat["resultat"] == 14 and etat["reprises"] == 1
+
+
+def test_parcours_du_disque_espace():
+    job_orphelin("plus_tard")
+    utils_jobs._derniere_reprise[0] = time.time()
+    reprendre_jobs()
+    assert _charger("plus_tard")["reprises"] == 0
@@ -0,0 +1,63 @@
+"""Césure des lignes des PDF générés (utils_mise_en_page)."""
+
+import pytest
+
+import utils_mise_en_page
+from utils_mise_en_page import MiseEnPage
+
+
+@pytest.fixture
+def page():
+    # Police à chasse fixe : un caractère = une unité de largeur
+    return MiseEnPage("test", 10, largeur_fn=len)
+
+
+def test_lignes_remplies_sans_depasser(page):
+    lignes = page.couper_paragraphe("aa bbb c dddd ee f", 8)
+    assert lignes == ["aa bbb c", "dddd ee", "f"]
+    assert all(page.largeur_texte(l) <= 8 for l in lignes)
+
+
+def test_largeur_exacte_acceptee(page):
+    assert page.couper_paragraphe("abc def", 7) == ["abc def"]
+    assert page.couper_paragraphe("abc def", 6) == ["abc", "def"]
+
+
+def test_mot_plus_large_que_la_ligne_coupe(page):
+    lignes = page.couper_paragraphe("x https://exemple.org/tres/long y", 10)
+    assert lignes == ["x", "https://ex", "emple.org/", "tres/long", "y"]
+    assert all(len(l) <= 10 for l in lignes)
+
+
+def test_espaces_multiples_normalises(page):
+    assert page.couper_paragraphe("  a \t b  ", 20) == ["a b"]
+
+
+def test_document_et_sauts_de_paragraphe(page):
+    assert page.couper_document("aa bb\n\ncc\n  \ndd ee ff", 5) == ["aa bb", None, "cc", None, "dd ee", "ff"]
+
+
+def test_largeur_texte_cumulee(page):
+    assert page.largeur_texte("ab cde") == 6
+    assert page.largeur_texte("") == 0
+
+
+def test_cache_des_largeurs_borne(monkeypatch):
+    appels = []
+    page = MiseEnPage("test", 10, largeur_fn=lambda t: appels.append(t) or len(t))
+    page.couper_paragraphe("mot mot mot", 100)
+    assert appels.count("mot") == 1
+
+    monkeypatch.setattr(utils_mise_en_page, "MAX_MOTS_CACHE", 3)
+    page.couper_paragraphe("a b c d", 100)
+    assert len(page._cache) <= 3
+
+
+def test_largeurs_reportlab():
+    pytest.importorskip("reportlab")
+    page = MiseEnPage("Helvetica", 10)
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+    ligne = "Endometriosis and chronic pelvic pain"
+    assert page.largeur_texte(ligne) == pytest.approx(stringWidth(ligne, "Helvetica", 10))
+    for l in page.couper_paragraphe(ligne * 5, 120):
+        assert stringWidth(l, "Helvetica", 10) <= 120 + 1e-6
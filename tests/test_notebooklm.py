@@ -0,0 +1,71 @@
+"""Découpage de l'export NotebookLM en sources (utils_notebooklm)."""
+
+import io
+import json
+import zipfile
+
+from utils_notebooklm import ExportNotebookLM
+
+
+def exporter(sections, **limites):
+    flux = io.BytesIO()
+    export = ExportNotebookLM(flux, **limites)
+    for texte, pmid in sections:
+        export.ajouter_section(texte, pmid)
+    manifeste = export.fermer()
+    archive = zipfile.ZipFile(io.BytesIO(flux.getvalue()))
+    fichiers = {nom: archive.read(nom).decode("utf-8") for nom in archive.namelist()}
+    return manifeste, fichiers
+
+
+def mots(n, prefixe="m"):
+    return " ".join(f"{prefixe}{i}" for i in range(n))
+
+
+def test_une_seule_source_sous_les_limites():
+    manifeste, fichiers = exporter([("Article A\n", "1"), ("Article B\n", "2")], entete="Veille\n")
+    assert sorted(fichiers) == ["manifest.json", "podcast_01.txt"]
+    assert fichiers["podcast_01.txt"] == "Veille\nArticle A\nArticle B\n"
+    assert manifeste["fichiers"][0]["pmids"] == ["1", "2"]
+    assert json.loads(fichiers["manifest.json"]) == manifeste
+
+
+def test_nouvelle_source_quand_la_section_ne_tient_plus():
+    sections = [(mots(6, "a") + "\n", "1"), (mots(6, "b") + "\n", "2"), (mots(3, "c") + "\n", "3")]
+    manifeste, fichiers = exporter(sections, max_mots=10)
+    assert [f["pmids"] for f in manifeste["fichiers"]] == [["1"], ["2", "3"]]
+    # Un article qui tient dans une source n'est jamais coupé
+    assert fichiers["podcast_01.txt"] == sections[0][0]
+    assert fichiers["podcast_02.txt"] == sections[1][0] + sections[2][0]
+
+
+def test_section_trop_grande_coupee_entre_paragraphes():
+    paragraphes = [mots(4, f"p{i}_") + "\n\n" for i in range(6)]
+    texte = "".join(paragraphes)
+    manifeste, fichiers = exporter([(texte, "9")], max_mots=10)
+    sources = [fichiers[f["fichier"]] for f in manifeste["fichiers"]]
+    assert len(sources) > 1
+    assert "".join(sources) == texte
+    for f in manifeste["fichiers"]:
+        assert f["mots"] <= 10 and f["pmids"] == ["9"]
+
+
+def test_paragraphe_demesure_coupe_entre_mots_sans_fusion():
+    texte = mots(45)
+    manifeste, fichiers = exporter([(texte, "7")], max_mots=10)
+    reconstitue = "".join(fichiers[f["fichier"]] for f in manifeste["fichiers"])
+    assert reconstitue.split() == texte.split()
+    assert all(f["mots"] <= 10 for f in manifeste["fichiers"])
+
+
+def test_limite_en_octets():
+    section = "é" * 40 + "\n"
+    manifeste, fichiers = exporter([(section, "1"), (section, "2")], max_octets=100)
+    assert [f["pmids"] for f in manifeste["fichiers"]] == [["1"], ["2"]]
+    assert all(f["octets"] <= 100 for f in manifeste["fichiers"])
+
+
+def test_export_vide():
+    manifeste, fichiers = exporter([])
+    assert fichiers["podcast_01.txt"] == ""
+    assert manifeste["fichiers"][0]["pmids"] == []
@@ -0,0 +1,66 @@
+"""Attribution des glyphes en sous-ensembles 8 bits (utils_polices)."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from utils_polices import JeuGlyphes
+
+
+def face(*caracteres):
+    """Face TTF factice : ASCII imprimable + les caractères donnés."""
+    codes = list(range(32, 127)) + [ord(c) for c in caracteres]
+    return SimpleNamespace(charToGlyph={c: i for i, c in enumerate(codes)})
+
+
+def test_ascii_garde_sa_place():
+    jeu = JeuGlyphes(face())
+    assert jeu.encoder("Hello") == [(0, b"Hello")]
+
+
+def test_caracteres_hors_ascii_dans_les_codes_libres():
+    jeu = JeuGlyphes(face("≥", "µ"))
+    assert jeu.encoder("a≥µ≥") == [(0, b"a\x01\x02\x01")]
+    assert jeu.sous_ensembles[0][1:3] == [ord("≥"), ord("µ")]
+
+
+def test_glyphe_absent_remplace():
+    jeu = JeuGlyphes(face())
+    assert jeu.encoder("β") == [(0, b"?")]
+
+
+def test_nouveau_sous_ensemble_quand_le_premier_est_plein():
+    # 31 codes de contrôle + 128 codes hauts libres dans le sous-ensemble 0
+    symboles = [chr(0x4E00 + i) for i in range(128 + 31 + 2)]
+    jeu = JeuGlyphes(face(*symboles))
+    segments = jeu.encoder("".join(symboles) + "a")
+    assert [n for n, _ in segments] == [0, 1, 0]
+    assert segments[1] == (1, b"\x01\x02")
+    assert len(jeu.sous_ensembles[0]) == 256
+    assert jeu.sous_ensembles[1] == [0, ord(symboles[-2]), ord(symboles[-1])]
+
+
+def test_sous_ensembles_plafonnes_a_256():
+    symboles = [chr(0x4E00 + i) for i in range(128 + 31 + 255 + 1)]
+    jeu = JeuGlyphes(face(*symboles))
+    jeu.encoder("".join(symboles))
+    assert [len(s) for s in jeu.sous_ensembles] == [256, 256, 2]
+
+
+def test_attribution_stable_entre_appels():
+    jeu = JeuGlyphes(face("±"))
+    assert jeu.encoder("±") == jeu.encoder("±") == [(0, b"\x01")]
+
+
+def test_sous_ensemble_ttf_reel():
+    pytest.importorskip("reportlab")
+    from utils_polices import face_ttf, sous_ensemble_ttf
+
+    face_reelle = face_ttf("")
+    if face_reelle is None:
+        pytest.skip("aucune police TTF Unicode installée")
+    jeu = JeuGlyphes(face_reelle)
+    jeu.encoder("p ≥ 0,05 ; 5 µg")
+    ttf = sous_ensemble_ttf("", tuple(jeu.sous_ensembles[0]))
+    assert ttf[:4] in (b"\x00\x01\x00\x00", b"true")
+    assert sous_ensemble_ttf("", tuple(jeu.sous_ensembles[0])) is ttf
@@ -0,0 +1,65 @@
+"""Forme canonique des requêtes PubMed et pagination esearch (utils_recherche)."""
+
+import utils_recherche
+from utils_recherche import charger_plus, cle_recherche, rechercher, requete_canonique
+
+
+def test_espaces_et_parentheses_superflues():
+    assert requete_canonique("  (asthma)   AND  ((children)) ") == "asthma AND children"
+
+
+def test_union_triee_et_dedoublonnee():
+    assert requete_canonique("(b OR a OR b) AND c") == "(a OR b) AND c"
+    assert cle_recherche("x AND (b OR a)") == cle_recherche("x AND (a OR b)")
+
+
+def test_ordre_conserve_hors_union():
+    # PubMed évalue de gauche à droite : AND / NOT ne commutent pas dans la forme canonique
+    assert requete_canonique("b NOT a") == "b NOT a"
+    assert cle_recherche("a AND b") != cle_recherche("b AND a")
+
+
+def test_etiquette_de_champ_collee_au_terme():
+    assert requete_canonique('Endometriosis [ MeSH  Terms ] OR "pelvic pain"') == \
+        '"pelvic pain" OR Endometriosis[MeSH Terms]'
+
+
+def test_requete_mal_formee_seulement_normalisee():
+    assert requete_canonique("(a OR  b") == "(a OR b"
+    assert requete_canonique("a AND") == "a AND"
+
+
+def test_tri_dans_la_cle():
+    assert cle_recherche("a", "pub_date") != cle_recherche("a")
+
+
+def test_charger_plus_ne_demande_que_la_suite(monkeypatch):
+    tous = [str(i) for i in range(1, 121)]
+    appels = []
+
+    def esearch(requete, retstart, retmax, tri=None, webenv=None):
+        appels.append((retstart, retmax, webenv))
+        return {"count": str(len(tous)), "idlist": tous[retstart:retstart + retmax],
+                "webenv": "W1", "querykey": "1"}
+
+    monkeypatch.setattr(utils_recherche, "_esearch", esearch)
+
+    resultat, erreur = rechercher("asthma AND children", 50)
+    assert erreur is None and resultat["ids"] == tous[:50]
+
+    resultat, nouveaux, erreur = charger_plus(resultat, par_page=50)
+    assert nouveaux == tous[50:100]
+    assert appels == [(0, 50, None), (50, 50, "W1")]
+
+    # Requête équivalente : servie par le cache, aucun appel
+    resultat, erreur = rechercher("asthma  AND (children)", 80)
+    assert len(resultat["ids"]) == 100 and len(appels) == 2
+
+
+def test_erreur_esearch(monkeypatch):
+    def esearch(*args, **kwargs):
+        raise OSError("réseau coupé")
+
+    monkeypatch.setattr(utils_recherche, "_esearch", esearch)
+    resultat, erreur = rechercher("asthma", 10)
+    assert resultat is None and "réseau coupé" in erreur
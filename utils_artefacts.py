@@ -0,0 +1,216 @@
+# ============================================
+# STOCKAGE ET SERVICE DES FICHIERS GÉNÉRÉS
+# ============================================
+
+"""
+Les fichiers générés (PDF traduits, exports NotebookLM...) sont écrits une
+seule fois dans un stockage sur disque, adressé par contenu, puis servis
+par un petit serveur HTTP statique (thread démon) via des liens signés
+(HMAC) à durée de vie courte.
+
+Remplace les liens data:...;base64 : plus de +33 % de charge, plus de
+fichier entier renvoyé par le websocket Streamlit à chaque rerun. Le lien
+iOS devient un simple <a href>.
+
+Configuration :
+- VEILLE_ARTEFACTS_URL : URL publique du serveur (derrière un proxy) ;
+- VEILLE_ARTEFACTS_SECRET : clé de signature, partagée par tous les
+  workers (les liens survivent aux redémarrages) ;
+- VEILLE_ARTEFACTS_PORT : port d'écoute (8502 par défaut) ;
+- VEILLE_ARTEFACTS_HOTE : adresse d'écoute (0.0.0.0 si une URL publique
+  est configurée, 127.0.0.1 sinon).
+
+Les liens signés ne sont produits que si l'URL publique et le secret sont
+configurés : un lien http://localhost:... serait mort pour tout autre
+poste que le serveur. Sinon publier_artefact() renvoie "" et les apps
+gardent le téléchargement direct.
+"""
+
+import hashlib
+import hmac
+import json
+import mimetypes
+import os
+import re
+import shutil
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, urlparse
+
+from config_stockage import chemin_donnees
+
+DOSSIER_ARTEFACTS = "artefacts"
+DUREE_LIEN = 15 * 60                # validité d'un lien signé (secondes)
+DUREE_CONSERVATION = 24 * 60 * 60   # au-delà, les fichiers sont purgés
+PORT_ARTEFACTS = int(os.getenv("VEILLE_ARTEFACTS_PORT", "8502"))
+URL_ARTEFACTS = os.getenv("VEILLE_ARTEFACTS_URL", "").rstrip("/")
+HOTE_ARTEFACTS = os.getenv("VEILLE_ARTEFACTS_HOTE", "0.0.0.0" if URL_ARTEFACTS else "127.0.0.1")
+SECRET_ARTEFACTS = os.getenv("VEILLE_ARTEFACTS_SECRET", "").encode()
+LIENS_SIGNES_ACTIFS = bool(URL_ARTEFACTS and SECRET_ARTEFACTS)
+
+ID_RE = re.compile(r"^[0-9a-f]{32}$")
+
+_verrou = threading.Lock()
+_serveur = None
+_derniere_purge = 0.0
+
+
+# ============================================
+# STOCKAGE SUR DISQUE
+# ============================================
+
+def _chemin_artefact(id_artefact: str) -> str:
+    return chemin_donnees(DOSSIER_ARTEFACTS, id_artefact)
+
+
+def _purger_anciens(maintenant: float):
+    """Supprime les fichiers non réécrits depuis DUREE_CONSERVATION (au plus une fois par heure)."""
+    global _derniere_purge
+    if maintenant - _derniere_purge < 3600:
+        return
+    _derniere_purge = maintenant
+    dossier = os.path.dirname(_chemin_artefact("x"))
+    for nom in os.listdir(dossier):
+        chemin = os.path.join(dossier, nom)
+        try:
+            if maintenant - os.path.getmtime(chemin) > DUREE_CONSERVATION:
+                os.remove(chemin)
+        except OSError:
+            pass
+
+
+def stocker_artefact(contenu, mime: str = "") -> str:
+    """
+    Écrit le contenu (bytes ou str UTF-8) dans le stockage et renvoie son
+    identifiant. Un contenu identique n'est écrit qu'une fois.
+    """
+    if isinstance(contenu, str):
+        contenu = contenu.encode("utf-8")
+    id_artefact = hashlib.sha256(contenu).hexdigest()[:32]
+    chemin = _chemin_artefact(id_artefact)
+    maintenant = time.time()
+
+    if os.path.exists(chemin):
+        os.utime(chemin, (maintenant, maintenant))
+    else:
+        temporaire = f"{chemin}.{os.getpid()}.tmp"
+        with open(temporaire, "wb") as f:
+            f.write(contenu)
+        with open(temporaire + ".json", "w", encoding="utf-8") as f:
+            json.dump({"mime": mime or "application/octet-stream"}, f)
+        os.replace(temporaire + ".json", chemin + ".json")
+        os.replace(temporaire, chemin)
+
+    _purger_anciens(maintenant)
+    return id_artefact
+
+
+def lire_artefact(id_artefact: str):
+    """Contenu (bytes) d'un artefact, ou None s'il est inconnu ou déjà purgé."""
+    if not id_artefact or not ID_RE.match(id_artefact):
+        return None
+    try:
+        with open(_chemin_artefact(id_artefact), "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _mime_artefact(id_artefact: str, nom_fichier: str) -> str:
+    try:
+        with open(_chemin_artefact(id_artefact) + ".json", encoding="utf-8") as f:
+            return json.load(f)["mime"]
+    except (OSError, ValueError, KeyError):
+        return mimetypes.guess_type(nom_fichier)[0] or "application/octet-stream"
+
+
+# ============================================
+# LIENS SIGNÉS
+# ============================================
+
+def _signature(id_artefact: str, nom_fichier: str, expiration: int) -> str:
+    if not SECRET_ARTEFACTS:
+        raise RuntimeError("VEILLE_ARTEFACTS_SECRET non configuré")
+    message = f"{id_artefact}|{nom_fichier}|{expiration}".encode("utf-8")
+    return hmac.new(SECRET_ARTEFACTS, message, hashlib.sha256).hexdigest()
+
+
+def lien_signe(id_artefact: str, nom_fichier: str, duree: int = DUREE_LIEN) -> str:
+    """URL temporaire de téléchargement d'un artefact."""
+    expiration = int(time.time()) + duree
+    sig = _signature(id_artefact, nom_fichier, expiration)
+    return f"{URL_ARTEFACTS}/a/{id_artefact}?n={quote(nom_fichier)}&e={expiration}&s={sig}"
+
+
+def verifier_lien(id_artefact: str, nom_fichier: str, expiration: str, sig: str) -> bool:
+    """Signature valide et lien non expiré."""
+    if not ID_RE.match(id_artefact) or not expiration.isdigit():
+        return False
+    if int(expiration) < time.time() or not SECRET_ARTEFACTS:
+        return False
+    return hmac.compare_digest(_signature(id_artefact, nom_fichier, int(expiration)), sig)
+
+
+# ============================================
+# SERVEUR STATIQUE
+# ============================================
+
+class _GestionnaireArtefacts(BaseHTTPRequestHandler):
+    """Sert /a/<id>?n=<nom>&e=<expiration>&s=<signature>, rien d'autre."""
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        id_artefact = url.path[len("/a/"):] if url.path.startswith("/a/") else ""
+        nom_fichier = os.path.basename(params.get("n", "")) or "fichier"
+
+        if not verifier_lien(id_artefact, nom_fichier, params.get("e", ""), params.get("s", "")):
+            self.send_error(403, "Lien invalide ou expiré")
+            return
+
+        chemin = _chemin_artefact(id_artefact)
+        try:
+            f = open(chemin, "rb")
+        except OSError:
+            self.send_error(404, "Fichier expiré")
+            return
+
+        with f:
+            self.send_response(200)
+            self.send_header("Content-Type", _mime_artefact(id_artefact, nom_fichier))
+            self.send_header("Content-Length", str(os.fstat(f.fileno()).st_size))
+            self.send_header("Content-Disposition", f"attachment; filename*=UTF-8''{quote(nom_fichier)}")
+            self.send_header("Cache-Control", "private, max-age=0, no-store")
+            self.end_headers()
+            shutil.copyfileobj(f, self.wfile)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def demarrer_serveur_artefacts() -> bool:
+    """Démarre le serveur (une seule fois par processus). False si le port est indisponible."""
+    global _serveur
+    with _verrou:
+        if _serveur is None:
+            try:
+                _serveur = ThreadingHTTPServer((HOTE_ARTEFACTS, PORT_ARTEFACTS), _GestionnaireArtefacts)
+            except OSError:
+                _serveur = False
+                return False
+            _serveur.daemon_threads = True
+            threading.Thread(target=_serveur.serve_forever, name="serveur-artefacts", daemon=True).start()
+        return bool(_serveur)
+
+
+def publier_artefact(contenu, nom_fichier: str, mime: str = "") -> str:
+    """
+    Stocke le contenu et renvoie un lien signé, ou "" si les liens signés ne
+    sont pas configurés (URL publique + secret) ou si le serveur n'a pas pu
+    démarrer : l'appelant garde alors son téléchargement direct.
+    """
+    if not LIENS_SIGNES_ACTIFS or not demarrer_serveur_artefacts():
+        return ""
+    id_artefact = stocker_artefact(contenu, mime or mimetypes.guess_type(nom_fichier)[0] or "")
+    return lien_signe(id_artefact, nom_fichier)
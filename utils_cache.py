@@ -0,0 +1,258 @@
+# ============================================
+# CACHE PARTAGÉ BORNÉ (MÉMOIRE OU DISQUE)
+# ============================================
+
+"""
+Couche de cache commune aux apps, en remplacement des @st.cache_data sans
+limite (la mémoire croissait jusqu'à l'arrêt du conteneur).
+
+- Espaces de noms (recherche, metadonnees, traduction, pdf), chacun avec
+  sa durée de vie et son budget en octets.
+- Les valeurs sont sérialisées (pickle) : leur taille est comptée
+  exactement et chaque lecture renvoie une copie, comme st.cache_data.
+- Éviction LRU quand le budget est dépassé, expiration TTL.
+- Compteurs de succès / échecs / évictions par espace de noms.
+- Backend mémoire (par processus) ou disque (SQLite dans les données
+  locales, partagé par tous les workers de la machine) :
+  VEILLE_CACHE_BACKEND=memoire|disque.
+"""
+
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache, wraps
+
+from config_stockage import chemin_donnees
+
+# Espace de noms -> (durée de vie en secondes, budget en octets)
+ESPACES_CACHE = {
+    "recherche": (60 * 60, 8 * 1024 * 1024),
+    "metadonnees": (7 * 24 * 60 * 60, 64 * 1024 * 1024),
+    "traduction": (30 * 24 * 60 * 60, 64 * 1024 * 1024),
+    "resumes": (30 * 24 * 60 * 60, 32 * 1024 * 1024),
+    "pdf": (24 * 60 * 60, 128 * 1024 * 1024),
+    "fragments_export": (24 * 60 * 60, 32 * 1024 * 1024),
+    "exports": (24 * 60 * 60, 32 * 1024 * 1024),
+}
+ESPACE_DEFAUT = (60 * 60, 16 * 1024 * 1024)
+
+BACKEND_CACHE = os.getenv("VEILLE_CACHE_BACKEND", "memoire")
+FICHIER_CACHE = "cache.sqlite"
+
+
+# ============================================
+# BACKENDS
+# ============================================
+
+class BackendMemoire:
+    """Cache en mémoire du processus : un OrderedDict LRU par espace de noms."""
+
+    def __init__(self):
+        self._espaces = {}
+        self._octets = {}
+        self._verrou = threading.Lock()
+
+    def lire(self, espace: str, cle: str):
+        with self._verrou:
+            entrees = self._espaces.get(espace)
+            if not entrees or cle not in entrees:
+                return None
+            expiration, data = entrees[cle]
+            if expiration < time.time():
+                del entrees[cle]
+                self._octets[espace] -= len(data)
+                return None
+            entrees.move_to_end(cle)
+            return data
+
+    def ecrire(self, espace: str, cle: str, data: bytes, ttl: float, budget: int) -> int:
+        """Écrit une entrée et retourne le nombre d'entrées évincées."""
+        with self._verrou:
+            entrees = self._espaces.setdefault(espace, OrderedDict())
+            self._octets.setdefault(espace, 0)
+            if cle in entrees:
+                self._octets[espace] -= len(entrees.pop(cle)[1])
+            entrees[cle] = (time.time() + ttl, data)
+            self._octets[espace] += len(data)
+
+            evictions = 0
+            while self._octets[espace] > budget and len(entrees) > 1:
+                _, (_, ancien) = entrees.popitem(last=False)
+                self._octets[espace] -= len(ancien)
+                evictions += 1
+            return evictions
+
+    def taille(self, espace: str) -> tuple:
+        with self._verrou:
+            return len(self._espaces.get(espace, ())), self._octets.get(espace, 0)
+
+    def vider(self, espace: str = None):
+        with self._verrou:
+            for nom in ([espace] if espace else list(self._espaces)):
+                self._espaces.pop(nom, None)
+                self._octets.pop(nom, None)
+
+
+class BackendDisque:
+    """Cache SQLite partagé entre processus (LRU par date d'accès)."""
+
+    def __init__(self, chemin: str = None):
+        self.chemin = chemin or chemin_donnees(FICHIER_CACHE)
+        with self._connexion() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache (espace TEXT, cle TEXT, valeur BLOB, taille INTEGER, "
+                "expiration REAL, acces REAL, PRIMARY KEY (espace, cle))"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS cache_acces ON cache (espace, acces)")
+
+    def _connexion(self):
+        conn = sqlite3.connect(self.chemin, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def lire(self, espace: str, cle: str):
+        conn = self._connexion()
+        try:
+            with conn:
+                ligne = conn.execute(
+                    "SELECT valeur, expiration FROM cache WHERE espace = ? AND cle = ?", (espace, cle)
+                ).fetchone()
+                if ligne is None:
+                    return None
+                if ligne[1] < time.time():
+                    conn.execute("DELETE FROM cache WHERE espace = ? AND cle = ?", (espace, cle))
+                    return None
+                conn.execute("UPDATE cache SET acces = ? WHERE espace = ? AND cle = ?", (time.time(), espace, cle))
+                return ligne[0]
+        finally:
+            conn.close()
+
+    def ecrire(self, espace: str, cle: str, data: bytes, ttl: float, budget: int) -> int:
+        maintenant = time.time()
+        conn = self._connexion()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?, ?)",
+                    (espace, cle, data, len(data), maintenant + ttl, maintenant)
+                )
+                conn.execute("DELETE FROM cache WHERE espace = ? AND expiration < ?", (espace, maintenant))
+                total = conn.execute("SELECT COALESCE(SUM(taille), 0) FROM cache WHERE espace = ?", (espace,)).fetchone()[0]
+                evictions = 0
+                if total > budget:
+                    for ancienne_cle, taille in conn.execute(
+                        "SELECT cle, taille FROM cache WHERE espace = ? AND cle != ? ORDER BY acces", (espace, cle)
+                    ).fetchall():
+                        if total <= budget:
+                            break
+                        conn.execute("DELETE FROM cache WHERE espace = ? AND cle = ?", (espace, ancienne_cle))
+                        total -= taille
+                        evictions += 1
+                return evictions
+        finally:
+            conn.close()
+
+    def taille(self, espace: str) -> tuple:
+        conn = self._connexion()
+        try:
+            return tuple(conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(taille), 0) FROM cache WHERE espace = ?", (espace,)
+            ).fetchone())
+        finally:
+            conn.close()
+
+    def vider(self, espace: str = None):
+        conn = self._connexion()
+        try:
+            with conn:
+                if espace:
+                    conn.execute("DELETE FROM cache WHERE espace = ?", (espace,))
+                else:
+                    conn.execute("DELETE FROM cache")
+        finally:
+            conn.close()
+
+
+# ============================================
+# CACHE
+# ============================================
+
+class CachePartage:
+    """Accès au backend par espace de noms, avec compteurs de succès / échecs."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.compteurs = {}
+        self._verrou = threading.Lock()
+
+    def _compter(self, espace: str, compteur: str, n: int = 1):
+        with self._verrou:
+            stats = self.compteurs.setdefault(espace, {"succes": 0, "echecs": 0, "evictions": 0})
+            stats[compteur] += n
+
+    def lire(self, espace: str, cle: str, defaut=None):
+        data = self.backend.lire(espace, cle)
+        if data is None:
+            self._compter(espace, "echecs")
+            return defaut
+        self._compter(espace, "succes")
+        return pickle.loads(data)
+
+    def ecrire(self, espace: str, cle: str, valeur):
+        ttl, budget = ESPACES_CACHE.get(espace, ESPACE_DEFAUT)
+        evictions = self.backend.ecrire(espace, cle, pickle.dumps(valeur, pickle.HIGHEST_PROTOCOL), ttl, budget)
+        if evictions:
+            self._compter(espace, "evictions", evictions)
+
+    def statistiques(self) -> dict:
+        """Par espace de noms : entrées, octets, succès, échecs, évictions."""
+        stats = {}
+        for espace in sorted(set(ESPACES_CACHE) | set(self.compteurs)):
+            entrees, octets = self.backend.taille(espace)
+            stats[espace] = {"entrees": entrees, "octets": octets,
+                             **self.compteurs.get(espace, {"succes": 0, "echecs": 0, "evictions": 0})}
+        return stats
+
+    def vider(self, espace: str = None):
+        self.backend.vider(espace)
+
+
+@lru_cache(maxsize=None)
+def cache_partage() -> CachePartage:
+    """Cache du processus (backend choisi par VEILLE_CACHE_BACKEND)."""
+    backend = BackendDisque() if BACKEND_CACHE == "disque" else BackendMemoire()
+    return CachePartage(backend)
+
+
+_MANQUANT = object()
+
+
+def memoiser(espace: str, cacher_si=None):
+    """
+    Décorateur : mémoïse la fonction dans l'espace de noms donné. La clé est
+    l'empreinte du nom de la fonction et de ses arguments. cacher_si(valeur)
+    permet de ne pas garder un résultat (ex. liste vide après une erreur).
+    """
+    def decorateur(fonction):
+        nom = f"{fonction.__module__}.{fonction.__qualname__}"
+
+        @wraps(fonction)
+        def enveloppe(*args, **kwargs):
+            cle = hashlib.sha256(
+                pickle.dumps((nom, args, sorted(kwargs.items())), pickle.HIGHEST_PROTOCOL)
+            ).hexdigest()
+            cache = cache_partage()
+            valeur = cache.lire(espace, cle, _MANQUANT)
+            if valeur is not _MANQUANT:
+                return valeur
+            valeur = fonction(*args, **kwargs)
+            if cacher_si is None or cacher_si(valeur):
+                cache.ecrire(espace, cle, valeur)
+            return valeur
+
+        return enveloppe
+    return decorateur
@@ -0,0 +1,120 @@
+# ============================================
+# CACHE DES EXPORTS (PDF / NOTEBOOKLM)
+# ============================================
+
+"""
+Mémoïsation des exports de la sélection finale.
+
+Chaque case cochée relance le script Streamlit : sans cache, le PDF et
+l'export NotebookLM étaient entièrement régénérés à chaque clic.
+
+- Fragments par article (pages PDF mises en page, bloc NotebookLM), indexés
+  par PMID + empreinte du contenu : cocher/décocher un article ne fait que
+  réassembler des fragments déjà calculés.
+- Exports complets indexés par la sélection ordonnée des PMID et leurs
+  empreintes : un simple rerun ne recalcule rien.
+
+Les deux niveaux sont stockés dans le cache partagé (utils_cache, espaces
+"fragments_export" et "exports") : budget en octets et éviction LRU.
+"""
+
+import hashlib
+import io
+import pickle
+from datetime import datetime
+
+from utils_cache import cache_partage
+from utils_export_pdf import ecrire_digest_pdf, fragment_article_pdf
+from utils_notebooklm import ExportNotebookLM
+
+# Champs dont dépend le rendu d'un article
+CHAMPS_RENDU = ("pmid", "title_fr", "title", "journal", "year", "pdf_texte_fr")
+
+ESPACE_FRAGMENTS = "fragments_export"
+ESPACE_EXPORTS = "exports"
+
+_MANQUANT = object()
+
+
+def _obtenir(espace: str, cle: tuple, calcul):
+    """Valeur du cache partagé (budget en octets de l'espace), ou calcul() mémorisé."""
+    empreinte = hashlib.sha256(pickle.dumps(cle, pickle.HIGHEST_PROTOCOL)).hexdigest()
+    cache = cache_partage()
+    valeur = cache.lire(espace, empreinte, _MANQUANT)
+    if valeur is _MANQUANT:
+        valeur = calcul()
+        cache.ecrire(espace, empreinte, valeur)
+    return valeur
+
+
+def version_article(article) -> str:
+    """Empreinte du contenu rendu d'un article."""
+    h = hashlib.sha1()
+    for champ in CHAMPS_RENDU:
+        h.update(str(article.get(champ, "")).encode("utf-8", "replace"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def cle_selection(articles) -> tuple:
+    """Sélection ordonnée (PMID, empreinte) : clé des exports complets."""
+    return tuple((article["pmid"], version_article(article)) for article in articles)
+
+
+def fragment_pdf(article) -> tuple:
+    """Pages PDF d'un article (en cache)."""
+    return _obtenir(
+        ESPACE_FRAGMENTS, ("pdf", article["pmid"], version_article(article)),
+        lambda: fragment_article_pdf(article)
+    )
+
+
+def fragment_notebooklm(article) -> str:
+    """Bloc NotebookLM d'un article, sans son numéro (en cache)."""
+    return _obtenir(
+        ESPACE_FRAGMENTS, ("notebooklm", article["pmid"], version_article(article)),
+        lambda: f"""Titre: {article['title_fr']}
+Journal: {article['journal']} ({article['year']})
+PMID: {article['pmid']}
+
+Contenu complet:
+{article.get('pdf_texte_fr', 'Non disponible')}
+
+---
+"""
+    )
+
+
+def export_pdf_selection(spec, periode, articles) -> bytes:
+    """Digest PDF de la sélection, assemblé à partir des fragments en cache."""
+    date_jour = datetime.now().strftime("%d/%m/%Y")
+
+    def assembler():
+        sortie = io.BytesIO()
+        ecrire_digest_pdf(sortie, spec, periode, articles, fragment_fn=fragment_pdf)
+        return sortie.getvalue()
+
+    return _obtenir(ESPACE_EXPORTS, ("pdf", spec, periode, date_jour, cle_selection(articles)), assembler)
+
+
+def export_notebooklm_selection(articles) -> tuple:
+    """
+    Export NotebookLM de la sélection (zip de sources découpées + manifeste),
+    assemblé à partir des fragments en cache. Retourne (zip, manifeste).
+    """
+    date_jour = datetime.now().strftime("%d/%m/%Y")
+
+    def assembler():
+        sortie = io.BytesIO()
+        export = ExportNotebookLM(sortie, entete=f"""# VEILLE MEDICALE - PODCAST
+Date: {date_jour}
+
+## ARTICLES SELECTIONNES
+
+""")
+        for i, article in enumerate(articles, 1):
+            export.ajouter_section(f"\n### Article {i}\n" + fragment_notebooklm(article), article["pmid"])
+        manifeste = export.fermer()
+        return sortie.getvalue(), manifeste
+
+    return _obtenir(ESPACE_EXPORTS, ("notebooklm", date_jour, cle_selection(articles)), assembler)
@@ -0,0 +1,100 @@
+# ============================================
+# CHARGEMENT DIFFÉRÉ DES DÉPENDANCES LOURDES
+# ============================================
+
+"""
+Les SDK des fournisseurs (google.generativeai, anthropic) et les
+bibliothèques PDF (reportlab, pypdf) coûtent plusieurs centaines de
+millisecondes à importer. Ils ne sont plus chargés au démarrage des apps
+mais au premier usage réel (traduction, export, extraction).
+
+- differe("module") renvoie un module différé : l'import a lieu au premier
+  accès à un attribut, et sa durée est notée dans TEMPS_CHARGEMENT
+  (affichée en mode debug).
+- profil_imports_a_froid() mesure le coût d'import de chaque module dans
+  un interpréteur neuf (python -X importtime), pour le profil de démarrage
+  (voir benchmarks/profil_demarrage.py).
+"""
+
+import importlib
+import re
+import subprocess
+import sys
+import time
+
+# Module -> durée de son premier chargement (secondes)
+TEMPS_CHARGEMENT = {}
+
+IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+class ModuleDiffere:
+    """Module importé au premier accès à l'un de ses attributs."""
+
+    def __init__(self, nom: str):
+        self._nom = nom
+        self._module = None
+
+    def _charger(self):
+        if self._module is None:
+            debut = time.perf_counter()
+            self._module = importlib.import_module(self._nom)
+            TEMPS_CHARGEMENT.setdefault(self._nom, time.perf_counter() - debut)
+        return self._module
+
+    def __getattr__(self, attribut):
+        return getattr(self._charger(), attribut)
+
+    def __repr__(self):
+        etat = "chargé" if self._module is not None else "non chargé"
+        return f"<module différé {self._nom} ({etat})>"
+
+
+def differe(nom: str) -> ModuleDiffere:
+    return ModuleDiffere(nom)
+
+
+def profil_imports_a_froid(modules, executable: str = None) -> list:
+    """
+    Coût d'import de chaque module dans un processus Python neuf.
+    Retourne [(module, ms cumulées, [(sous-module, ms)...] les plus coûteux)],
+    trié du plus lent au plus rapide ; ms = None si l'import échoue.
+    """
+    def imports_directs(code):
+        proc = subprocess.run(
+            [executable or sys.executable, "-X", "importtime", "-c", code],
+            capture_output=True, text=True
+        )
+        if proc.returncode != 0:
+            return None
+        # -X importtime écrit les sous-modules avant leur parent
+        directs, enfants = [], []
+        for ligne in proc.stderr.splitlines():
+            m = IMPORTTIME_RE.match(ligne)
+            if not m:
+                continue
+            mesure = (m.group(4), int(m.group(2)) / 1000)
+            if len(m.group(3)) <= 1:
+                directs.append((mesure, enfants))
+                enfants = []
+            elif len(m.group(3)) == 3:
+                enfants.append(mesure)
+        return directs
+
+    # Modules chargés par l'interpréteur lui-même (site, encodings...), exclus du profil
+    demarrage = {nom for (nom, _), _ in imports_directs("pass") or []}
+
+    resultats = []
+    for module in modules:
+        directs = imports_directs(f"import {module}")
+        if directs is None:
+            resultats.append((module, None, []))
+            continue
+
+        directs = [(mesure, enfants) for mesure, enfants in directs if mesure[0] not in demarrage]
+        total = sum(ms for (_, ms), _ in directs)
+        details = sorted((e for _, enfants in directs for e in enfants), key=lambda d: -d[1])
+        resultats.append((module, total, details[:5]))
+
+    resultats.sort(key=lambda r: -(r[1] or 0))
+    return resultats
@@ -0,0 +1,163 @@
+# ============================================
+# ENVOI DES E-MAILS (CONNEXION SMTP PERSISTANTE)
+# ============================================
+
+"""
+Diffusion des digests à de nombreux abonnés.
+
+- Une seule connexion SMTP authentifiée (STARTTLS + login une fois) pour
+  tous les messages ; reconnexion automatique si le serveur la coupe.
+- Nouvelle tentative par message (erreurs temporaires 4xx, déconnexion),
+  avec attente croissante. Seul un refus 5xx du destinataire (RCPT) est
+  définitif ; les autres échecs restent temporaires (renvoi à la prochaine
+  exécution).
+- Authentification ou expéditeur refusés (5xx) : aucun envoi ne peut
+  aboutir, EnvoiImpossible interrompt la diffusion.
+- Débit plafonné (VEILLE_SMTP_DEBIT messages par seconde).
+- Serveur configurable : VEILLE_SMTP_HOTE, VEILLE_SMTP_PORT,
+  VEILLE_SMTP_SECURITE (starttls | ssl | aucune).
+
+Test en local avec un serveur SMTP factice, par exemple aiosmtpd :
+    python -m aiosmtpd -n -l localhost:8025
+    VEILLE_SMTP_HOTE=localhost VEILLE_SMTP_PORT=8025 VEILLE_SMTP_SECURITE=aucune python alerte.py
+"""
+
+import os
+import smtplib
+import time
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+SMTP_HOTE = os.getenv("VEILLE_SMTP_HOTE", "smtp-relay.brevo.com")
+SMTP_PORT = int(os.getenv("VEILLE_SMTP_PORT", "587"))
+SMTP_SECURITE = os.getenv("VEILLE_SMTP_SECURITE", "starttls")
+DEBIT_MAX = float(os.getenv("VEILLE_SMTP_DEBIT", "5"))  # messages par seconde
+TENTATIVES = 3
+ATTENTE_TENTATIVE = 2.0  # secondes, doublée à chaque essai
+
+
+class EnvoiImpossible(RuntimeError):
+    """Échec commun à tous les envois (authentification, expéditeur refusé)."""
+
+
+def rendre_message(expediteur: str, sujet: str, corps: str) -> MIMEMultipart:
+    """Message construit une fois par profil d'abonné ; seul le destinataire change ensuite."""
+    msg = MIMEMultipart()
+    msg['From'] = expediteur
+    msg['Subject'] = sujet
+    msg.attach(MIMEText(corps, "plain"))
+    return msg
+
+
+class ConnexionSMTP:
+    """
+    Connexion SMTP réutilisée pour tous les envois :
+
+        with ConnexionSMTP(login, mot_de_passe) as smtp:
+            smtp.envoyer(message, destinataire)
+    """
+
+    def __init__(self, login=None, mot_de_passe=None, hote=SMTP_HOTE, port=SMTP_PORT,
+                 securite=SMTP_SECURITE, debit_max=DEBIT_MAX):
+        self.login = login
+        self.mot_de_passe = mot_de_passe
+        self.hote = hote
+        self.port = port
+        self.securite = securite
+        self.intervalle = 1.0 / debit_max if debit_max else 0.0
+        self.serveur = None
+        self._dernier_envoi = 0.0
+        self.stats = {"envoyes": 0, "echecs": 0, "tentatives": 0, "connexions": 0}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+    def connecter(self):
+        try:
+            if self.securite == "ssl":
+                self.serveur = smtplib.SMTP_SSL(self.hote, self.port, timeout=30)
+            else:
+                self.serveur = smtplib.SMTP(self.hote, self.port, timeout=30)
+                if self.securite == "starttls":
+                    self.serveur.starttls()
+            if self.login:
+                self.serveur.login(self.login, self.mot_de_passe)
+        except smtplib.SMTPAuthenticationError as e:
+            self._abandonner()
+            raise EnvoiImpossible(f"Authentification SMTP refusée : {e.smtp_code} {e.smtp_error!r}") from e
+        except BaseException:
+            self._abandonner()
+            raise
+        self.stats["connexions"] += 1
+
+    def _abandonner(self):
+        """Ferme sans QUIT une connexion inutilisable (prochain envoi : reconnexion)."""
+        if self.serveur is not None:
+            try:
+                self.serveur.close()
+            except OSError:
+                pass
+            self.serveur = None
+
+    def fermer(self):
+        if self.serveur is not None:
+            try:
+                self.serveur.quit()
+            except OSError:  # smtplib.SMTPException en dérive
+                pass
+            self.serveur = None
+
+    def _attendre_debit(self):
+        attente = self._dernier_envoi + self.intervalle - time.monotonic()
+        if attente > 0:
+            time.sleep(attente)
+        self._dernier_envoi = time.monotonic()
+
+    def envoyer(self, msg, destinataire: str):
+        """
+        Envoie le message à ce destinataire. Retourne (succès, erreur,
+        définitif) ; définitif = destinataire refusé (5xx), inutile de
+        réessayer lors d'une prochaine exécution. Lève EnvoiImpossible si
+        l'authentification ou l'expéditeur est refusé.
+        """
+        if msg['To'] is None:
+            msg['To'] = destinataire
+        else:
+            msg.replace_header('To', destinataire)
+
+        erreur, definitif = None, False
+        for essai in range(TENTATIVES):
+            self.stats["tentatives"] += 1
+            try:
+                if self.serveur is None:
+                    self.connecter()
+                self._attendre_debit()
+                self.serveur.send_message(msg, to_addrs=[destinataire])
+                self.stats["envoyes"] += 1
+                return True, None, False
+            except smtplib.SMTPRecipientsRefused as e:
+                code, reponse = next(iter(e.recipients.values()), (0, b""))
+                erreur = f"{code} {reponse!r}"
+                if code >= 500:
+                    definitif = True
+                    break
+            except smtplib.SMTPSenderRefused as e:
+                erreur = f"{e.smtp_code} {e.smtp_error!r}"
+                if e.smtp_code >= 500:
+                    raise EnvoiImpossible(f"Expéditeur {e.sender} refusé : {erreur}") from e
+            except smtplib.SMTPResponseException as e:
+                # Réponse 5xx au message (contenu refusé...) : pas de nouvel essai dans cette exécution
+                erreur = f"{e.smtp_code} {e.smtp_error!r}"
+                if not 400 <= e.smtp_code < 500:
+                    break
+            except (smtplib.SMTPServerDisconnected, OSError) as e:
+                erreur = str(e)
+                self._abandonner()
+            if essai < TENTATIVES - 1:
+                time.sleep(ATTENTE_TENTATIVE * 2 ** essai)
+
+        self.stats["echecs"] += 1
+        return False, erreur, definitif
@@ -0,0 +1,239 @@
+# ============================================
+# ENRICHISSEMENT DES RÉSULTATS (TRADUCTION PAR LOTS)
+# ============================================
+
+"""
+Étape d'enrichissement exécutée juste après la récupération des
+métadonnées PubMed : titres et abstracts de tout le jeu de résultats sont
+traduits par lots (plusieurs textes par appel fournisseur) et écrits dans
+les enregistrements (title_fr, abstract_fr). L'affichage lit ensuite
+directement ces champs.
+
+- Lots dimensionnés par fournisseur : DeepL accepte jusqu'à 50 textes par
+  requête ; Gemini reçoit des textes numérotés dans un seul prompt.
+- Cache de traductions persistant (SQLite, données locales) indexé par
+  fournisseur + texte : une recherche relancée ne retraduit rien. Chaque
+  traduction est enregistrée sous le fournisseur qui l'a produite.
+- Les textes d'un lot en échec passent au fournisseur de repli suivant,
+  redécoupés selon ses propres limites ; ceux qui restent sont retraduits
+  texte par texte (fonction de repli), sinon le texte anglais est conservé.
+"""
+
+import hashlib
+import re
+import sqlite3
+import threading
+
+import requests
+
+from config_services import URL_DEEPL, options_gemini
+from config_stockage import chemin_donnees
+
+FICHIER_CACHE_TRADUCTIONS = "traductions.sqlite"
+
+# Taille des lots (nombre de textes, caractères cumulés) par fournisseur
+LIMITES_LOTS = {
+    "deepl": (50, 100000),
+    "gemini": (25, 15000),
+}
+
+# Champ source -> champ traduit
+CHAMPS_ENRICHIS = (("title_en", "title_fr"), ("abstract_en", "abstract_fr"))
+
+BALISE_RE = re.compile(r"\[\[(\d+)\]\]\s*(.*?)(?=\[\[\d+\]\]|\Z)", re.DOTALL)
+
+_verrou_cache = threading.Lock()
+
+
+# ============================================
+# CACHE DE TRADUCTIONS
+# ============================================
+
+def _cle_traduction(fournisseur: str, texte: str) -> str:
+    return hashlib.sha1(f"{fournisseur}\0{texte}".encode("utf-8")).hexdigest()
+
+
+def _connexion():
+    conn = sqlite3.connect(chemin_donnees(FICHIER_CACHE_TRADUCTIONS), timeout=30)
+    conn.execute("CREATE TABLE IF NOT EXISTS traductions (cle TEXT PRIMARY KEY, traduction TEXT)")
+    return conn
+
+
+def lire_cache_traductions(cles: list) -> dict:
+    """Traductions en cache pour ces clés : {clé: traduction}."""
+    trouvees = {}
+    with _verrou_cache:
+        conn = _connexion()
+        try:
+            for debut in range(0, len(cles), 500):
+                paquet = cles[debut:debut + 500]
+                requete = "SELECT cle, traduction FROM traductions WHERE cle IN (%s)" % ",".join("?" * len(paquet))
+                trouvees.update(conn.execute(requete, paquet).fetchall())
+        finally:
+            conn.close()
+    return trouvees
+
+
+def ecrire_cache_traductions(traductions: dict):
+    """Enregistre {clé: traduction} dans le cache."""
+    if not traductions:
+        return
+    with _verrou_cache:
+        conn = _connexion()
+        try:
+            with conn:
+                conn.executemany("INSERT OR REPLACE INTO traductions VALUES (?, ?)", traductions.items())
+        finally:
+            conn.close()
+
+
+# ============================================
+# TRADUCTION PAR LOTS
+# ============================================
+
+def traduire_lot_deepl(textes: list, api_key: str) -> list:
+    """Un seul appel DeepL pour plusieurs textes (ordre conservé)."""
+    data = [("auth_key", api_key), ("target_lang", "FR"), ("source_lang", "EN"), ("formality", "more")]
+    data += [("text", t) for t in textes]
+    r = requests.post(URL_DEEPL, data=data, timeout=60)
+    r.raise_for_status()
+    traductions = [t["text"] for t in r.json()["translations"]]
+    if len(traductions) != len(textes):
+        raise ValueError(f"DeepL : {len(traductions)} traductions pour {len(textes)} textes")
+    return traductions
+
+
+def traduire_lot_gemini(textes: list, g_key: str, modele: str = "gemini-2.0-flash-exp") -> list:
+    """Un seul prompt Gemini pour plusieurs textes numérotés [[n]] (ordre conservé)."""
+    import google.generativeai as genai
+
+    genai.configure(api_key=g_key, **options_gemini())
+    model = genai.GenerativeModel(modele)
+
+    blocs = "\n\n".join(f"[[{i}]] {t}" for i, t in enumerate(textes, 1))
+    prompt = f"""Tu es un traducteur médical professionnel. Traduis en français médical professionnel chacun des {len(textes)} textes anglais numérotés ci-dessous.
+
+CONSIGNES STRICTES:
+- Réponds avec exactement {len(textes)} blocs, chacun précédé de sa balise [[n]] d'origine
+- Fournis UNIQUEMENT les traductions, sans préambule ni commentaire
+- Conserve la terminologie médicale exacte
+- Pas de formatage markdown
+
+TEXTES:
+{blocs}
+
+TRADUCTIONS:"""
+
+    resp = model.generate_content(prompt)
+    blocs_traduits = {int(n): t.strip().replace("**", "") for n, t in BALISE_RE.findall(resp.text)}
+    if sorted(blocs_traduits) != list(range(1, len(textes) + 1)):
+        raise ValueError(f"Gemini : {len(blocs_traduits)} blocs reçus pour {len(textes)} textes")
+    return [blocs_traduits[i] for i in range(1, len(textes) + 1)]
+
+
+def lots(textes: list, max_textes: int, max_caracteres: int):
+    """Découpe la liste en lots bornés en nombre de textes et en caractères."""
+    lot, taille = [], 0
+    for texte in textes:
+        if lot and (len(lot) >= max_textes or taille + len(texte) > max_caracteres):
+            yield lot
+            lot, taille = [], 0
+        lot.append(texte)
+        taille += len(texte)
+    if lot:
+        yield lot
+
+
+# ============================================
+# ÉTAPE D'ENRICHISSEMENT
+# ============================================
+
+def enrichir_articles(articles: list, traduire_lot, fournisseur: str = "gemini", champs=CHAMPS_ENRICHIS,
+                      traduire_un=None, post_traitement=None, progress_callback=None, replis=()) -> dict:
+    """
+    Remplit les champs traduits (title_fr, abstract_fr...) de tous les
+    articles, en place. Les textes identiques ne sont traduits qu'une fois.
+
+    traduire_lot(textes) -> traductions ; replis [(fournisseur, traduire_lot)]
+    reprennent, dans l'ordre, les textes que le fournisseur principal n'a
+    pas traduits ; traduire_un(texte) sert de dernier repli (résultat non
+    mis en cache : fournisseur inconnu). post_traitement {champ_fr: fonction}
+    nettoie le résultat (ex. nettoyer_titre). Retourne des statistiques.
+    """
+    post_traitement = post_traitement or {}
+    textes = []
+    for article in articles:
+        for champ_en, _ in champs:
+            texte = (article.get(champ_en) or "").strip()
+            if texte:
+                textes.append(texte)
+    textes = list(dict.fromkeys(textes))
+
+    chaine = [(fournisseur, traduire_lot)] + [r for r in replis if r[0] != fournisseur]
+    traductions = {}
+    for nom, _ in reversed(chaine):  # le fournisseur principal l'emporte
+        cles = {t: _cle_traduction(nom, t) for t in textes}
+        en_cache = lire_cache_traductions(list(cles.values()))
+        traductions.update({t: en_cache[cles[t]] for t in textes if cles[t] in en_cache})
+    restants = [t for t in textes if t not in traductions]
+
+    stats = {"textes": len(textes), "en_cache": len(traductions), "traduits": 0, "appels": 0, "echecs": 0}
+
+    def _accepter(texte, traduction, identique_valide=True) -> bool:
+        # Un fournisseur par lots lève une exception en cas d'échec : une traduction identique
+        # à l'original y est réelle (« COVID-19 », noms de gènes) et mise en cache. La fonction
+        # de repli texte par texte renvoie l'original en cas d'erreur : identique = échec.
+        traduction = (traduction or "").strip()
+        if traduction and (identique_valide or traduction != texte):
+            traductions[texte] = traduction
+            stats["traduits"] += 1
+            return True
+        return False
+
+    def _progresser():
+        if progress_callback:
+            progress_callback((stats["en_cache"] + stats["traduits"]) / max(1, len(textes)))
+
+    for nom, fonction in chaine:
+        if not restants:
+            break
+        echoues = []
+        max_textes, max_caracteres = LIMITES_LOTS.get(nom, LIMITES_LOTS["gemini"])
+        for lot in lots(restants, max_textes, max_caracteres):
+            stats["appels"] += 1
+            try:
+                resultats = fonction(lot)
+            except Exception:
+                echoues += lot
+                continue
+            nouvelles = {}
+            for texte, traduction in zip(lot, resultats):
+                if _accepter(texte, traduction):
+                    nouvelles[_cle_traduction(nom, texte)] = traductions[texte]
+                else:
+                    echoues.append(texte)
+            ecrire_cache_traductions(nouvelles)
+            _progresser()
+        restants = echoues
+
+    for texte in restants:
+        traduction = None
+        if traduire_un:
+            stats["appels"] += 1
+            try:
+                traduction = traduire_un(texte)
+            except Exception:
+                pass
+        if not _accepter(texte, traduction, identique_valide=False):
+            stats["echecs"] += 1
+    _progresser()
+
+    for article in articles:
+        for champ_en, champ_fr in champs:
+            texte = (article.get(champ_en) or "").strip()
+            valeur = traductions.get(texte, texte)
+            if champ_fr in post_traitement and valeur:
+                valeur = post_traitement[champ_fr](valeur)
+            article[champ_fr] = valeur
+
+    return stats
@@ -0,0 +1,373 @@
+# ============================================
+# DIGEST PDF ÉCRIT EN FLUX
+# ============================================
+
+"""
+Écriture d'un digest PDF multi-articles directement dans un fichier ou
+un flux binaire (socket, réponse HTTP, BytesIO).
+
+Chaque page est compressée et écrite dès qu'elle est terminée, et le flux
+est vidé après chaque article : la mémoire reste constante quel que soit
+le nombre d'articles, ce qui permet des digests nocturnes complets sans
+tronquer le texte. Seuls les numéros d'objets et leurs positions (quelques
+octets par page) sont conservés jusqu'à l'écriture de la table xref.
+
+Le texte utilise la police Unicode de utils_polices (sous-ensembles de
+glyphes embarqués en fin de document), avec repli Helvetica.
+
+La mise en page d'un article ne dépend pas de sa position dans le digest :
+fragment_article_pdf() produit ses pages sous forme d'opérations de dessin
+réutilisables (numéro d'article et de page résolus à l'assemblage), ce qui
+permet de les mettre en cache (voir utils_cache_export).
+"""
+
+import zlib
+from datetime import datetime
+
+from utils_mise_en_page import mise_en_page_pour
+from utils_polices import (
+    JeuGlyphes, FF_NON_SYMBOLIQUE, FF_SYMBOLIQUE, cmap_unicode, face_ttf, police_unicode, sous_ensemble_ttf
+)
+
+# Format A4 en points
+A4 = (595.28, 841.89)
+
+# Ressource PDF par style de police
+RESSOURCES_STYLES = {"": "F1", "B": "F2", "I": "F3"}
+
+
+def _echapper(octets: bytes) -> str:
+    """Chaîne PDF littérale (ASCII imprimable, le reste en octal)."""
+    sortie = []
+    for o in octets:
+        if o in (0x28, 0x29, 0x5C):
+            sortie.append("\\" + chr(o))
+        elif 32 <= o < 127:
+            sortie.append(chr(o))
+        else:
+            sortie.append("\\%03o" % o)
+    return "".join(sortie)
+
+
+def _tableau(valeurs) -> bytes:
+    return b"[" + b" ".join(b"%d" % round(v) for v in valeurs) + b"]"
+
+
+class EcrivainPDF:
+    """Écrivain PDF bas niveau : objets écrits au fil de l'eau, xref en fin de fichier."""
+
+    def __init__(self, flux, taille_page=A4):
+        self.flux = flux
+        self.largeur, self.hauteur = taille_page
+        self.position = 0
+        self.offsets = [0]
+        self.pages = []
+        self.polices = {}
+
+        # Numéros réservés : catalogue et arbre des pages (écrits à la fermeture)
+        self.num_catalogue = self._reserver()
+        self.num_arbre_pages = self._reserver()
+
+        self._ecrire(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def _ecrire(self, data: bytes):
+        self.flux.write(data)
+        self.position += len(data)
+
+    def _reserver(self) -> int:
+        """Réserve un numéro d'objet (position renseignée à l'écriture)."""
+        self.offsets.append(0)
+        return len(self.offsets) - 1
+
+    def ecrire_objet(self, num: int, corps: bytes):
+        self.offsets[num] = self.position
+        self._ecrire(b"%d 0 obj\n" % num + corps + b"\nendobj\n")
+
+    def ecrire_flux(self, corps: bytes, dictionnaire: bytes = b"") -> int:
+        """Écrit un objet stream compressé et retourne son numéro."""
+        data = zlib.compress(corps)
+        num = self._reserver()
+        self.ecrire_objet(
+            num,
+            b"<< /Length %d /Filter /FlateDecode %s>>\nstream\n" % (len(data), dictionnaire) + data + b"\nendstream"
+        )
+        return num
+
+    def reserver_police(self, ressource: str) -> int:
+        """Numéro d'objet de la police `ressource` (réservé au premier usage, écrit en fin de document)."""
+        if ressource not in self.polices:
+            self.polices[ressource] = self._reserver()
+        return self.polices[ressource]
+
+    def _ressources(self) -> bytes:
+        polices = b" ".join(b"/%s %d 0 R" % (r.encode(), n) for r, n in self.polices.items())
+        return b"<< /Font << " + polices + b" >> >>"
+
+    def ajouter_page(self, contenu: bytes):
+        """Compresse et écrit immédiatement une page (flux de contenu + objet page)."""
+        num_contenu = self.ecrire_flux(contenu)
+        num_page = self._reserver()
+        self.ecrire_objet(
+            num_page,
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %.2f %.2f] /Resources %s /Contents %d 0 R >>"
+            % (self.num_arbre_pages, self.largeur, self.hauteur, self._ressources(), num_contenu)
+        )
+        self.pages.append(num_page)
+
+    def vider(self):
+        """Vide le tampon du flux sous-jacent s'il le permet."""
+        if hasattr(self.flux, "flush"):
+            self.flux.flush()
+
+    def fermer(self):
+        """Écrit arbre des pages, catalogue, xref et trailer (polices déjà écrites)."""
+        kids = b" ".join(b"%d 0 R" % n for n in self.pages)
+        self.ecrire_objet(
+            self.num_arbre_pages,
+            b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % len(self.pages)
+        )
+        self.ecrire_objet(self.num_catalogue, b"<< /Type /Catalog /Pages %d 0 R >>" % self.num_arbre_pages)
+
+        debut_xref = self.position
+        self._ecrire(b"xref\n0 %d\n0000000000 65535 f \n" % len(self.offsets))
+        for offset in self.offsets[1:]:
+            self._ecrire(b"%010d 00000 n \n" % offset)
+        self._ecrire(
+            b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+            % (len(self.offsets), self.num_catalogue, debut_xref)
+        )
+        self.vider()
+
+
+class DigestPDF:
+    """
+    Mise en page du digest (en-tête, pied de page, titres, paragraphes) sur un
+    EcrivainPDF. Avec flux=None, les pages ne sont pas écrites mais
+    enregistrées dans self.pages_enregistrees (opérations de dessin).
+
+    Opérations d'une page : ("T", x, y, style, taille, texte),
+    ("N", x, y, style, taille, gabarit) dont le texte est gabarit.format(numero=...),
+    et ("R", opérateurs PDF bruts).
+    """
+
+    MARGE = 28.35  # 10 mm
+    MARGE_BAS = 56.7  # 20 mm
+
+    def __init__(self, flux, titre_entete="Veille Médicale"):
+        self.pdf = EcrivainPDF(flux) if flux is not None else None
+        self.pages_enregistrees = []
+        # Police Unicode par style (None = repli Helvetica / WinAnsi)
+        self.jeux = {}
+        for style in RESSOURCES_STYLES:
+            face = face_ttf(style) if self.pdf else None
+            self.jeux[style] = JeuGlyphes(face) if face else None
+        self.titre_entete = titre_entete
+        self.largeur, self.hauteur = (self.pdf.largeur, self.pdf.hauteur) if self.pdf else A4
+        self.largeur_utile = self.largeur - 2 * self.MARGE
+        self.ops = None
+        self.y = 0
+        self.num_page = 0
+        self.numero = 0
+
+    # --- Page ---
+
+    def nouvelle_page(self):
+        """Termine la page courante (écrite aussitôt) et en commence une nouvelle."""
+        self._terminer_page()
+        self.ops = []
+        self.y = self.hauteur - self.MARGE
+        self.ligne_centree(self.titre_entete, "B", 16, 28)
+        self.y -= 14
+
+    def _terminer_page(self):
+        if self.ops is None:
+            return
+        if self.pdf is None:
+            self.pages_enregistrees.append(tuple(self.ops))
+        else:
+            self._ecrire_page(self.ops)
+        self.ops = None
+
+    def _ecrire_page(self, ops):
+        """Encode les opérations d'une page, ajoute le pied de page et l'écrit."""
+        self.num_page += 1
+        mep = self._mise_en_page("I", 8)
+        pied = f"Page {self.num_page}"
+        ops = list(ops) + [("T", (self.largeur - mep.largeur_texte(pied)) / 2, 30, "I", 8, pied)]
+
+        flux = []
+        for op in ops:
+            if op[0] == "R":
+                flux.append(op[1])
+            else:
+                _, x, y, style, taille, texte = op
+                if op[0] == "N":
+                    texte = texte.format(numero=self.numero)
+                flux.append(self._encoder_texte(x, y, style, taille, texte))
+        self.pdf.ajouter_page("\n".join(flux).encode("latin-1"))
+
+    def inserer_pages(self, pages, numero: int):
+        """Écrit des pages enregistrées (fragment d'article) en résolvant le numéro d'article."""
+        self._terminer_page()
+        self.numero = numero
+        for ops in pages:
+            self._ecrire_page(ops)
+
+    def _saut_si_besoin(self, hauteur: float):
+        if self.y - hauteur < self.MARGE_BAS:
+            self.nouvelle_page()
+
+    # --- Primitives ---
+
+    def _texte(self, x: float, y: float, style: str, taille: float, texte: str, code: str = "T"):
+        self.ops.append((code, x, y, style, taille, texte))
+
+    def _encoder_texte(self, x: float, y: float, style: str, taille: float, texte: str) -> str:
+        ressource = RESSOURCES_STYLES[style]
+        jeu = self.jeux[style]
+        if jeu is None:
+            self.pdf.reserver_police(ressource)
+            segments = [(ressource, texte.encode("cp1252", "replace"))]
+        else:
+            segments = []
+            for n, octets in jeu.encoder(texte):
+                self.pdf.reserver_police(f"{ressource}_{n}")
+                segments.append((f"{ressource}_{n}", octets))
+
+        ops = ["BT %.2f %.2f Td" % (x, y)]
+        for nom, octets in segments:
+            ops.append("/%s %.1f Tf (%s) Tj" % (nom, taille, _echapper(octets)))
+        ops.append("ET")
+        return " ".join(ops)
+
+    def _mise_en_page(self, style: str, taille: float):
+        return mise_en_page_pour(police_unicode(style), taille)
+
+    def ligne_centree(self, texte: str, style: str, taille: float, interligne: float):
+        self._saut_si_besoin(interligne)
+        largeur = self._mise_en_page(style, taille).largeur_texte(texte)
+        self.y -= interligne
+        self._texte((self.largeur - largeur) / 2, self.y + (interligne - taille) / 2, style, taille, texte)
+
+    def espace(self, hauteur: float):
+        self.y -= hauteur
+
+    def paragraphe(self, texte: str, style: str = "", taille: float = 10, interligne: float = None):
+        """Texte multi-lignes avec sauts de page automatiques (équivalent de multi_cell)."""
+        interligne = interligne or taille * 1.3
+        mep = self._mise_en_page(style, taille)
+        for ligne in mep.couper_document(texte, self.largeur_utile):
+            self._saut_si_besoin(interligne)
+            self.y -= interligne
+            if ligne:
+                self._texte(self.MARGE, self.y + (interligne - taille) / 2, style, taille, ligne)
+
+    def titre_section(self, titre: str, gabarit: bool = False):
+        """Bandeau de titre sur fond bleu clair (gabarit : titre contenant {numero})."""
+        self._saut_si_besoin(34)
+        self.y -= 28
+        self.ops.append(
+            ("R", "0.784 0.863 1 rg %.2f %.2f %.2f 28 re f 0 g" % (self.MARGE, self.y, self.largeur_utile))
+        )
+        self._texte(self.MARGE + 3, self.y + 9, "B", 14, titre, "N" if gabarit else "T")
+        self.y -= 8
+
+    def _ecrire_polices(self):
+        """Écrit les polices utilisées : Type1 standard, ou sous-ensembles TTF embarqués."""
+        for style, ressource in RESSOURCES_STYLES.items():
+            jeu = self.jeux[style]
+            if jeu is None:
+                if ressource in self.pdf.polices:
+                    self.pdf.ecrire_objet(
+                        self.pdf.polices[ressource],
+                        b"<< /Type /Font /Subtype /Type1 /BaseFont /%s /Encoding /WinAnsiEncoding >>"
+                        % police_unicode(style).encode()
+                    )
+                continue
+
+            face = jeu.face
+            for n, sous_ensemble in enumerate(jeu.sous_ensembles):
+                num_police = self.pdf.polices.get(f"{ressource}_{n}")
+                if num_police is None:
+                    continue
+                # Préfixe de sous-ensemble à 6 lettres, distinct par style et par sous-ensemble
+                prefixe = "".join(chr(65 + int(c)) for c in "%06d" % (int(ressource[1:]) * 1000 + n))
+                nom_base = prefixe.encode() + b"+" + face.name
+
+                programme = sous_ensemble_ttf(style, tuple(sous_ensemble))
+                num_programme = self.pdf.ecrire_flux(programme, b"/Length1 %d " % len(programme))
+
+                num_cmap = self.pdf.ecrire_flux(cmap_unicode(nom_base, sous_ensemble))
+
+                num_descripteur = self.pdf._reserver()
+                drapeaux = (face.flags & ~FF_NON_SYMBOLIQUE) | FF_SYMBOLIQUE
+                self.pdf.ecrire_objet(
+                    num_descripteur,
+                    b"<< /Type /FontDescriptor /FontName /%s /Flags %d /FontBBox %s /ItalicAngle %d "
+                    b"/Ascent %d /Descent %d /CapHeight %d /StemV %d /MissingWidth %d /FontFile2 %d 0 R >>"
+                    % (nom_base, drapeaux, _tableau(face.bbox), face.italicAngle, face.ascent, face.descent,
+                       face.capHeight, face.stemV, face.defaultWidth, num_programme)
+                )
+                self.pdf.ecrire_objet(
+                    num_police,
+                    b"<< /Type /Font /Subtype /TrueType /BaseFont /%s /FirstChar 0 /LastChar %d "
+                    b"/Widths %s /FontDescriptor %d 0 R /ToUnicode %d 0 R >>"
+                    % (nom_base, len(sous_ensemble) - 1, _tableau(map(face.getCharWidth, sous_ensemble)),
+                       num_descripteur, num_cmap)
+                )
+
+    def fermer(self):
+        self._terminer_page()
+        self._ecrire_polices()
+        self.pdf.fermer()
+
+
+def ecrire_digest_pdf(flux, spec, periode, articles, nb_articles=None, fragment_fn=None):
+    """
+    Écrit le digest dans `flux` article par article (flux vidé après chaque
+    article). `articles` peut être un générateur ; dans ce cas, fournir
+    nb_articles pour la page de garde. Le texte intégral n'est pas tronqué.
+    fragment_fn(article) fournit les pages d'un article (par défaut
+    fragment_article_pdf, sans cache).
+    """
+    fragment_fn = fragment_fn or fragment_article_pdf
+    if nb_articles is None:
+        nb_articles = len(articles)
+
+    digest = DigestPDF(flux)
+    digest.nouvelle_page()
+
+    digest.espace(85)
+    digest.ligne_centree("VEILLE MÉDICALE", "B", 20, 42)
+    digest.espace(57)
+    for ligne in (
+        f"Spécialité: {spec}",
+        f"Période: {periode}",
+        f"Articles: {nb_articles}",
+        f"Date: {datetime.now().strftime('%d/%m/%Y')}",
+    ):
+        digest.ligne_centree(ligne, "", 12, 23)
+
+    for i, article in enumerate(articles, 1):
+        digest.inserer_pages(fragment_fn(article), i)
+        digest.pdf.vider()
+
+    digest.fermer()
+
+
+def fragment_article_pdf(article) -> tuple:
+    """
+    Pages d'un article (opérations de dessin), indépendantes de sa position
+    dans le digest : réutilisables d'un assemblage à l'autre.
+    """
+    digest = DigestPDF(None)
+    digest.nouvelle_page()
+    digest.titre_section(f"Article {{numero}} - PMID {article['pmid']}", gabarit=True)
+    digest.paragraphe(article.get("title_fr") or article.get("title") or "", "B", 12, 17)
+    digest.espace(8)
+    digest.paragraphe(f"Journal: {article['journal']} ({article['year']})", "", 10, 14)
+    digest.espace(8)
+    if article.get("pdf_texte_fr"):
+        digest.paragraphe(article["pdf_texte_fr"], "", 10, 11.5)
+    digest._terminer_page()
+    return tuple(digest.pages_enregistrees)
@@ -0,0 +1,131 @@
+# ============================================
+# FILIGRANES DES ALERTES (RECHERCHE INCRÉMENTALE)
+# ============================================
+
+"""
+État des alertes quotidiennes (alerte.py) : pour chaque requête PubMed, la
+date Entrez jusqu'à laquelle les résultats ont été traités (filigrane) et
+les PMID déjà envoyés.
+
+Chaque exécution n'interroge PubMed que depuis le filigrane (mindate) :
+la charge reste constante quel que soit l'historique. La date Entrez est
+au jour près, le jour du filigrane est donc relu et les PMID déjà vus
+sont écartés.
+
+Boîte d'envoi : les e-mails d'une exécution sont enregistrés dans la même
+transaction que l'avancée des filigranes, puis retirés un par un une fois
+délivrés (ou refusés définitivement). Un destinataire en échec temporaire
+est réessayé seul à l'exécution suivante, sans renvoyer le digest aux
+autres abonnés.
+
+Base SQLite dans les données locales (conservée d'une exécution GitHub
+Actions à l'autre par actions/cache).
+"""
+
+import hashlib
+import sqlite3
+import time
+
+from config_stockage import chemin_donnees
+
+FICHIER_FILIGRANES = "alertes.sqlite"
+JOURS_CONSERVATION_VUS = 30  # PMID vus oubliés après ce délai
+
+
+def cle_requete(query: str) -> str:
+    return hashlib.sha1(" ".join(query.split()).encode("utf-8")).hexdigest()
+
+
+def _connexion():
+    conn = sqlite3.connect(chemin_donnees(FICHIER_FILIGRANES), timeout=30)
+    conn.execute("CREATE TABLE IF NOT EXISTS filigranes (cle TEXT PRIMARY KEY, query TEXT, date_entrez TEXT, maj REAL)")
+    conn.execute("CREATE TABLE IF NOT EXISTS vus (cle TEXT, pmid TEXT, vu REAL, PRIMARY KEY (cle, pmid))")
+    conn.execute("CREATE TABLE IF NOT EXISTS envois (id INTEGER PRIMARY KEY, destinataire TEXT, sujet TEXT, "
+                 "corps TEXT, cree REAL, tentatives INTEGER DEFAULT 0, erreur TEXT)")
+    return conn
+
+
+def lire_filigrane(query: str):
+    """Date Entrez (AAAA/MM/JJ) jusqu'à laquelle la requête a été traitée, ou None."""
+    conn = _connexion()
+    try:
+        ligne = conn.execute("SELECT date_entrez FROM filigranes WHERE cle = ?", (cle_requete(query),)).fetchone()
+        return ligne[0] if ligne else None
+    finally:
+        conn.close()
+
+
+def pmids_nouveaux(query: str, pmids: list) -> list:
+    """PMID pas encore traités pour cette requête (ordre conservé)."""
+    if not pmids:
+        return []
+    conn = _connexion()
+    try:
+        requete = "SELECT pmid FROM vus WHERE cle = ? AND pmid IN (%s)" % ",".join("?" * len(pmids))
+        vus = {p for (p,) in conn.execute(requete, [cle_requete(query)] + list(pmids))}
+    finally:
+        conn.close()
+    return [p for p in pmids if p not in vus]
+
+
+def _avancer(conn, query: str, date_entrez: str, pmids: list, maintenant: float):
+    cle = cle_requete(query)
+    conn.execute("INSERT OR REPLACE INTO filigranes VALUES (?, ?, ?, ?)", (cle, query, date_entrez, maintenant))
+    conn.executemany("INSERT OR REPLACE INTO vus VALUES (?, ?, ?)", [(cle, p, maintenant) for p in pmids])
+    conn.execute("DELETE FROM vus WHERE vu < ?", (maintenant - JOURS_CONSERVATION_VUS * 86400,))
+
+
+def avancer_filigrane(query: str, date_entrez: str, pmids: list):
+    """Enregistre le nouveau filigrane et les PMID traités (purge les anciens)."""
+    conn = _connexion()
+    try:
+        with conn:
+            _avancer(conn, query, date_entrez, pmids, time.time())
+    finally:
+        conn.close()
+
+
+# ============================================
+# BOÎTE D'ENVOI
+# ============================================
+
+def valider_digests(filigranes: list, envois: list):
+    """
+    En une transaction : avance les filigranes [(query, date, pmids)] et met
+    en attente les e-mails [(destinataire, sujet, corps)] de l'exécution.
+    """
+    maintenant = time.time()
+    conn = _connexion()
+    try:
+        with conn:
+            for query, date_entrez, pmids in filigranes:
+                _avancer(conn, query, date_entrez, pmids, maintenant)
+            conn.executemany("INSERT INTO envois (destinataire, sujet, corps, cree) VALUES (?, ?, ?, ?)",
+                             [(d, sujet, corps, maintenant) for d, sujet, corps in envois])
+    finally:
+        conn.close()
+
+
+def envois_en_attente() -> list:
+    """E-mails non encore délivrés, du plus ancien au plus récent : [(id, destinataire, sujet, corps)]."""
+    conn = _connexion()
+    try:
+        with conn:
+            conn.execute("DELETE FROM envois WHERE cree < ?", (time.time() - JOURS_CONSERVATION_VUS * 86400,))
+        return conn.execute("SELECT id, destinataire, sujet, corps FROM envois ORDER BY id").fetchall()
+    finally:
+        conn.close()
+
+
+def marquer_envoi(id_envoi: int, termine: bool, erreur: str = None):
+    """Retire un e-mail délivré (ou refusé définitivement) ; sinon note l'échec pour la prochaine exécution."""
+    conn = _connexion()
+    try:
+        with conn:
+            if termine:
+                conn.execute("DELETE FROM envois WHERE id = ?", (id_envoi,))
+            else:
+                conn.execute("UPDATE envois SET tentatives = tentatives + 1, erreur = ? WHERE id = ?",
+                             (erreur, id_envoi))
+    finally:
+        conn.close()
@@ -0,0 +1,204 @@
+# ============================================
+# INDEX LOCAL DES ARTICLES (SQLITE FTS5)
+# ============================================
+
+"""
+Corpus local de tous les articles récupérés par les apps : titres et
+abstracts (anglais et français traduits), termes MeSH, journal, année.
+
+- Index plein texte SQLite FTS5 (accents ignorés : « endometriose »
+  trouve « endométriose ») pour une recherche instantanée, sans appel à
+  PubMed ni traduction des mots-clés.
+- Les articles déjà indexés et traduits sont resservis tels quels : après
+  une recherche PubMed, seuls les PMID nouveaux sont demandés (efetch) et
+  traduits.
+
+Base SQLite dans les données locales ; une mise à jour partielle (titres
+seuls, par exemple) ne remplace pas les champs déjà connus.
+"""
+
+import os
+import re
+import sqlite3
+import time
+
+from config_stockage import chemin_donnees
+
+FICHIER_INDEX = "articles.sqlite"
+CHAMPS_TEXTE = ("title_en", "title_fr", "abstract_en", "abstract_fr", "mesh", "journal")
+CHAMPS = CHAMPS_TEXTE + ("year", "doi", "pmcid")
+# Poids BM25 des colonnes indexées (titres et MeSH d'abord)
+POIDS_COLONNES = (10.0, 10.0, 2.0, 2.0, 5.0, 1.0)
+SEPARATEUR_MESH = "; "
+
+
+def _connexion():
+    conn = sqlite3.connect(chemin_donnees(FICHIER_INDEX), timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(f"""
+        CREATE TABLE IF NOT EXISTS articles (
+            pmid TEXT PRIMARY KEY, {", ".join(f"{c} TEXT" for c in CHAMPS)},
+            complet INTEGER DEFAULT 0, maj REAL
+        );
+        CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+            {", ".join(CHAMPS_TEXTE)}, content='articles',
+            tokenize='unicode61 remove_diacritics 2'
+        );
+        CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
+            INSERT INTO articles_fts(rowid, {", ".join(CHAMPS_TEXTE)})
+            VALUES (new.rowid, {", ".join(f"new.{c}" for c in CHAMPS_TEXTE)});
+        END;
+        CREATE TRIGGER IF NOT EXISTS articles_au AFTER UPDATE ON articles BEGIN
+            INSERT INTO articles_fts(articles_fts, rowid, {", ".join(CHAMPS_TEXTE)})
+            VALUES ('delete', old.rowid, {", ".join(f"old.{c}" for c in CHAMPS_TEXTE)});
+            INSERT INTO articles_fts(rowid, {", ".join(CHAMPS_TEXTE)})
+            VALUES (new.rowid, {", ".join(f"new.{c}" for c in CHAMPS_TEXTE)});
+        END;
+    """)
+    if conn.execute("PRAGMA user_version").fetchone()[0] < 1:
+        # Index antérieurs : abstracts « traduits » identiques à l'original marqués complets à tort
+        with conn:
+            conn.execute("UPDATE articles SET abstract_fr = '' WHERE abstract_fr = abstract_en AND abstract_fr != ''")
+            conn.execute("UPDATE articles SET complet = 0 WHERE complet = 1 AND "
+                         "(title_fr = '' OR (abstract_en != '' AND abstract_fr = ''))")
+            conn.execute("PRAGMA user_version = 1")
+    return conn
+
+
+def _ligne(article: dict) -> dict:
+    """Champs indexés d'un article, quel que soit le module qui l'a produit."""
+    title_en = article.get("title_en") or article.get("title") or ""
+    abstract_en = article.get("abstract_en") or article.get("abstract") or ""
+    # Une « traduction » identique à l'original n'en est pas une (repli sur l'anglais)
+    title_fr = article.get("title_fr") or ""
+    title_fr = title_fr if title_fr != title_en else ""
+    abstract_fr = article.get("abstract_fr") or ""
+    abstract_fr = abstract_fr if abstract_fr != abstract_en else ""
+    mesh = article.get("mesh") or []
+    annee = str(article.get("year") or article.get("date") or "")[:4]
+    return {
+        "pmid": str(article["pmid"]),
+        "title_en": title_en,
+        "title_fr": title_fr,
+        "abstract_en": abstract_en,
+        "abstract_fr": abstract_fr,
+        "mesh": mesh if isinstance(mesh, str) else SEPARATEUR_MESH.join(mesh),
+        "journal": article.get("journal") or "",
+        "year": annee if annee.isdigit() else "",
+        "doi": article.get("doi") or "",
+        "pmcid": article.get("pmcid") or "",
+        # Métadonnées et traductions complètes : l'article peut être resservi sans PubMed
+        # (un article sans abstract anglais n'attend que son titre traduit)
+        "complet": int("abstract_fr" in article and bool(title_fr) and (bool(abstract_fr) or not abstract_en)),
+    }
+
+
+def indexer_articles(articles: list) -> int:
+    """Ajoute ou complète les articles dans l'index. Retourne le nombre d'articles écrits."""
+    lignes = [dict(_ligne(a), maj=time.time()) for a in articles if a.get("pmid")]
+    if not lignes:
+        return 0
+    colonnes = ("pmid",) + CHAMPS + ("complet", "maj")
+    mises_a_jour = ", ".join(f"{c} = COALESCE(NULLIF(excluded.{c}, ''), {c})" for c in CHAMPS)
+    conn = _connexion()
+    try:
+        with conn:
+            conn.executemany(
+                f"INSERT INTO articles ({', '.join(colonnes)}) VALUES ({', '.join(':' + c for c in colonnes)}) "
+                f"ON CONFLICT(pmid) DO UPDATE SET {mises_a_jour}, "
+                f"complet = MAX(complet, excluded.complet), maj = excluded.maj",
+                lignes
+            )
+    finally:
+        conn.close()
+    return len(lignes)
+
+
+def _article(ligne) -> dict:
+    article = {c: ligne[c] or None for c in CHAMPS}
+    article["pmid"] = ligne["pmid"]
+    article["title_fr"] = ligne["title_fr"] or ligne["title_en"]
+    article["journal"] = ligne["journal"] or "N/A"
+    article["year"] = ligne["year"] or "N/A"
+    article["mesh"] = ligne["mesh"].split(SEPARATEUR_MESH) if ligne["mesh"] else []
+    if "extrait" in ligne.keys():
+        article["extrait"] = ligne["extrait"]
+    return article
+
+
+def articles_indexes(pmids: list) -> dict:
+    """{pmid: article} des PMID déjà indexés avec métadonnées et traductions complètes."""
+    if not pmids:
+        return {}
+    conn = _connexion()
+    try:
+        requete = "SELECT * FROM articles WHERE complet = 1 AND pmid IN (%s)" % ",".join("?" * len(pmids))
+        return {ligne["pmid"]: _article(ligne) for ligne in conn.execute(requete, [str(p) for p in pmids])}
+    finally:
+        conn.close()
+
+
+def requete_fts(texte: str) -> str:
+    """
+    Requête FTS5 depuis une saisie libre : les groupes séparés par des
+    virgules sont combinés en OU, les mots d'un groupe en ET (préfixes),
+    les expressions entre guillemets restent des phrases.
+    """
+    groupes = []
+    for groupe in texte.split(","):
+        termes = []
+        for phrase, mot in re.findall(r'"([^"]*)"|([^\s"]+)', groupe):
+            if phrase.strip():
+                termes.append('"' + " ".join(re.findall(r"\w+", phrase)) + '"')
+            termes += [f'"{m}"*' for m in re.findall(r"\w+", mot)]
+        if termes:
+            groupes.append("(" + " ".join(termes) + ")")
+    return " OR ".join(groupes)
+
+
+def rechercher_local(texte: str, limite: int = 50, annee_min: int = None, annee_max: int = None):
+    """
+    Recherche plein texte dans le corpus local, par pertinence (BM25) ; sans
+    texte, les derniers articles indexés. Retourne (articles, erreur) ; chaque
+    article porte un "extrait" avec les termes trouvés en gras.
+    """
+    conditions, params = [], []
+    if annee_min:
+        conditions.append("CAST(a.year AS INTEGER) >= ?")
+        params.append(int(annee_min))
+    if annee_max:
+        conditions.append("CAST(a.year AS INTEGER) <= ?")
+        params.append(int(annee_max))
+
+    requete = requete_fts(texte or "")
+    if requete:
+        sql = (
+            "SELECT a.*, snippet(articles_fts, -1, '**', '**', '…', 24) AS extrait "
+            "FROM articles_fts JOIN articles a ON a.rowid = articles_fts.rowid "
+            "WHERE articles_fts MATCH ? " + "".join(f"AND {c} " for c in conditions) +
+            f"ORDER BY bm25(articles_fts, {', '.join(map(str, POIDS_COLONNES))}) LIMIT ?"
+        )
+        params = [requete] + params
+    else:
+        sql = ("SELECT a.* FROM articles a " + ("WHERE " + " AND ".join(conditions) + " " if conditions else "") +
+               "ORDER BY a.maj DESC LIMIT ?")
+
+    conn = _connexion()
+    try:
+        return [_article(ligne) for ligne in conn.execute(sql, params + [limite])], None
+    except sqlite3.Error as e:
+        return [], f"Erreur index local: {e}"
+    finally:
+        conn.close()
+
+
+def statistiques_index() -> dict:
+    conn = _connexion()
+    try:
+        articles, complets = conn.execute("SELECT COUNT(*), COALESCE(SUM(complet), 0) FROM articles").fetchone()
+    finally:
+        conn.close()
+    chemin = chemin_donnees(FICHIER_INDEX)
+    return {"articles": articles, "complets": complets,
+            "octets": os.path.getsize(chemin) if os.path.exists(chemin) else 0}
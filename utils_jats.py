@@ -0,0 +1,208 @@
+# ============================================
+# TEXTE INTÉGRAL JATS (PMC / EUROPE PMC)
+# ============================================
+
+"""
+Récupération du texte intégral structuré (XML JATS) pour les articles PMC.
+
+PMC et Europe PMC servent le même article en XML JATS : le parser coûte
+bien moins cher qu'une extraction PDF et donne un texte propre, découpé
+en sections (abstract, méthodes, résultats, discussion), sans références.
+
+Utilisé en amont de la cascade PDF dans app.py et diagnostic_pdf.py.
+"""
+
+import re
+import xml.etree.ElementTree as ET
+
+import requests
+
+from config_services import BASE_EUTILS, BASE_EUROPEPMC
+from utils_text import SECTIONS_UTILES, classer_titre_section
+
+# Éléments JATS ignorés (références, figures, tableaux, annexes, formules)
+BALISES_IGNOREES = {
+    "ref-list", "fig", "table-wrap", "supplementary-material", "disp-formula",
+    "inline-formula", "ack", "fn-group", "glossary", "app-group", "funding-group",
+    "object-id", "label",
+}
+
+
+def _clean_pmcid(pmcid: str) -> str:
+    """Retourne le PMCID sous forme numérique (sans préfixe PMC)."""
+    if not pmcid:
+        return ""
+    return str(pmcid).upper().replace("PMC", "").strip()
+
+
+def _local(tag: str) -> str:
+    """Nom local d'une balise (sans namespace)."""
+    return tag.rsplit("}", 1)[-1] if isinstance(tag, str) else ""
+
+
+def _texte_element(elem) -> str:
+    """Texte d'un élément JATS, sans citations ni éléments ignorés."""
+    morceaux = []
+
+    def parcourir(e):
+        nom = _local(e.tag)
+        if nom in BALISES_IGNOREES:
+            if e.tail:
+                morceaux.append(e.tail)
+            return
+        if nom == "xref" and e.get("ref-type") == "bibr":
+            # Appels de référence [12] supprimés : inutiles à traduire
+            if e.tail:
+                morceaux.append(e.tail)
+            return
+        if e.text:
+            morceaux.append(e.text)
+        for enfant in e:
+            parcourir(enfant)
+        if e.tail and e is not elem:
+            morceaux.append(e.tail)
+
+    parcourir(elem)
+    texte = "".join(morceaux)
+    texte = re.sub(r"\[\s*[,–-]?\s*\]|\(\s*[,;–-]?\s*\)", "", texte)
+    return re.sub(r"\s+", " ", texte).strip()
+
+
+def _paragraphes(sec) -> list:
+    """Paragraphes directs d'une section (hors sous-sections)."""
+    paras = []
+    for enfant in sec:
+        nom = _local(enfant.tag)
+        if nom in ("p", "list", "disp-quote", "statement"):
+            texte = _texte_element(enfant)
+            if texte:
+                paras.append(texte)
+    return paras
+
+
+def _sections_body(elem, section_parente: str = "autre") -> list:
+    """Parcourt récursivement les <sec> du corps et retourne (type, titre, texte)."""
+    resultats = []
+    for sec in elem:
+        if _local(sec.tag) != "sec":
+            continue
+        titre_elem = next((e for e in sec if _local(e.tag) == "title"), None)
+        titre = _texte_element(titre_elem) if titre_elem is not None else ""
+        label = classer_titre_section(titre, sec.get("sec-type", ""))
+        if label == "autre":
+            # Une sous-section hérite du type de sa section parente
+            label = section_parente
+
+        paras = _paragraphes(sec)
+        if paras:
+            resultats.append((label, titre, "\n\n".join(paras)))
+        resultats.extend(_sections_body(sec, label))
+    return resultats
+
+
+def jats_vers_sections(xml_content: bytes) -> list:
+    """
+    Convertit un XML JATS en liste de sections (type, titre, texte).
+    Les références, remerciements, financements et tableaux sont exclus.
+    """
+    root = ET.fromstring(xml_content)
+    article = root if _local(root.tag) == "article" else next(
+        (e for e in root.iter() if _local(e.tag) == "article"), None
+    )
+    if article is None:
+        return []
+
+    sections = []
+
+    for abstract in article.iter():
+        if _local(abstract.tag) != "abstract" or abstract.get("abstract-type") in ("graphical", "teaser"):
+            continue
+        paras = _paragraphes(abstract)
+        for sec in _sections_body(abstract, "abstract"):
+            paras.append(sec[2])
+        if paras:
+            sections.append(("abstract", "Abstract", "\n\n".join(paras)))
+            break
+
+    body = next((e for e in article.iter() if _local(e.tag) == "body"), None)
+    if body is not None:
+        paras_libres = _paragraphes(body)
+        if paras_libres:
+            sections.append(("autre", "", "\n\n".join(paras_libres)))
+        sections.extend(_sections_body(body))
+
+    return sections
+
+
+def jats_vers_texte(xml_content: bytes, sections_gardees=SECTIONS_UTILES) -> str:
+    """Texte intégral propre, sectionné, prêt pour la traduction."""
+    blocs = []
+    for label, titre, texte in jats_vers_sections(xml_content):
+        if label not in sections_gardees and label != "autre":
+            continue
+        blocs.append(f"## {titre}\n{texte}" if titre else texte)
+    return "\n\n".join(blocs)
+
+
+def _contient_body(xml_content: bytes) -> bool:
+    """PMC renvoie seulement le front-matter si l'éditeur interdit le XML complet."""
+    return b"<body" in xml_content
+
+
+def fetch_jats_pmc(pmcid):
+    """Télécharge le XML JATS via efetch (db=pmc)."""
+    pmcid_num = _clean_pmcid(pmcid)
+    if not pmcid_num:
+        return None, "Pas de PMCID"
+
+    try:
+        params = {"db": "pmc", "id": pmcid_num, "retmode": "xml"}
+        r = requests.get(f"{BASE_EUTILS}/efetch.fcgi", params=params, timeout=20)
+        if r.status_code != 200:
+            return None, f"PMC JATS HTTP {r.status_code}"
+        if not _contient_body(r.content):
+            return None, "PMC JATS: texte intégral non distribué en XML"
+        return r.content, None
+    except Exception as e:
+        return None, f"PMC JATS erreur: {e}"
+
+
+def fetch_jats_europepmc(pmcid):
+    """Télécharge le XML JATS via l'API REST Europe PMC."""
+    pmcid_num = _clean_pmcid(pmcid)
+    if not pmcid_num:
+        return None, "Pas de PMCID"
+
+    try:
+        url = f"{BASE_EUROPEPMC}/PMC{pmcid_num}/fullTextXML"
+        r = requests.get(url, timeout=20)
+        if r.status_code != 200:
+            return None, f"Europe PMC JATS HTTP {r.status_code}"
+        if not _contient_body(r.content):
+            return None, "Europe PMC JATS: pas de corps d'article"
+        return r.content, None
+    except Exception as e:
+        return None, f"Europe PMC JATS erreur: {e}"
+
+
+def recuperer_texte_jats(pmcid, min_len: int = 500, sections_gardees=SECTIONS_UTILES):
+    """
+    Cascade JATS : PMC puis Europe PMC.
+    Retourne (texte, source, erreur).
+    """
+    erreurs = []
+    for source, fetcher in (("PMC JATS", fetch_jats_pmc), ("Europe PMC JATS", fetch_jats_europepmc)):
+        xml_content, err = fetcher(pmcid)
+        if not xml_content:
+            erreurs.append(err)
+            continue
+        try:
+            texte = jats_vers_texte(xml_content, sections_gardees)
+        except ET.ParseError as e:
+            erreurs.append(f"{source}: XML invalide ({e})")
+            continue
+        if len(texte) >= min_len:
+            return texte, source, None
+        erreurs.append(f"{source}: texte trop court ({len(texte)} caractères)")
+
+    return None, None, " | ".join(e for e in erreurs if e)
@@ -0,0 +1,367 @@
+# ============================================
+# TÂCHES DE FOND (HORS DU THREAD STREAMLIT)
+# ============================================
+
+"""
+Exécution des traitements longs (cascade PDF, extraction, traduction,
+analyse IA) dans un pool de threads du processus, indépendamment du
+script Streamlit : un rerun ou une déconnexion du navigateur
+n'interrompt plus le travail en cours.
+
+- Chaque tâche a un identifiant ; son état (statut, progression,
+  événements, résultat, points de reprise) est écrit sur disque à chaque
+  étape (dossier jobs/ des données locales).
+- L'interface soumet une tâche, garde son identifiant (session, URL) et
+  interroge son état à chaque rerun ; suivre_job() rafraîchit seul un
+  fragment tant que la tâche tourne, puis relance la page une fois.
+- Chaque tâche active appartient à un processus (hôte, pid) qui renouvelle
+  son bail régulièrement. Les tâches dont le bail a expiré (processus
+  arrêté ou planté) sont reprises par un autre processus partageant les
+  données, au plus MAX_REPRISES fois ; les fonctions de tâche reprennent à
+  partir de ctx.partiel.
+
+Les fonctions de tâche sont enregistrées par type (enregistrer_tache) et
+reçoivent (parametres, ctx) ; paramètres et résultats doivent être
+sérialisables en JSON.
+"""
+
+import hashlib
+import json
+import os
+import socket
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from config_stockage import chemin_donnees
+
+DOSSIER_JOBS = "jobs"
+MAX_TRAVAILLEURS = int(os.getenv("VEILLE_JOBS_TRAVAILLEURS", "4"))
+MAX_EVENEMENTS = 200
+DUREE_CONSERVATION_JOBS = 7 * 24 * 60 * 60
+
+INTERVALLE_SUIVI = 2        # secondes entre deux rafraîchissements du fragment de suivi
+DUREE_BAIL = 120            # une tâche sans battement depuis ce délai est orpheline
+INTERVALLE_BATTEMENT = 30
+MAX_REPRISES = int(os.getenv("VEILLE_JOBS_REPRISES", "2"))
+
+STATUTS_ACTIFS = ("en_attente", "en_cours")
+PROPRIETAIRE = {"hote": socket.gethostname(), "pid": os.getpid()}
+
+_TACHES = {}
+_verrou = threading.Lock()
+_pool = None
+_actifs = {}  # id -> état en mémoire des tâches soumises dans ce processus
+_index_cles = {}  # clé -> id de la dernière tâche soumise dans ce processus
+_derniere_reprise = [0.0]
+_battement_demarre = [False]
+
+
+# ============================================
+# PERSISTANCE
+# ============================================
+
+def _chemin_job(job_id: str) -> str:
+    return chemin_donnees(DOSSIER_JOBS, f"{job_id}.json")
+
+
+def _sauver(etat: dict):
+    chemin = _chemin_job(etat["id"])
+    temporaire = f"{chemin}.{threading.get_ident()}.tmp"
+    with open(temporaire, "w", encoding="utf-8") as f:
+        json.dump(etat, f, ensure_ascii=False)
+    os.replace(temporaire, chemin)
+
+
+def _charger(job_id: str):
+    try:
+        with open(_chemin_job(job_id), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _chemin_cle(cle: str) -> str:
+    """Fichier d'index clé -> id de la dernière tâche (nom dérivé de la clé)."""
+    return chemin_donnees(DOSSIER_JOBS, "cles", hashlib.sha1(cle.encode("utf-8")).hexdigest())
+
+
+def _indexer_cle(cle: str, job_id: str):
+    chemin = _chemin_cle(cle)
+    temporaire = f"{chemin}.{threading.get_ident()}.tmp"
+    with open(temporaire, "w", encoding="utf-8") as f:
+        f.write(job_id)
+    os.replace(temporaire, chemin)
+
+
+# ============================================
+# CONTEXTE D'EXÉCUTION
+# ============================================
+
+class ContexteJob:
+    """Passé à la fonction de tâche : progression, points de reprise, annulation."""
+
+    def __init__(self, etat: dict):
+        self.etat = etat
+
+    @property
+    def partiel(self) -> dict:
+        """Résultats intermédiaires conservés entre reprises (lecture ; écrire via point_de_reprise)."""
+        return self.etat["partiel"]
+
+    @property
+    def annule(self) -> bool:
+        return self.etat.get("annulation_demandee", False)
+
+    def progres(self, progression: float = None, message: str = ""):
+        """Publie un événement de progression (0 à 1) et persiste l'état (renouvelle le bail)."""
+        with _verrou:
+            self.etat["bail"] = time.time() + DUREE_BAIL
+            if progression is not None:
+                self.etat["progression"] = max(0.0, min(1.0, progression))
+            if message:
+                self.etat["message"] = message
+                self.etat["evenements"].append({"t": time.time(), "message": message})
+                del self.etat["evenements"][:-MAX_EVENEMENTS]
+            self.etat["maj_le"] = time.time()
+            _sauver(self.etat)
+
+    def point_de_reprise(self, cle: str, valeur):
+        """Enregistre un résultat intermédiaire dans ctx.partiel et le persiste."""
+        with _verrou:
+            self.etat["partiel"][cle] = valeur
+        self.progres()
+
+
+# ============================================
+# API
+# ============================================
+
+def enregistrer_tache(type_tache: str, fonction):
+    """Associe un type de tâche à sa fonction (parametres, ctx) -> résultat."""
+    _TACHES[type_tache] = fonction
+
+
+def _battement():
+    """Renouvelle le bail des tâches actives du processus (même si la tâche ne publie rien)."""
+    while True:
+        time.sleep(INTERVALLE_BATTEMENT)
+        with _verrou:
+            for etat in list(_actifs.values()):
+                etat["bail"] = time.time() + DUREE_BAIL
+                _sauver(etat)
+
+
+def _obtenir_pool() -> ThreadPoolExecutor:
+    global _pool
+    with _verrou:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=MAX_TRAVAILLEURS, thread_name_prefix="veille-job")
+        if not _battement_demarre[0]:
+            _battement_demarre[0] = True
+            threading.Thread(target=_battement, name="veille-job-bail", daemon=True).start()
+        return _pool
+
+
+def _executer(etat: dict):
+    ctx = ContexteJob(etat)
+    with _verrou:
+        etat["statut"] = "en_cours"
+    ctx.progres(message="▶️ Démarrage")
+    try:
+        resultat = _TACHES[etat["type"]](etat["parametres"], ctx)
+        with _verrou:
+            etat["resultat"] = resultat
+            etat["statut"] = "annule" if ctx.annule else "termine"
+        ctx.progres(1.0, "✅ Terminé" if not ctx.annule else "⏹️ Annulé")
+    except Exception as e:
+        with _verrou:
+            etat["statut"] = "erreur"
+            etat["erreur"] = f"{type(e).__name__}: {e}"
+            etat["trace"] = traceback.format_exc(limit=5)
+        ctx.progres(message=f"❌ {etat['erreur']}")
+    finally:
+        with _verrou:
+            _actifs.pop(etat["id"], None)
+
+
+def soumettre(type_tache: str, parametres: dict, cle: str = None) -> str:
+    """
+    Soumet une tâche et retourne son identifiant. Avec `cle`, une tâche
+    active de même clé est réutilisée au lieu d'être relancée.
+    """
+    if type_tache not in _TACHES:
+        raise ValueError(f"Type de tâche inconnu : {type_tache}")
+    if cle:
+        existant = job_par_cle(cle)
+        if existant and existant["statut"] in STATUTS_ACTIFS:
+            return existant["id"]
+
+    maintenant = time.time()
+    etat = {
+        "id": uuid.uuid4().hex[:16],
+        "type": type_tache,
+        "cle": cle,
+        "parametres": parametres,
+        "statut": "en_attente",
+        "progression": 0.0,
+        "message": "⏳ En attente",
+        "evenements": [],
+        "partiel": {},
+        "resultat": None,
+        "erreur": None,
+        "cree_le": maintenant,
+        "maj_le": maintenant,
+        "proprietaire": PROPRIETAIRE,
+        "bail": maintenant + DUREE_BAIL,
+        "reprises": 0,
+    }
+    _sauver(etat)
+    if cle:
+        _indexer_cle(cle, etat["id"])
+    with _verrou:
+        _actifs[etat["id"]] = etat
+        if cle:
+            _index_cles[cle] = etat["id"]
+    _obtenir_pool().submit(_executer, etat)
+    return etat["id"]
+
+
+def etat_job(job_id: str):
+    """État courant d'une tâche (mémoire si active dans ce processus, sinon disque)."""
+    with _verrou:
+        etat = _actifs.get(job_id)
+        if etat is not None:
+            return json.loads(json.dumps(etat))
+    return _charger(job_id) if job_id else None
+
+
+def job_par_cle(cle: str):
+    """Tâche la plus récente ayant cette clé (index du processus, sinon index sur disque)."""
+    with _verrou:
+        job_id = _index_cles.get(cle)
+    if not job_id:
+        try:
+            with open(_chemin_cle(cle), encoding="utf-8") as f:
+                job_id = f.read().strip()
+        except OSError:
+            return None
+    return etat_job(job_id)
+
+
+def annuler(job_id: str):
+    """Demande l'arrêt coopératif d'une tâche (vérifié par la fonction via ctx.annule)."""
+    with _verrou:
+        etat = _actifs.get(job_id)
+        if etat is not None:
+            etat["annulation_demandee"] = True
+
+
+def _revendiquer(job_id: str):
+    """
+    Prend possession d'une tâche orpheline (bail expiré). Un fichier verrou
+    créé en exclusif empêche deux processus de la reprendre en même temps.
+    Retourne l'état revendiqué, ou None.
+    """
+    verrou = _chemin_job(job_id) + ".verrou"
+    try:
+        fd = os.open(verrou, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        # Verrou laissé par un processus mort pendant la revendication
+        try:
+            if time.time() - os.path.getmtime(verrou) > DUREE_BAIL:
+                os.remove(verrou)
+        except OSError:
+            pass
+        return None
+    try:
+        etat = _charger(job_id)
+        maintenant = time.time()
+        if (not etat or etat["statut"] not in STATUTS_ACTIFS or etat["type"] not in _TACHES
+                or etat.get("bail", 0) > maintenant):
+            return None
+        etat["reprises"] = etat.get("reprises", 0) + 1
+        etat["proprietaire"] = PROPRIETAIRE
+        etat["bail"] = maintenant + DUREE_BAIL
+        if etat["reprises"] > MAX_REPRISES:
+            etat["statut"] = "erreur"
+            etat["erreur"] = f"Abandon après {MAX_REPRISES} reprise(s) : le processus s'est arrêté à chaque exécution"
+            etat["evenements"].append({"t": maintenant, "message": f"❌ {etat['erreur']}"})
+            _sauver(etat)
+            return None
+        etat["statut"] = "en_attente"
+        etat["evenements"].append({"t": maintenant, "message": f"🔁 Reprise n°{etat['reprises']} (processus arrêté)"})
+        _sauver(etat)
+        return etat
+    finally:
+        os.close(fd)
+        os.remove(verrou)
+
+
+def reprendre_jobs():
+    """
+    Reprend les tâches actives sur disque dont le propriétaire ne renouvelle
+    plus le bail (processus arrêté) et purge les anciennes. Appelée à chaque
+    rerun ; le parcours du disque a lieu au plus une fois par DUREE_BAIL.
+    """
+    maintenant = time.time()
+    with _verrou:
+        if maintenant - _derniere_reprise[0] < DUREE_BAIL:
+            return
+        _derniere_reprise[0] = maintenant
+
+    dossier = os.path.dirname(_chemin_job("x"))
+    for nom in os.listdir(dossier):
+        if not nom.endswith(".json"):
+            continue
+        etat = _charger(nom[:-5])
+        if not etat:
+            continue
+        if maintenant - etat.get("maj_le", 0) > DUREE_CONSERVATION_JOBS:
+            try:
+                os.remove(os.path.join(dossier, nom))
+                if etat.get("cle") and job_par_cle(etat["cle"]) is None:
+                    os.remove(_chemin_cle(etat["cle"]))
+            except OSError:
+                pass
+            continue
+        if etat["statut"] not in STATUTS_ACTIFS or etat.get("bail", 0) > maintenant:
+            continue
+        with _verrou:
+            if etat["id"] in _actifs:
+                continue
+        etat = _revendiquer(etat["id"])
+        if etat is None:
+            continue
+        with _verrou:
+            _actifs[etat["id"]] = etat
+            if etat.get("cle"):
+                _index_cles[etat["cle"]] = etat["id"]
+        _obtenir_pool().submit(_executer, etat)
+
+
+# ============================================
+# SUIVI DANS L'INTERFACE
+# ============================================
+
+def _suivi_job(job_id: str, progression: bool):
+    import streamlit as st
+
+    job = etat_job(job_id)
+    if job is None or job["statut"] not in STATUTS_ACTIFS:
+        st.rerun()  # tâche finie : la page entière affiche le résultat
+    if progression:
+        st.progress(job["progression"], text=job["message"])
+
+
+def suivre_job(job_id: str, progression: bool = True):
+    """
+    Fragment Streamlit rafraîchi toutes les INTERVALLE_SUIVI secondes tant
+    que la tâche est active (seul ce fragment est réexécuté, pas la page) ;
+    à la fin de la tâche, un seul rerun complet.
+    """
+    import streamlit as st
+
+    st.fragment(run_every=INTERVALLE_SUIVI)(_suivi_job)(job_id, progression)
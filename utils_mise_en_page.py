@@ -0,0 +1,116 @@
+# ============================================
+# MISE EN PAGE DU TEXTE (CÉSURE DES LIGNES)
+# ============================================
+
+"""
+Découpe du texte en lignes pour les PDF générés.
+
+L'ancienne césure de build_pdf_from_text recalculait la largeur de toute
+la ligne en construction à chaque mot (coût quadratique). Ici la largeur
+de chaque mot est mise en cache par police/taille et la largeur de ligne
+est cumulée mot à mot : un document entier se découpe en temps linéaire.
+Les polices sans crénage (Helvetica, TTF reportlab) rendent ce cumul exact.
+"""
+
+from functools import lru_cache
+
+# Au-delà, le cache de largeurs est vidé (vocabulaire d'un très gros corpus)
+MAX_MOTS_CACHE = 50000
+
+
+def _largeur_reportlab(police: str, taille: float):
+    """Fonction de largeur reportlab (import différé)."""
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+    return lambda texte: stringWidth(texte, police, taille)
+
+
+class MiseEnPage:
+    """Césure incrémentale avec cache des largeurs de mots pour une police donnée."""
+
+    def __init__(self, police: str, taille: float, largeur_fn=None):
+        self.police = police
+        self.taille = taille
+        self._largeur_fn = largeur_fn or _largeur_reportlab(police, taille)
+        self._cache = {}
+        self.largeur_espace = self._largeur_fn(" ")
+
+    def largeur_mot(self, mot: str) -> float:
+        """Largeur d'un mot (mise en cache)."""
+        largeur = self._cache.get(mot)
+        if largeur is None:
+            if len(self._cache) >= MAX_MOTS_CACHE:
+                self._cache.clear()
+            largeur = self._cache[mot] = self._largeur_fn(mot)
+        return largeur
+
+    def largeur_texte(self, texte: str) -> float:
+        """Largeur d'une ligne, cumulée à partir des largeurs de mots."""
+        mots = texte.split(" ")
+        return sum(self.largeur_mot(m) for m in mots if m) + self.largeur_espace * (len(mots) - 1)
+
+    def _couper_mot(self, mot: str, max_width: float) -> list:
+        """Coupe un mot plus large que la ligne (URL, séquence...) en morceaux."""
+        morceaux = []
+        courant = ""
+        largeur = 0.0
+        for car in mot:
+            l_car = self.largeur_mot(car)
+            if courant and largeur + l_car > max_width:
+                morceaux.append(courant)
+                courant, largeur = "", 0.0
+            courant += car
+            largeur += l_car
+        if courant:
+            morceaux.append(courant)
+        return morceaux
+
+    def couper_paragraphe(self, texte: str, max_width: float) -> list:
+        """Découpe un paragraphe en lignes de largeur <= max_width."""
+        lignes = []
+        ligne = []
+        largeur = 0.0
+
+        for mot in texte.split():
+            l_mot = self.largeur_mot(mot)
+
+            if l_mot > max_width:
+                if ligne:
+                    lignes.append(" ".join(ligne))
+                morceaux = self._couper_mot(mot, max_width)
+                lignes.extend(morceaux[:-1])
+                ligne = [morceaux[-1]]
+                largeur = self.largeur_mot(morceaux[-1])
+                continue
+
+            if not ligne:
+                ligne, largeur = [mot], l_mot
+            elif largeur + self.largeur_espace + l_mot <= max_width:
+                ligne.append(mot)
+                largeur += self.largeur_espace + l_mot
+            else:
+                lignes.append(" ".join(ligne))
+                ligne, largeur = [mot], l_mot
+
+        if ligne:
+            lignes.append(" ".join(ligne))
+        return lignes
+
+    def couper_document(self, texte: str, max_width: float) -> list:
+        """
+        Découpe un document entier ; les lignes vides du texte source
+        sont rendues par None (saut de paragraphe).
+        """
+        resultat = []
+        for paragraphe in texte.split("\n"):
+            paragraphe = paragraphe.strip()
+            if not paragraphe:
+                resultat.append(None)
+                continue
+            resultat.extend(self.couper_paragraphe(paragraphe, max_width))
+        return resultat
+
+
+@lru_cache(maxsize=16)
+def mise_en_page_pour(police: str, taille: float) -> MiseEnPage:
+    """Moteur de césure partagé par police/taille (cache de largeurs conservé entre documents)."""
+    return MiseEnPage(police, taille)
@@ -0,0 +1,134 @@
+# ============================================
+# EXPORT NOTEBOOKLM EN FLUX (DÉCOUPAGE AUTOMATIQUE)
+# ============================================
+
+"""
+Écriture des exports NotebookLM section par section, directement dans une
+archive zip (une seule passe, temps linéaire, pas de concaténation `+=`).
+
+NotebookLM limite la taille de chaque source : l'export est réparti en
+plusieurs fichiers texte (podcast_01.txt, podcast_02.txt...) qui restent
+sous MAX_MOTS_SOURCE mots et MAX_OCTETS_SOURCE octets. Un article n'est
+coupé que s'il dépasse à lui seul la limite (coupure entre paragraphes).
+Un manifeste (manifest.json) décrit les fichiers et les PMID qu'ils
+contiennent.
+"""
+
+import json
+import re
+import zipfile
+from datetime import datetime
+
+# Limites NotebookLM par source (marge de sécurité incluse)
+MAX_MOTS_SOURCE = 450000
+MAX_OCTETS_SOURCE = 150 * 1024 * 1024
+
+PARAGRAPHES_RE = re.compile(r"(?<=\n)(?=\n)")
+
+
+class ExportNotebookLM:
+    """Écrivain d'export NotebookLM découpé en sources, écrit dans un zip."""
+
+    def __init__(self, flux, prefixe="podcast", entete="", max_mots=MAX_MOTS_SOURCE,
+                 max_octets=MAX_OCTETS_SOURCE):
+        self.zip = zipfile.ZipFile(flux, "w", zipfile.ZIP_DEFLATED)
+        self.prefixe = prefixe
+        self.entete = entete
+        self.max_mots = max_mots
+        self.max_octets = max_octets
+        self.fichiers = []
+        self._fichier = None
+        self._courant = None
+
+    # --- Fichiers source ---
+
+    def _ouvrir_fichier(self):
+        self._fermer_fichier()
+        nom = f"{self.prefixe}_{len(self.fichiers) + 1:02d}.txt"
+        self._fichier = self.zip.open(nom, "w")
+        self._courant = {"fichier": nom, "mots": 0, "octets": 0, "pmids": []}
+        self.fichiers.append(self._courant)
+        if self.entete:
+            self._ecrire(self.entete)
+
+    def _fermer_fichier(self):
+        if self._fichier is not None:
+            self._fichier.close()
+            self._fichier = None
+
+    def _ecrire(self, texte: str, mots: int = None):
+        data = texte.encode("utf-8")
+        self._fichier.write(data)
+        self._courant["mots"] += len(texte.split()) if mots is None else mots
+        self._courant["octets"] += len(data)
+
+    def _place_restante(self, mots: int, octets: int) -> bool:
+        return (self._courant["mots"] + mots <= self.max_mots
+                and self._courant["octets"] + octets <= self.max_octets)
+
+    # --- Sections ---
+
+    def _morceaux(self, texte: str):
+        """Découpe une section trop grande en morceaux (entre paragraphes, puis entre mots)."""
+        budget_mots = max(1, self.max_mots // 2)
+        budget_octets = max(1, self.max_octets // 2)
+        morceau, mots, octets = [], 0, 0
+        for paragraphe in PARAGRAPHES_RE.split(texte):
+            p_mots = len(paragraphe.split())
+            p_octets = len(paragraphe.encode("utf-8"))
+            if morceau and (mots + p_mots > budget_mots or octets + p_octets > budget_octets):
+                yield "".join(morceau)
+                morceau, mots, octets = [], 0, 0
+            if p_mots > budget_mots or p_octets > budget_octets:
+                # Paragraphe démesuré : coupe entre mots
+                liste = paragraphe.split(" ")
+                pas = max(1, min(budget_mots, budget_octets // 16))
+                for debut in range(0, len(liste), pas):
+                    # L'espace entre deux morceaux est conservé (sinon deux mots fusionnent)
+                    suite = " " if debut + pas < len(liste) else ""
+                    yield " ".join(liste[debut:debut + pas]) + suite
+                continue
+            morceau.append(paragraphe)
+            mots += p_mots
+            octets += p_octets
+        if morceau:
+            yield "".join(morceau)
+
+    def ajouter_section(self, texte: str, pmid: str = None):
+        """Ajoute une section ; nouveau fichier source si elle ne tient pas dans le courant."""
+        mots = len(texte.split())
+        octets = len(texte.encode("utf-8"))
+
+        if self._fichier is None:
+            self._ouvrir_fichier()
+        elif not self._place_restante(mots, octets):
+            self._ouvrir_fichier()
+
+        if not self._place_restante(mots, octets):
+            # Section plus grande qu'une source : répartie sur plusieurs fichiers
+            for morceau in self._morceaux(texte):
+                m_mots = len(morceau.split())
+                if not self._place_restante(m_mots, len(morceau.encode("utf-8"))):
+                    self._ouvrir_fichier()
+                self._ecrire(morceau, m_mots)
+                if pmid and pmid not in self._courant["pmids"]:
+                    self._courant["pmids"].append(pmid)
+            return
+
+        self._ecrire(texte, mots)
+        if pmid:
+            self._courant["pmids"].append(pmid)
+
+    def fermer(self) -> dict:
+        """Ferme le dernier fichier, écrit le manifeste et l'archive ; retourne le manifeste."""
+        if self._fichier is None and not self.fichiers:
+            self._ouvrir_fichier()
+        self._fermer_fichier()
+        manifeste = {
+            "genere_le": datetime.now().strftime("%d/%m/%Y %H:%M"),
+            "limites": {"mots": self.max_mots, "octets": self.max_octets},
+            "fichiers": self.fichiers,
+        }
+        self.zip.writestr("manifest.json", json.dumps(manifeste, ensure_ascii=False, indent=2))
+        self.zip.close()
+        return manifeste
@@ -0,0 +1,60 @@
+# ============================================
+# PAGINATION DES LISTES DE RÉSULTATS
+# ============================================
+
+"""
+Affichage paginé des longues listes (100 à 200 articles) : seuls les
+widgets de la page visible sont construits, ce qui allège le navigateur
+et le websocket Streamlit.
+
+La sélection ne doit pas reposer sur l'état des widgets (Streamlit oublie
+la valeur d'un widget qui n'est pas affiché lors d'un rerun) : les apps
+la conservent dans un ensemble de PMID en session.
+"""
+
+PAR_PAGE_DEFAUT = 20
+
+
+def nombre_pages(total: int, par_page: int = PAR_PAGE_DEFAUT) -> int:
+    return max(1, -(-total // par_page))
+
+
+def borner_page(page: int, total: int, par_page: int = PAR_PAGE_DEFAUT) -> int:
+    """Numéro de page ramené dans [0, nombre_pages - 1]."""
+    return min(max(0, page), nombre_pages(total, par_page) - 1)
+
+
+def bornes_page(page: int, total: int, par_page: int = PAR_PAGE_DEFAUT) -> tuple:
+    """Indices (début, fin) des éléments de la page."""
+    page = borner_page(page, total, par_page)
+    return page * par_page, min(total, (page + 1) * par_page)
+
+
+def navigation_pages(cle: str, total: int, par_page: int = PAR_PAGE_DEFAUT) -> tuple:
+    """
+    Barre de navigation Streamlit (précédent / page / suivant). Le numéro de
+    page est gardé dans st.session_state[cle]. Retourne (page, début, fin).
+    """
+    import streamlit as st
+
+    nb = nombre_pages(total, par_page)
+    page = borner_page(st.session_state.get(cle, 0), total, par_page)
+    st.session_state[cle] = page
+
+    if nb > 1:
+        def aller(delta):
+            st.session_state[cle] = borner_page(st.session_state[cle] + delta, total, par_page)
+
+        col_prec, col_page, col_suiv = st.columns([0.2, 0.6, 0.2])
+        with col_prec:
+            st.button("⬅️ Précédent", key=f"{cle}_prec", on_click=aller, args=(-1,),
+                      disabled=page == 0, use_container_width=True)
+        with col_page:
+            debut, fin = bornes_page(page, total, par_page)
+            st.caption(f"Page {page + 1} / {nb} — articles {debut + 1} à {fin} sur {total}")
+        with col_suiv:
+            st.button("Suivant ➡️", key=f"{cle}_suiv", on_click=aller, args=(1,),
+                      disabled=page >= nb - 1, use_container_width=True)
+
+    debut, fin = bornes_page(page, total, par_page)
+    return page, debut, fin
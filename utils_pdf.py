@@ -0,0 +1,130 @@
+# ============================================
+# EXTRACTION PDF ROUTÉE PAR PAGE
+# ============================================
+
+"""
+Classification rapide de la mise en page de chaque page PDF (PyMuPDF)
+et choix de l'extracteur :
+
+- "simple"         : une colonne → texte PyMuPDF direct (chemin rapide)
+- "multi_colonnes" : plusieurs colonnes → pdfplumber (lent mais fiable)
+- "tableau"        : page dominée par des tableaux → pdfplumber
+- "image"          : page scannée sans texte → signalée pour OCR
+
+Seules les pages qui en ont besoin passent par pdfplumber.
+"""
+
+import re
+from io import BytesIO
+
+TYPES_PAGE = ("simple", "multi_colonnes", "tableau", "image")
+
+# Pages dont l'extraction nécessite pdfplumber
+TYPES_PDFPLUMBER = ("multi_colonnes", "tableau")
+
+NOMBRE_RE = re.compile(r"[<>≤≥±=]?[\d.,%()–-]+")
+
+
+def _ligne_numerique(ligne: str) -> bool:
+    """Ligne de tableau : au moins 3 valeurs, majoritairement numériques."""
+    tokens = ligne.split()
+    if len(tokens) < 3:
+        return False
+    return sum(1 for t in tokens if NOMBRE_RE.fullmatch(t)) / len(tokens) > 0.5
+
+
+def classer_page(blocs: list, largeur_page: float) -> str:
+    """
+    Classe une page à partir de ses blocs PyMuPDF
+    (x0, y0, x1, y1, texte, n°, type ; type 1 = image).
+    """
+    blocs_texte = [b for b in blocs if b[6] == 0 and b[4].strip()]
+    nb_caracteres = sum(len(b[4].strip()) for b in blocs_texte)
+
+    if nb_caracteres < 30:
+        return "image" if any(b[6] == 1 for b in blocs) or not blocs_texte else "simple"
+
+    lignes = [l for b in blocs_texte for l in b[4].splitlines() if l.strip()]
+    if lignes and sum(1 for l in lignes if _ligne_numerique(l)) / len(lignes) > 0.3:
+        return "tableau"
+
+    # Colonnes : blocs étroits, de part et d'autre du milieu de la page
+    milieu = largeur_page / 2
+    marge = largeur_page * 0.05
+    gauche = droite = 0
+    for x0, _, x1, _, texte, _, _ in blocs_texte:
+        if len(texte.strip()) < 80 or (x1 - x0) > largeur_page * 0.6:
+            continue
+        if x1 <= milieu + marge:
+            gauche += 1
+        elif x0 >= milieu - marge:
+            droite += 1
+    if gauche >= 2 and droite >= 2:
+        return "multi_colonnes"
+
+    return "simple"
+
+
+def extraire_pages_routees(pdf_content: bytes, max_pages: int = 15):
+    """
+    Extraction page par page avec routage selon la mise en page.
+    Retourne (pages, méthode, rapport) ; rapport = {type: nb_pages, "pages_ocr": [...]}.
+    Si PyMuPDF est indisponible, retourne ([], "pymupdf_absent", {}).
+    """
+    try:
+        import fitz
+    except ImportError:
+        return [], "pymupdf_absent", {}
+
+    rapport = {t: 0 for t in TYPES_PAGE}
+    rapport["pages_ocr"] = []
+    pages = []
+    a_router = {}
+
+    try:
+        doc = fitz.open(stream=pdf_content, filetype="pdf")
+    except Exception as e:
+        return [], f"Erreur PyMuPDF: {e}", {}
+
+    with doc:
+        for i in range(min(doc.page_count, max_pages)):
+            try:
+                page = doc.load_page(i)
+                blocs = page.get_text("blocks", sort=True)
+                type_page = classer_page(blocs, page.rect.width)
+            except Exception:
+                pages.append("")
+                continue
+
+            rapport[type_page] += 1
+            if type_page == "image":
+                rapport["pages_ocr"].append(i + 1)
+                pages.append("")
+            elif type_page in TYPES_PDFPLUMBER:
+                a_router[i] = "\n".join(b[4].strip() for b in blocs if b[6] == 0)
+                pages.append("")
+            else:
+                pages.append("\n".join(b[4].strip() for b in blocs if b[6] == 0 and b[4].strip()))
+
+    # pdfplumber uniquement pour les pages qui l'exigent
+    if a_router:
+        try:
+            import pdfplumber
+            with pdfplumber.open(BytesIO(pdf_content)) as pdf:
+                for i in a_router:
+                    try:
+                        pages[i] = pdf.pages[i].extract_text() or a_router[i]
+                    except Exception:
+                        pages[i] = a_router[i]
+        except Exception:
+            # pdfplumber absent ou en échec : texte PyMuPDF en secours
+            for i, texte in a_router.items():
+                pages[i] = texte
+
+    methode = (
+        f"routage ({rapport['simple']} simples, "
+        f"{rapport['multi_colonnes'] + rapport['tableau']} pdfplumber"
+        + (f", OCR requis p. {', '.join(map(str, rapport['pages_ocr']))}" if rapport["pages_ocr"] else "")
+        + ")"
+    )
+    return pages, methode, rapport
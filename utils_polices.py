@@ -0,0 +1,152 @@
+# ============================================
+# POLICES UNICODE POUR LES PDF GÉNÉRÉS
+# ============================================
+
+"""
+Police TrueType Unicode embarquée dans les PDF générés, pour que les
+symboles médicaux (≥, µ, β, ±...) ne soient plus perdus.
+
+- La police est recherchée une seule fois (VEILLE_POLICE_TTF, puis
+  emplacements usuels de DejaVu Sans), analysée et enregistrée auprès de
+  reportlab une seule fois par processus (métriques de glyphes en cache).
+- Seuls les glyphes réellement utilisés sont embarqués (sous-ensembles de
+  256 glyphes au plus, comme reportlab), et les sous-ensembles produits
+  sont mis en cache.
+- Sans police TTF disponible, repli sur Helvetica (caractères hors
+  WinAnsi remplacés).
+"""
+
+import os
+from functools import lru_cache
+
+# Noms reportlab des polices enregistrées, et polices standard de repli
+NOMS_POLICES = {"": "VeilleSans", "B": "VeilleSans-Bold", "I": "VeilleSans-Oblique"}
+POLICES_REPLI = {"": "Helvetica", "B": "Helvetica-Bold", "I": "Helvetica-Oblique"}
+
+_DOSSIER_APP = os.path.dirname(os.path.abspath(__file__))
+
+CANDIDATS_POLICES = {
+    "": [
+        os.getenv("VEILLE_POLICE_TTF"),
+        os.path.join(_DOSSIER_APP, "fonts", "DejaVuSans.ttf"),
+        "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+        "/usr/share/fonts/dejavu/DejaVuSans.ttf",
+        "/usr/share/fonts/TTF/DejaVuSans.ttf",
+        "/Library/Fonts/Arial Unicode.ttf",
+        "C:/Windows/Fonts/arial.ttf",
+    ],
+    "B": [
+        os.getenv("VEILLE_POLICE_TTF_GRAS"),
+        os.path.join(_DOSSIER_APP, "fonts", "DejaVuSans-Bold.ttf"),
+        "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+        "/usr/share/fonts/dejavu/DejaVuSans-Bold.ttf",
+        "/usr/share/fonts/TTF/DejaVuSans-Bold.ttf",
+        "C:/Windows/Fonts/arialbd.ttf",
+    ],
+    "I": [
+        os.getenv("VEILLE_POLICE_TTF_ITALIQUE"),
+        os.path.join(_DOSSIER_APP, "fonts", "DejaVuSans-Oblique.ttf"),
+        "/usr/share/fonts/truetype/dejavu/DejaVuSans-Oblique.ttf",
+        "/usr/share/fonts/dejavu/DejaVuSans-Oblique.ttf",
+        "/usr/share/fonts/TTF/DejaVuSans-Oblique.ttf",
+        "C:/Windows/Fonts/ariali.ttf",
+    ],
+}
+
+# Drapeaux FontDescriptor (police symbolique : encodage propre à chaque sous-ensemble)
+FF_SYMBOLIQUE = 1 << 2
+FF_NON_SYMBOLIQUE = 1 << 5
+
+
+def chemin_police(style: str = "") -> str:
+    """Premier fichier TTF existant pour ce style (le gras/italique se replient sur le normal)."""
+    for chemin in CANDIDATS_POLICES.get(style, []):
+        if chemin and os.path.isfile(chemin):
+            return chemin
+    return chemin_police("") if style else None
+
+
+@lru_cache(maxsize=None)
+def police_unicode(style: str = "") -> str:
+    """
+    Nom reportlab de la police à utiliser pour ce style. La police TTF est
+    analysée et enregistrée une seule fois par processus ; repli Helvetica.
+    """
+    chemin = chemin_police(style)
+    if not chemin:
+        return POLICES_REPLI[style]
+    try:
+        from reportlab.pdfbase import pdfmetrics
+        from reportlab.pdfbase.ttfonts import TTFont
+        pdfmetrics.registerFont(TTFont(NOMS_POLICES[style], chemin))
+        return NOMS_POLICES[style]
+    except Exception:
+        return POLICES_REPLI[style]
+
+
+def face_ttf(style: str = ""):
+    """Face TTF reportlab (métriques, glyphes) du style, ou None si repli Helvetica."""
+    nom = police_unicode(style)
+    if nom == POLICES_REPLI[style]:
+        return None
+    from reportlab.pdfbase import pdfmetrics
+    return pdfmetrics.getFont(nom).face
+
+
+@lru_cache(maxsize=64)
+def sous_ensemble_ttf(style: str, codes: tuple) -> bytes:
+    """Fichier TTF réduit aux glyphes `codes` (mis en cache entre documents)."""
+    return face_ttf(style).makeSubset(list(codes))
+
+
+def cmap_unicode(nom_base: bytes, sous_ensemble: list) -> bytes:
+    """CMap ToUnicode d'un sous-ensemble (texte copiable / recherchable dans le PDF)."""
+    from reportlab.pdfbase.ttfonts import makeToUnicodeCMap
+    return makeToUnicodeCMap(nom_base.decode("latin-1"), sous_ensemble).encode("latin-1")
+
+
+class JeuGlyphes:
+    """
+    Attribution incrémentale des codes 8 bits d'une police TTF dans un document.
+    Le sous-ensemble 0 garde l'ASCII à sa place (flux lisibles) ; les autres
+    caractères occupent les codes libres puis de nouveaux sous-ensembles.
+    """
+
+    def __init__(self, face):
+        self.face = face
+        self.sous_ensembles = [[0] * 32 + list(range(32, 128))]
+        self.attributions = {c: (0, c) for c in range(32, 128)}
+        self._libres = list(range(128, 256))[::-1] + list(range(1, 32))[::-1]
+
+    def _attribuer(self, code: int):
+        if self._libres:
+            n = self._libres.pop()
+            sous_ensemble = self.sous_ensembles[0]
+            if n < 32:
+                sous_ensemble[n] = code
+            else:
+                sous_ensemble.append(code)
+            self.attributions[code] = (0, n)
+            return self.attributions[code]
+
+        dernier = self.sous_ensembles[-1]
+        if len(self.sous_ensembles) == 1 or len(dernier) >= 256:
+            dernier = [0]
+            self.sous_ensembles.append(dernier)
+        dernier.append(code)
+        self.attributions[code] = (len(self.sous_ensembles) - 1, len(dernier) - 1)
+        return self.attributions[code]
+
+    def encoder(self, texte: str) -> list:
+        """Découpe le texte en segments [(n° sous-ensemble, octets)]."""
+        segments = []
+        for car in texte:
+            code = ord(car)
+            if code not in self.face.charToGlyph and code not in self.attributions:
+                code = ord("?")
+            n, octet = self.attributions.get(code) or self._attribuer(code)
+            if segments and segments[-1][0] == n:
+                segments[-1][1].append(octet)
+            else:
+                segments.append((n, bytearray([octet])))
+        return [(n, bytes(octets)) for n, octets in segments]
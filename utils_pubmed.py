@@ -0,0 +1,219 @@
+# ============================================
+# PUBMED & UNPAYWALL : MÉTADONNÉES ET DISPONIBILITÉ PDF
+# ============================================
+
+"""
+Appels PubMed (efetch) et Unpaywall partagés par app.py et les benchmarks.
+
+Aucune dépendance à Streamlit : les erreurs sont renvoyées à l'appelant
+(tuples (contenu, erreur)), qui décide de les afficher. Les résultats sont
+mémoïsés dans les espaces "metadonnees" et "pdf" de utils_cache.
+"""
+
+import re
+import xml.etree.ElementTree as ET
+
+import requests
+
+from config_services import BASE_EUTILS, BASE_UNPAYWALL
+from utils_cache import memoiser
+
+
+# ============================================
+# NETTOYAGE DES MÉTADONNÉES
+# ============================================
+
+def nettoyer_titre(titre: str) -> str:
+    """Nettoie le titre d'article : balises HTML, mentions 'see more', espaces."""
+    if not titre:
+        return "Titre non disponible"
+
+    titre = re.sub(r'<[^>]+>', '', titre)
+    patterns = [
+        r'\s*see\s+more\s*',
+        r'\[see\s+more\]',
+        r'\(see\s+more\)',
+        r'\(\s*see\s+more\s*\)',
+        r'\s*voir\s+plus\s*',
+        r'\[voir\s+plus\]',
+        r'\(voir\s+plus\)',
+    ]
+
+    for pat in patterns:
+        titre = re.sub(pat, '', titre, flags=re.IGNORECASE)
+
+    titre = re.sub(r'\s+', ' ', titre)
+    return titre.strip()
+
+
+def nettoyer_abstract(texte: str) -> str:
+    """Nettoie un abstract : supprime balises, espaces, artefacts."""
+    if not texte:
+        return ""
+
+    texte = re.sub(r'<[^>]+>', '', texte)
+    texte = re.sub(r'^[A-Z ]{3,20}:\s*', '', texte)
+    texte = re.sub(r'\s+', ' ', texte)
+
+    return texte.strip()
+
+
+# ============================================
+# MÉTADONNÉES (EFETCH)
+# ============================================
+
+@memoiser("metadonnees", cacher_si=lambda r: bool(r[0]))
+def pubmed_fetch_metadata_and_abstracts(pmids):
+    """
+    Récupère les métadonnées et abstracts pour une liste de PMIDs.
+    Retourne (articles, erreur).
+    """
+    if not pmids:
+        return [], None
+
+    try:
+        params = {
+            "db": "pubmed",
+            "id": ",".join(pmids),
+            "retmode": "xml"
+        }
+
+        r = requests.get(f"{BASE_EUTILS}/efetch.fcgi", params=params, timeout=30)
+        r.raise_for_status()
+
+        root = ET.fromstring(r.content)
+        results = []
+
+        for article in root.findall('.//PubmedArticle'):
+            pmid_elem = article.find('.//PMID')
+            pmid = pmid_elem.text if pmid_elem is not None else None
+
+            title_elem = article.find('.//ArticleTitle')
+            title = ''.join(title_elem.itertext()) if title_elem is not None else "Titre non disponible"
+            title = nettoyer_titre(title)
+
+            journal_elem = article.find('.//Journal/Title')
+            journal = journal_elem.text if journal_elem is not None else "Journal non disponible"
+
+            year_elem = article.find('.//PubDate/Year')
+            year = year_elem.text if year_elem is not None else "N/A"
+
+            doi = None
+            pmcid = None
+            for aid in article.findall('.//ArticleId'):
+                if aid.get('IdType') == 'doi':
+                    doi = aid.text
+                if aid.get('IdType') == 'pmc':
+                    pmcid = aid.text
+
+            abstract_texts = []
+            for abst in article.findall('.//Abstract/AbstractText'):
+                part = ''.join(abst.itertext())
+                if part:
+                    abstract_texts.append(part.strip())
+
+            abstract = nettoyer_abstract("\n\n".join(abstract_texts))
+
+            mesh = [d.text for d in article.findall('.//MeshHeadingList/MeshHeading/DescriptorName') if d.text]
+
+            results.append({
+                "pmid": pmid,
+                "title_en": title,
+                "journal": journal,
+                "year": year,
+                "doi": doi,
+                "pmcid": pmcid,
+                "abstract_en": abstract,
+                "mesh": mesh
+            })
+
+        return results, None
+    except Exception as e:
+        return [], f"Erreur récupération métadonnées: {e}"
+
+
+# ============================================
+# UNPAYWALL
+# ============================================
+
+@memoiser("pdf", cacher_si=lambda r: not (r[2] or "").startswith(("Unpaywall HTTP", "Unpaywall erreur")))
+def check_pdf_free_unpaywall(doi, email):
+    """Vérifie via Unpaywall si un PDF OA est disponible, sans forcément le télécharger."""
+    if not doi:
+        return False, None, "Pas de DOI"
+
+    try:
+        url = f"{BASE_UNPAYWALL}/{doi}"
+        params = {"email": email}
+        r = requests.get(url, params=params, timeout=20)
+
+        if r.status_code == 404:
+            return False, None, "Unpaywall: DOI inconnu"
+        if r.status_code != 200:
+            return False, None, f"Unpaywall HTTP {r.status_code}"
+
+        data = r.json()
+
+        if not data.get("is_oa"):
+            return False, None, "Unpaywall: pas Open Access"
+
+        # On privilégie best_oa_location
+        best = data.get("best_oa_location")
+        if best and best.get("url_for_pdf"):
+            return True, best["url_for_pdf"], None
+
+        # Sinon on regarde dans oa_locations
+        for loc in data.get("oa_locations", []):
+            pdf_url = loc.get("url_for_pdf")
+            if pdf_url:
+                return True, pdf_url, None
+
+        return False, None, "Unpaywall: PDF OA non trouvé dans les locations"
+    except Exception as e:
+        return False, None, f"Unpaywall erreur: {e}"
+
+
+def fetch_pdf_from_unpaywall(doi, email):
+    """Tente de récupérer un PDF via Unpaywall."""
+    if not doi:
+        return None, "Pas de DOI"
+
+    try:
+        url = f"{BASE_UNPAYWALL}/{doi}"
+        params = {"email": email}
+        r = requests.get(url, params=params, timeout=20)
+
+        if r.status_code == 404:
+            return None, "Unpaywall: DOI inconnu"
+        if r.status_code != 200:
+            return None, f"Unpaywall HTTP {r.status_code}"
+
+        data = r.json()
+
+        if not data.get("is_oa"):
+            return None, "Unpaywall: pas Open Access"
+
+        headers = {"User-Agent": "Mozilla/5.0"}
+
+        best = data.get("best_oa_location")
+        if best and best.get("url_for_pdf"):
+            pdf_url = best["url_for_pdf"]
+            r2 = requests.get(pdf_url, headers=headers, timeout=30)
+            if r2.status_code == 200 and "application/pdf" in r2.headers.get("Content-Type", ""):
+                return r2.content, None
+
+        for loc in data.get("oa_locations", []):
+            pdf_url = loc.get("url_for_pdf")
+            if not pdf_url:
+                continue
+            try:
+                r3 = requests.get(pdf_url, headers=headers, timeout=30)
+                if r3.status_code == 200 and "application/pdf" in r3.headers.get("Content-Type", ""):
+                    return r3.content, None
+            except Exception:
+                continue
+
+        return None, "Unpaywall: PDF non trouvé"
+
+    except Exception as e:
+        return None, f"Unpaywall erreur: {e}"
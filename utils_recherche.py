@@ -0,0 +1,179 @@
+# ============================================
+# RECHERCHE PUBMED : CLÉS CANONIQUES ET PAGINATION
+# ============================================
+
+"""
+Couche de recherche esearch commune aux apps.
+
+- La requête est normalisée en une forme canonique (espaces, parenthèses
+  superflues, ordre des termes dans les groupes OR) : deux requêtes
+  équivalentes partagent la même entrée du cache "recherche".
+- Le résultat garde le nombre total d'articles (count), le WebEnv et le
+  query_key de l'historique NCBI, et les PMID déjà chargés.
+- « Charger plus » demande seulement la page suivante (retstart) au lieu
+  de relancer une recherche plus large.
+"""
+
+import hashlib
+import re
+
+import requests
+
+from config_services import BASE_EUTILS
+from utils_cache import cache_partage
+
+ESPACE_RECHERCHE = "recherche"
+OPERATEURS = ("AND", "OR", "NOT")
+
+# Guillemets, étiquettes de champ [..], parenthèses, ou mot
+_JETON = re.compile(r'"[^"]*"|\[[^\]]*\]|[()]|[^\s()"\[]+')
+
+
+# ============================================
+# FORME CANONIQUE
+# ============================================
+
+def _jetons(requete: str) -> list:
+    jetons = []
+    for jeton in _JETON.findall(requete):
+        if jeton.startswith("["):
+            jeton = "[" + " ".join(jeton[1:-1].split()) + "]"
+            # L'étiquette de champ reste collée au terme qui la précède
+            if jetons and jetons[-1] not in ("(", ")") and jetons[-1] not in OPERATEURS:
+                jetons[-1] += jeton
+                continue
+        jetons.append(jeton)
+    return jetons
+
+
+def _analyser(jetons: list, i: int = 0):
+    """Groupe = (opérandes, opérateurs) ; un terme = chaîne. Retourne (groupe, position)."""
+    operandes, operateurs, terme = [], [], []
+
+    def clore_terme():
+        if terme:
+            operandes.append(" ".join(terme))
+            terme.clear()
+
+    while i < len(jetons):
+        jeton = jetons[i]
+        if jeton == "(":
+            clore_terme()
+            sous_groupe, i = _analyser(jetons, i + 1)
+            operandes.append(sous_groupe)
+        elif jeton == ")":
+            break
+        elif jeton in OPERATEURS:
+            clore_terme()
+            operateurs.append(jeton)
+        else:
+            terme.append(jeton)
+        i += 1
+    clore_terme()
+    if len(operandes) != len(operateurs) + 1:
+        raise ValueError("opérateur booléen sans opérande")
+    return (operandes, operateurs), i
+
+
+def _rendre(noeud, racine=False) -> str:
+    if isinstance(noeud, str):
+        return noeud
+    operandes, operateurs = noeud
+    if len(operandes) == 1:
+        return _rendre(operandes[0], racine)
+    rendus = [_rendre(o) for o in operandes]
+    if set(operateurs) == {"OR"}:
+        # Union : l'ordre (et les doublons) des termes ne change pas le résultat
+        rendus = sorted(set(rendus))
+        texte = " OR ".join(rendus)
+    else:
+        # PubMed évalue de gauche à droite : l'ordre est conservé
+        texte = rendus[0] + "".join(f" {op} {r}" for op, r in zip(operateurs, rendus[1:]))
+    return texte if racine else f"({texte})"
+
+
+def requete_canonique(requete: str) -> str:
+    """
+    Forme canonique d'une requête PubMed. Sur une requête mal formée
+    (parenthèses déséquilibrées...), seuls les espaces sont normalisés.
+    """
+    jetons = _jetons(requete)
+    try:
+        groupe, fin = _analyser(jetons)
+        if fin < len(jetons) or jetons.count("(") != jetons.count(")"):
+            raise ValueError("parenthèses déséquilibrées")
+        return _rendre(groupe, racine=True)
+    except ValueError:
+        return " ".join(requete.split())
+
+
+def cle_recherche(requete: str, tri: str = None) -> str:
+    canonique = requete_canonique(requete)
+    return hashlib.sha256(f"esearch|{tri or ''}|{canonique}".encode("utf-8")).hexdigest()
+
+
+# ============================================
+# ESEARCH PAGINÉ
+# ============================================
+
+def _esearch(requete: str, retstart: int, retmax: int, tri: str = None, webenv: str = None):
+    params = {"db": "pubmed", "term": requete, "retmode": "json", "usehistory": "y",
+              "retstart": retstart, "retmax": retmax}
+    if tri:
+        params["sort"] = tri
+    if webenv:
+        params["WebEnv"] = webenv
+    r = requests.get(f"{BASE_EUTILS}/esearch.fcgi", params=params, timeout=20)
+    r.raise_for_status()
+    return r.json().get("esearchresult", {})
+
+
+def rechercher(requete: str, nombre: int = 50, tri: str = None):
+    """
+    Les `nombre` premiers PMID de la requête. Retourne (resultat, erreur) avec
+    resultat = {"requete", "canonique", "tri", "count", "ids", "webenv", "query_key"}.
+
+    Si le cache contient déjà une partie des PMID, seule la suite est demandée
+    (retstart) ; resultat["ids"] peut contenir plus que `nombre` PMID si une
+    recherche précédente en a chargé davantage.
+    """
+    cle = cle_recherche(requete, tri)
+    cache = cache_partage()
+    resultat = cache.lire(ESPACE_RECHERCHE, cle)
+    if resultat is not None and (len(resultat["ids"]) >= nombre or len(resultat["ids"]) >= resultat["count"]):
+        return resultat, None
+
+    if resultat is None:
+        resultat = {"requete": requete, "canonique": requete_canonique(requete), "tri": tri,
+                    "count": 0, "ids": [], "webenv": None, "query_key": None}
+    try:
+        page = _esearch(requete, len(resultat["ids"]), nombre - len(resultat["ids"]), tri, resultat["webenv"])
+    except Exception as e:
+        return (resultat if resultat["ids"] else None), f"Erreur recherche PubMed: {e}"
+
+    if "ERROR" in page:
+        return None, f"Erreur recherche PubMed: {page['ERROR']}"
+    deja = set(resultat["ids"])
+    resultat["ids"] = resultat["ids"] + [i for i in page.get("idlist", []) if i not in deja]
+    resultat["count"] = int(page.get("count", len(resultat["ids"])))
+    resultat["webenv"] = page.get("webenv") or resultat["webenv"]
+    resultat["query_key"] = page.get("querykey") or resultat["query_key"]
+    if resultat["ids"]:
+        cache.ecrire(ESPACE_RECHERCHE, cle, resultat)
+    return resultat, None
+
+
+def charger_plus(resultat: dict, par_page: int = 50):
+    """
+    Page suivante d'un résultat de rechercher(). Retourne (resultat complété,
+    nouveaux PMID, erreur).
+    """
+    deja = len(resultat["ids"])
+    suite, erreur = rechercher(resultat["requete"], deja + par_page, resultat.get("tri"))
+    if suite is None:
+        return resultat, [], erreur
+    return suite, suite["ids"][deja:deja + par_page], erreur
+
+
+def reste_a_charger(resultat: dict) -> int:
+    return max(0, resultat["count"] - len(resultat["ids"])) if resultat else 0
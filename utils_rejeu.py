@@ -0,0 +1,248 @@
+# ============================================
+# ENREGISTREMENT / REJEU DES APPELS EXTERNES
+# ============================================
+
+"""
+Couche d'enregistrement et de rejeu sous les clients HTTP (requests :
+NCBI, Unpaywall, Europe PMC, PMC, DeepL) et LLM (Gemini, Claude), pour
+mesurer les pipelines hors ligne et en CI.
+
+    VEILLE_REJEU=enregistrer   les réponses réelles sont écrites dans
+                               VEILLE_FIXTURES (une fois par requête)
+    VEILLE_REJEU=rejouer       les réponses viennent des fixtures ; une
+                               requête absente lève FixtureAbsente
+    VEILLE_REJEU_LATENCE       latence simulée au rejeu : "enregistree"
+                               (durée mesurée à l'enregistrement, défaut)
+                               ou un nombre de secondes fixe
+    VEILLE_REJEU_FACTEUR       multiplicateur de la latence enregistrée
+
+Les paramètres secrets (clés API, e-mail) sont exclus de la clé d'une
+requête et des fixtures : un enregistrement fait avec une clé se rejoue
+avec une autre.
+
+activer_rejeu() est appelée au démarrage des apps et d'alerte.py ; sans
+VEILLE_REJEU elle ne fait rien. Les SDK LLM chargés plus tard (imports
+différés) sont instrumentés au moment de leur import.
+"""
+
+import base64
+import hashlib
+import importlib.abc
+import io
+import json
+import os
+import sys
+import threading
+import time
+from types import SimpleNamespace
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+MODE_REJEU = os.getenv("VEILLE_REJEU", "")  # "" | enregistrer | rejouer
+DOSSIER_FIXTURES = os.getenv(
+    "VEILLE_FIXTURES",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks", "fixtures", "rejeu")
+)
+LATENCE_REJEU = os.getenv("VEILLE_REJEU_LATENCE", "enregistree")
+FACTEUR_LATENCE = float(os.getenv("VEILLE_REJEU_FACTEUR", "1"))
+
+PARAMETRES_SECRETS = {"api_key", "auth_key", "key", "email", "tool"}
+
+_actif = [False]
+_verrou = threading.Lock()
+STATS_REJEU = {"enregistres": 0, "rejoues": 0, "absents": 0}
+
+
+class FixtureAbsente(RuntimeError):
+    """Requête sans réponse enregistrée (mode rejouer)."""
+
+
+# ============================================
+# FIXTURES
+# ============================================
+
+def _chemin_fixture(famille: str, cle: str) -> str:
+    return os.path.join(DOSSIER_FIXTURES, famille, f"{cle}.json")
+
+
+def _cle(*parties) -> str:
+    return hashlib.sha256(json.dumps(parties, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:32]
+
+
+def _lire_fixture(famille: str, cle: str, description: str) -> dict:
+    try:
+        with open(_chemin_fixture(famille, cle), encoding="utf-8") as f:
+            fixture = json.load(f)
+    except FileNotFoundError:
+        with _verrou:
+            STATS_REJEU["absents"] += 1
+        raise FixtureAbsente(f"Aucune réponse enregistrée pour {description} ({famille}/{cle})")
+
+    latence = fixture.get("duree", 0) * FACTEUR_LATENCE if LATENCE_REJEU == "enregistree" else float(LATENCE_REJEU)
+    if latence > 0:
+        time.sleep(latence)
+    with _verrou:
+        STATS_REJEU["rejoues"] += 1
+    return fixture
+
+
+def _ecrire_fixture(famille: str, cle: str, fixture: dict):
+    chemin = _chemin_fixture(famille, cle)
+    os.makedirs(os.path.dirname(chemin), exist_ok=True)
+    temporaire = f"{chemin}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temporaire, "w", encoding="utf-8") as f:
+        json.dump(fixture, f, ensure_ascii=False, indent=1)
+    os.replace(temporaire, chemin)
+    with _verrou:
+        STATS_REJEU["enregistres"] += 1
+
+
+# ============================================
+# HTTP (requests)
+# ============================================
+
+def _sans_secrets(paires) -> list:
+    return sorted((k, v) for k, v in paires if k not in PARAMETRES_SECRETS)
+
+
+def _description_requete(preparee) -> tuple:
+    """(méthode, URL sans secrets, corps sans secrets) : identité d'une requête."""
+    morceaux = urlsplit(preparee.url)
+    url = urlunsplit(morceaux._replace(query=urlencode(_sans_secrets(parse_qsl(morceaux.query)))))
+    corps = preparee.body or b""
+    if isinstance(corps, bytes):
+        corps = corps.decode("utf-8", "replace")
+    if "x-www-form-urlencoded" in preparee.headers.get("Content-Type", ""):
+        corps = urlencode(_sans_secrets(parse_qsl(corps, keep_blank_values=True)))
+    return preparee.method, url, corps
+
+
+def _instrumenter_requests():
+    import requests
+    from requests.structures import CaseInsensitiveDict
+
+    request_original = requests.Session.request
+
+    def request(self, method, url, **kwargs):
+        preparee = requests.Request(
+            method.upper(), url, params=kwargs.get("params"), data=kwargs.get("data"),
+            json=kwargs.get("json"), headers=kwargs.get("headers")
+        ).prepare()
+        description = _description_requete(preparee)
+        cle = _cle(*description)
+
+        if MODE_REJEU == "rejouer":
+            fixture = _lire_fixture("http", cle, f"{description[0]} {description[1]}")
+            reponse = requests.Response()
+            reponse.status_code = fixture["statut"]
+            reponse.headers = CaseInsensitiveDict(fixture["entetes"])
+            reponse._content = base64.b64decode(fixture["contenu"])
+            # Corps déjà en mémoire : iter_content / stream=True le découpent sans lire raw
+            reponse._content_consumed = True
+            reponse.raw = io.BytesIO(reponse._content)
+            reponse.url = fixture["url"]
+            reponse.request = preparee
+            reponse.encoding = requests.utils.get_encoding_from_headers(reponse.headers)
+            return reponse
+
+        debut = time.perf_counter()
+        reponse = request_original(self, method, url, **kwargs)
+        _ecrire_fixture("http", cle, {
+            "requete": list(description),
+            "statut": reponse.status_code,
+            "entetes": {k: v for k, v in reponse.headers.items() if k.lower() == "content-type"},
+            "url": _description_requete(requests.Request("GET", reponse.url).prepare())[1],
+            "contenu": base64.b64encode(reponse.content).decode("ascii"),
+            "duree": time.perf_counter() - debut,
+        })
+        return reponse
+
+    requests.Session.request = request
+
+
+# ============================================
+# LLM (Gemini, Claude)
+# ============================================
+
+def _instrumenter_gemini(module):
+    modele = module.GenerativeModel
+    generer_original = modele.generate_content
+
+    def generate_content(self, contents, *args, **kwargs):
+        description = ("gemini", getattr(self, "model_name", ""), contents, kwargs.get("generation_config"))
+        cle = _cle(*description)
+        if MODE_REJEU == "rejouer":
+            return SimpleNamespace(text=_lire_fixture("llm", cle, f"Gemini {description[1]}")["texte"])
+        debut = time.perf_counter()
+        resp = generer_original(self, contents, *args, **kwargs)
+        _ecrire_fixture("llm", cle, {"requete": list(description), "texte": resp.text,
+                                      "duree": time.perf_counter() - debut})
+        return resp
+
+    modele.generate_content = generate_content
+
+
+def _instrumenter_claude(module):
+    messages = getattr(getattr(module, "resources", None), "Messages", None)
+    if messages is None:
+        return
+    creer_original = messages.create
+
+    def create(self, *args, **kwargs):
+        description = ("claude", kwargs.get("model"), kwargs.get("system"), kwargs.get("messages"),
+                       kwargs.get("max_tokens"))
+        cle = _cle(*description)
+        if MODE_REJEU == "rejouer":
+            texte = _lire_fixture("llm", cle, f"Claude {description[1]}")["texte"]
+            return SimpleNamespace(content=[SimpleNamespace(type="text", text=texte)])
+        debut = time.perf_counter()
+        msg = creer_original(self, *args, **kwargs)
+        _ecrire_fixture("llm", cle, {"requete": list(description), "texte": msg.content[0].text,
+                                      "duree": time.perf_counter() - debut})
+        return msg
+
+    messages.create = create
+
+
+INSTRUMENTATIONS_SDK = {
+    "google.generativeai": _instrumenter_gemini,
+    "anthropic": _instrumenter_claude,
+}
+
+
+class _CrochetImport(importlib.abc.MetaPathFinder):
+    """Instrumente un SDK au moment où il est importé (imports différés compris)."""
+
+    def find_spec(self, nom, chemin, cible=None):
+        if nom not in INSTRUMENTATIONS_SDK:
+            return None
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(nom, chemin, cible)
+            if spec is not None and spec.loader is not None:
+                executer_original = spec.loader.exec_module
+
+                def exec_module(module, executer_original=executer_original):
+                    executer_original(module)
+                    INSTRUMENTATIONS_SDK[nom](module)
+
+                spec.loader.exec_module = exec_module
+                return spec
+        return None
+
+
+def activer_rejeu():
+    """Active l'enregistrement ou le rejeu selon VEILLE_REJEU (une fois par processus)."""
+    if MODE_REJEU not in ("enregistrer", "rejouer"):
+        return False
+    with _verrou:
+        if _actif[0]:
+            return True
+        _actif[0] = True
+
+    _instrumenter_requests()
+    for nom, instrumenter in INSTRUMENTATIONS_SDK.items():
+        if nom in sys.modules:
+            instrumenter(sys.modules[nom])
+    sys.meta_path.insert(0, _CrochetImport())
+    return True
@@ -0,0 +1,172 @@
+# ============================================
+# MÉMOIRE DE SESSION : BILAN ET DÉCHARGEMENT SUR DISQUE
+# ============================================
+
+"""
+Chaque utilisateur connecté garde son st.session_state en mémoire pendant
+toute la session. Les textes longs (texte intégral traduit, analyses)
+y occupaient plusieurs Mo par utilisateur.
+
+- bilan_session() mesure la taille de chaque clé de session (octets
+  sérialisés), en distinguant ce qui est en mémoire de ce qui est sur disque.
+- decharger() remplace, dans une structure (dict / liste), les chaînes et
+  bytes plus grands que SEUIL_DECHARGEMENT par une RefBlob : le contenu est
+  écrit une fois dans un stockage local adressé par contenu, la session ne
+  garde que la référence. recharger() fait l'inverse au moment de l'usage.
+- panneau_memoire_session() affiche le bilan en mode debug.
+"""
+
+import hashlib
+import os
+import pickle
+import sys
+import time
+
+from config_stockage import chemin_donnees
+
+DOSSIER_BLOBS = "session"
+SEUIL_DECHARGEMENT = int(os.getenv("VEILLE_SEUIL_SESSION", str(16 * 1024)))  # octets
+DUREE_CONSERVATION = 2 * 24 * 60 * 60  # blobs non relus depuis 2 jours purgés
+CONTENU_EXPIRE = "⚠️ Contenu expiré (session inactive trop longtemps) — relancez l'analyse."
+
+
+# ============================================
+# STOCKAGE DES BLOBS
+# ============================================
+
+class RefBlob:
+    """Référence vers un texte ou des bytes déchargés sur disque."""
+
+    __slots__ = ("id", "taille", "texte")
+
+    def __init__(self, id_blob: str, taille: int, texte: bool):
+        self.id = id_blob
+        self.taille = taille
+        self.texte = texte
+
+    def lire(self):
+        """Contenu du blob ; s'il a été purgé entre-temps, CONTENU_EXPIRE (ou b"")."""
+        try:
+            with open(_chemin_blob(self.id), "rb") as f:
+                contenu = f.read()
+            maintenant = time.time()
+            os.utime(_chemin_blob(self.id), (maintenant, maintenant))
+        except OSError:
+            return CONTENU_EXPIRE if self.texte else b""
+        return contenu.decode("utf-8") if self.texte else contenu
+
+    def __len__(self):
+        return self.taille
+
+    def __str__(self):
+        return self.lire() if self.texte else repr(self)
+
+    def __repr__(self):
+        return f"<RefBlob {self.id} ({self.taille} octets)>"
+
+
+def _chemin_blob(id_blob: str) -> str:
+    return chemin_donnees(DOSSIER_BLOBS, id_blob)
+
+
+def _purger_anciens(maintenant: float):
+    dossier = os.path.dirname(_chemin_blob("x"))
+    for nom in os.listdir(dossier):
+        chemin = os.path.join(dossier, nom)
+        try:
+            if maintenant - os.path.getmtime(chemin) > DUREE_CONSERVATION:
+                os.remove(chemin)
+        except OSError:
+            pass
+
+
+def stocker_blob(contenu) -> RefBlob:
+    """Écrit le contenu (str ou bytes) sur disque ; un contenu identique n'est écrit qu'une fois."""
+    texte = isinstance(contenu, str)
+    data = contenu.encode("utf-8") if texte else bytes(contenu)
+    id_blob = hashlib.sha256(data).hexdigest()[:32]
+    chemin = _chemin_blob(id_blob)
+    maintenant = time.time()
+
+    if os.path.exists(chemin):
+        os.utime(chemin, (maintenant, maintenant))
+    else:
+        temporaire = f"{chemin}.{os.getpid()}.tmp"
+        with open(temporaire, "wb") as f:
+            f.write(data)
+        os.replace(temporaire, chemin)
+        _purger_anciens(maintenant)
+
+    return RefBlob(id_blob, len(data), texte)
+
+
+# ============================================
+# DÉCHARGEMENT / RECHARGEMENT
+# ============================================
+
+def decharger(valeur, seuil: int = SEUIL_DECHARGEMENT):
+    """Copie de la structure où les chaînes / bytes de plus de `seuil` octets sont des RefBlob."""
+    if isinstance(valeur, (str, bytes)):
+        taille = len(valeur.encode("utf-8")) if isinstance(valeur, str) else len(valeur)
+        return stocker_blob(valeur) if taille > seuil else valeur
+    if isinstance(valeur, dict):
+        return {cle: decharger(v, seuil) for cle, v in valeur.items()}
+    if isinstance(valeur, list):
+        return [decharger(v, seuil) for v in valeur]
+    return valeur
+
+
+def recharger(valeur):
+    """Copie de la structure où chaque RefBlob est remplacée par son contenu."""
+    if isinstance(valeur, RefBlob):
+        return valeur.lire()
+    if isinstance(valeur, dict):
+        return {cle: recharger(v) for cle, v in valeur.items()}
+    if isinstance(valeur, list):
+        return [recharger(v) for v in valeur]
+    return valeur
+
+
+# ============================================
+# BILAN MÉMOIRE
+# ============================================
+
+def taille_memoire(valeur) -> int:
+    """Taille sérialisée (octets) ; une RefBlob ne compte que pour sa référence."""
+    try:
+        return len(pickle.dumps(valeur, pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(valeur)
+
+
+def taille_disque(valeur) -> int:
+    """Octets déchargés sur disque référencés par la structure."""
+    if isinstance(valeur, RefBlob):
+        return valeur.taille
+    if isinstance(valeur, dict):
+        return sum(taille_disque(v) for v in valeur.values())
+    if isinstance(valeur, (list, tuple, set)):
+        return sum(taille_disque(v) for v in valeur)
+    return 0
+
+
+def bilan_session(session_state) -> list:
+    """[(clé, octets en mémoire, octets sur disque)] trié de la plus lourde à la plus légère."""
+    bilan = [(str(cle), taille_memoire(v), taille_disque(v)) for cle, v in session_state.items()]
+    return sorted(bilan, key=lambda b: -b[1])
+
+
+def panneau_memoire_session(session_state=None, nb_cles: int = 10):
+    """Affichage Streamlit du bilan mémoire de la session (mode debug)."""
+    import streamlit as st
+
+    bilan = bilan_session(st.session_state if session_state is None else session_state)
+    memoire = sum(b[1] for b in bilan)
+    disque = sum(b[2] for b in bilan)
+    st.caption(
+        f"Session : {memoire / 1024:.0f} Ko en mémoire, {disque / 1024:.0f} Ko déchargés sur disque "
+        f"(seuil {SEUIL_DECHARGEMENT // 1024} Ko)"
+    )
+    for cle, octets, sur_disque in bilan[:nb_cles]:
+        detail = f" + {sur_disque / 1024:.0f} Ko sur disque" if sur_disque else ""
+        st.caption(f"{cle} : {octets / 1024:.1f} Ko{detail}")
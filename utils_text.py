@@ -0,0 +1,307 @@
+# ============================================
+# SEGMENTATION DU TEXTE EN SECTIONS
+# ============================================
+
+"""
+Découpage du texte extrait (PDF ou JATS) en sections étiquetées :
+abstract, introduction, methods, results, discussion, conclusion,
+references, boilerplate (affiliations, financements, tableaux...).
+
+Une politique configurable (SECTIONS_UTILES par défaut) décide des
+sections envoyées à la traduction et à l'analyse : les références
+représentent à elles seules 20 à 30 % des caractères d'un article.
+
+Avant segmentation, retirer_entetes_pieds() supprime les lignes répétées
+de page en page (en-têtes, pieds, DOI, "Downloaded from...") et alimente
+un corpus de mentions parasites appris par éditeur.
+"""
+
+import re
+import sqlite3
+import threading
+
+from config_stockage import chemin_donnees
+
+# Sections cliniquement utiles, envoyées par défaut à la traduction
+SECTIONS_UTILES = ("abstract", "introduction", "methods", "results", "discussion", "conclusion")
+
+# Toutes les étiquettes possibles ("autre" = texte avant le premier titre reconnu)
+LABELS_SECTIONS = SECTIONS_UTILES + ("references", "boilerplate", "autre")
+
+LIBELLES_SECTIONS = {
+    "abstract": "Abstract",
+    "introduction": "Introduction",
+    "methods": "Méthodes",
+    "results": "Résultats",
+    "discussion": "Discussion",
+    "conclusion": "Conclusion",
+    "references": "Références",
+    "boilerplate": "Mentions annexes",
+    "autre": "En-tête / non classé",
+}
+
+MOTIFS_SECTIONS = [
+    ("abstract", r"\b(abstract|summary)\b"),
+    ("introduction", r"\b(introduction|background)\b"),
+    ("methods", r"\b(methods?|materials?|methodology|study design|patients)\b"),
+    ("results", r"\b(results?|findings)\b"),
+    ("discussion", r"\b(discussion|comment)\b"),
+    ("conclusion", r"\b(conclusions?|summary and conclusion)\b"),
+    ("references", r"\b(references|bibliography|literature cited)\b"),
+    ("boilerplate", r"\b(acknowledge?ments?|funding|conflicts? of interest|competing interests?|"
+                    r"author contributions?|data availability|ethics|abbreviations|"
+                    r"disclosures?|supplementary (material|data))\b"),
+]
+
+# Un titre de section : court, éventuellement numéroté ("2.", "II.", "2.1")
+TITRE_RE = re.compile(r"^\s*(?:(?:\d+(?:\.\d+)*|[IVX]+)\.?\s+)?([A-Za-z][A-Za-z ,&/-]{2,60}?)\s*:?\s*$")
+
+# Lignes parasites, quelle que soit la section
+BOILERPLATE_LIGNE = [
+    r"^\s*(correspond(ence|ing author)|e-?mail|received|accepted|published online|"
+    r"copyright|©|doi\s*:|https?://|downloaded from|this article is protected)",
+    r"\S+@\S+\.\w+",
+]
+
+# Lignes parasites de l'en-tête uniquement (affiliations des auteurs)
+AFFILIATION_RE = re.compile(
+    r"\b(department|university|hospital|institute|faculty|school of|universit[eé]|h[oô]pital|"
+    r"centre|center)\b", re.IGNORECASE
+)
+
+
+def classer_titre_section(titre: str, sec_type: str = "") -> str:
+    """Associe un titre (ou un attribut sec-type JATS) à un type de section."""
+    for candidat in (sec_type or "", titre or ""):
+        candidat = candidat.lower().replace("|", " ")
+        for label, motif in MOTIFS_SECTIONS:
+            if re.search(motif, candidat):
+                return label
+    return "autre"
+
+
+def _titre_section(ligne: str) -> str:
+    """Retourne le type de section si la ligne est un titre, sinon ''."""
+    if len(ligne) > 60 or len(ligne.split()) > 6:
+        return ""
+    m = TITRE_RE.match(ligne)
+    if not m:
+        return ""
+    label = classer_titre_section(m.group(1))
+    return "" if label == "autre" else label
+
+
+def _est_tableau(ligne: str) -> bool:
+    """Ligne de tableau aplati : majoritairement des nombres."""
+    tokens = ligne.split()
+    if len(tokens) < 4:
+        return False
+    numeriques = sum(1 for t in tokens if re.fullmatch(r"[<>≤≥±=]?[\d.,%()–-]+", t))
+    return numeriques / len(tokens) > 0.5
+
+
+def _ligne_boilerplate(ligne: str, section: str) -> bool:
+    """Détecte les lignes parasites (mentions légales, contacts, tableaux, affiliations)."""
+    for motif in BOILERPLATE_LIGNE:
+        if re.search(motif, ligne, flags=re.IGNORECASE):
+            return True
+    if _est_tableau(ligne):
+        return True
+    if section == "autre" and len(ligne) < 250 and AFFILIATION_RE.search(ligne):
+        return True
+    return False
+
+
+def segmenter_sections(texte: str) -> list:
+    """
+    Découpe un texte (lignes conservées) en segments (label, texte).
+    Les lignes parasites sont isolées dans des segments "boilerplate".
+    """
+    if not texte:
+        return []
+
+    segments = []
+    section = "autre"
+    courant = []
+    courant_label = section
+
+    def pousser(label, lignes):
+        if lignes:
+            segments.append((label, "\n".join(lignes)))
+
+    for ligne in texte.splitlines():
+        propre = ligne.strip()
+        if not propre:
+            continue
+
+        nouveau = _titre_section(propre)
+        if nouveau:
+            pousser(courant_label, courant)
+            section = nouveau
+            courant, courant_label = [propre], section
+            continue
+
+        label = "boilerplate" if _ligne_boilerplate(propre, section) else section
+        if label != courant_label:
+            pousser(courant_label, courant)
+            courant, courant_label = [], label
+        courant.append(propre)
+
+    pousser(courant_label, courant)
+    return segments
+
+
+def filtrer_sections(texte: str, sections_gardees=SECTIONS_UTILES, min_len: int = 300):
+    """
+    Ne garde que les sections de la politique (+ en-tête non classé).
+    Retourne (texte_filtré, stats) où stats = {label: nb_caractères}.
+    Si le filtrage laisse trop peu de texte, le texte d'origine est conservé.
+    """
+    segments = segmenter_sections(texte)
+    stats = {}
+    gardes = []
+
+    for label, contenu in segments:
+        stats[label] = stats.get(label, 0) + len(contenu)
+        if label in sections_gardees or label == "autre":
+            gardes.append(contenu)
+
+    texte_filtre = "\n".join(gardes)
+    if len(texte_filtre) < min_len:
+        return texte, stats
+    return texte_filtre, stats
+
+
+def resume_stats_sections(stats: dict, sections_gardees=SECTIONS_UTILES) -> str:
+    """Résumé lisible des caractères exclus par section (pour le mode debug)."""
+    exclus = {
+        label: nb for label, nb in stats.items()
+        if label not in sections_gardees and label != "autre"
+    }
+    if not exclus:
+        return "Aucune section exclue"
+    total = sum(stats.values()) or 1
+    details = ", ".join(
+        f"{LIBELLES_SECTIONS.get(label, label)} {nb} car." for label, nb in exclus.items()
+    )
+    return f"Exclu de la traduction : {details} ({sum(exclus.values()) * 100 // total}% du texte)"
+
+
+# ============================================
+# EN-TÊTES / PIEDS DE PAGE RÉPÉTÉS
+# ============================================
+
+FICHIER_CORPUS_BOILERPLATE = "boilerplate_editeurs.sqlite"
+
+# Nombre max de lignes apprises conservées par éditeur
+MAX_LIGNES_PAR_EDITEUR = 300
+
+# Une ligne apprise n'est appliquée qu'après avoir été vue dans N documents
+MIN_DOCUMENTS_CORPUS = 2
+
+NUMERO_PAGE_RE = re.compile(r"^\s*(page\s*)?\d{1,4}(\s*(of|/|sur)\s*\d{1,4})?\s*$", re.IGNORECASE)
+
+_verrou_corpus = threading.Lock()
+
+
+def _normaliser_ligne(ligne: str) -> str:
+    """Forme canonique d'une ligne : casse, chiffres (n° de page) et espaces neutralisés."""
+    ligne = re.sub(r"\d+", "#", ligne.lower())
+    return re.sub(r"\s+", " ", ligne).strip()
+
+
+def cle_editeur(doi: str = None, journal: str = None) -> str:
+    """
+    Clé du profil d'en-têtes : préfixe DOI + journal (10.1016|lancet).
+    Un même préfixe couvre des centaines de revues aux maquettes différentes.
+    """
+    prefixe = doi.split("/", 1)[0].lower() if doi and "/" in doi else ""
+    journal = re.sub(r"\s+", " ", journal or "").strip().lower()
+    return "|".join(p for p in (prefixe, journal) if p)
+
+
+def _connexion_corpus():
+    conn = sqlite3.connect(chemin_donnees(FICHIER_CORPUS_BOILERPLATE), timeout=30)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS lignes (editeur TEXT, ligne TEXT, documents INTEGER, "
+        "PRIMARY KEY (editeur, ligne))"
+    )
+    return conn
+
+
+def lignes_apprises(editeur: str) -> set:
+    """Lignes normalisées vues dans au moins MIN_DOCUMENTS_CORPUS documents de cet éditeur."""
+    with _verrou_corpus:
+        conn = _connexion_corpus()
+        try:
+            lignes = conn.execute(
+                "SELECT ligne FROM lignes WHERE editeur = ? AND documents >= ?",
+                (editeur, MIN_DOCUMENTS_CORPUS),
+            ).fetchall()
+        finally:
+            conn.close()
+    return {ligne for (ligne,) in lignes}
+
+
+def apprendre_lignes(editeur: str, lignes: set):
+    """
+    Incrémente le compteur de documents de chaque ligne, dans une seule
+    transaction : les sessions et tâches de fond concurrentes ne perdent
+    aucune mise à jour. Seules les MAX_LIGNES_PAR_EDITEUR plus vues sont gardées.
+    """
+    with _verrou_corpus:
+        conn = _connexion_corpus()
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT INTO lignes VALUES (?, ?, 1) "
+                    "ON CONFLICT (editeur, ligne) DO UPDATE SET documents = documents + 1",
+                    [(editeur, ligne) for ligne in lignes],
+                )
+                conn.execute(
+                    "DELETE FROM lignes WHERE editeur = ? AND rowid NOT IN "
+                    "(SELECT rowid FROM lignes WHERE editeur = ? ORDER BY documents DESC LIMIT ?)",
+                    (editeur, editeur, MAX_LIGNES_PAR_EDITEUR),
+                )
+        finally:
+            conn.close()
+
+
+def retirer_entetes_pieds(pages: list, editeur: str = "", seuil: float = 0.5, apprendre: bool = True):
+    """
+    Supprime les lignes répétées sur plusieurs pages (en-têtes, pieds, DOI,
+    "Downloaded from..."), les numéros de page et les mentions déjà apprises
+    pour cet éditeur. Retourne (pages_nettoyées, nb_caractères_économisés).
+    """
+    if not pages:
+        return pages, 0
+
+    # Nombre de pages où apparaît chaque ligne normalisée
+    presence = {}
+    for page in pages:
+        for norm in {_normaliser_ligne(l) for l in page.splitlines() if l.strip()}:
+            if len(norm) <= 150:
+                presence[norm] = presence.get(norm, 0) + 1
+
+    min_pages = max(2, int(len(pages) * seuil + 0.5)) if len(pages) > 2 else 2
+    repetees = {norm for norm, nb in presence.items() if nb >= min_pages}
+
+    appris = lignes_apprises(editeur) if editeur else set()
+
+    economie = 0
+    pages_nettoyees = []
+    for page in pages:
+        gardees = []
+        for ligne in page.splitlines():
+            norm = _normaliser_ligne(ligne)
+            if norm and (norm in repetees or norm in appris or NUMERO_PAGE_RE.match(ligne)):
+                economie += len(ligne) + 1
+                continue
+            gardees.append(ligne)
+        pages_nettoyees.append("\n".join(gardees))
+
+    # Apprentissage : les lignes répétées de ce document enrichissent le corpus de l'éditeur
+    if editeur and apprendre and repetees:
+        apprendre_lignes(editeur, repetees)
+
+    return pages_nettoyees, economie